@@ -0,0 +1,114 @@
+# MIT License
+#
+# Copyright (c) 2018 Blanyal D'Souza
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+"""Benchmark of the Othello endgame solver.
+
+Measures the solve time against the number of empty squares on random
+positions. Run from the repository root with:
+
+    python -m benchmarks.othello_solver
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from othello.othello_game import OthelloGame
+from othello.othello_solver import OthelloSolver
+
+
+def random_position(size, num_empty, rng):
+    """Plays random moves until a position has num_empty empty squares.
+
+    Args:
+        size: An integer length of the board side.
+        num_empty: An integer number of empty squares to leave.
+        rng: A random.Random object.
+
+    Returns:
+        An OthelloGame which is not over.
+    """
+    while True:
+        game = OthelloGame(size)
+        game_over = False
+
+        while np.count_nonzero(game.state == 0) > num_empty:
+            valid_moves = [move for move in
+                           game.get_valid_moves(game.current_player)
+                           if move[0] == 1]
+            game.play_action(valid_moves[rng.randrange(len(valid_moves))])
+            game_over, value = game.check_game_over(game.current_player)
+
+            if game_over:
+                break
+
+        if not game_over:
+            return game
+
+
+def run(sizes, empties, num_positions, seed):
+    """Prints the mean solve time and nodes for every size and empty count.
+
+    Args:
+        sizes: A list of board side lengths.
+        empties: A list of numbers of empty squares.
+        num_positions: An integer number of positions per measurement.
+        seed: An integer seed for the random positions.
+    """
+    print("size  empty  seconds   nodes")
+
+    for size in sizes:
+        for num_empty in empties:
+            rng = random.Random(seed)
+            seconds = 0.0
+            nodes = 0
+
+            for i in range(num_positions):
+                game = random_position(size, num_empty, rng)
+                solver = OthelloSolver(max_empty=num_empty,
+                                       node_limit=float("inf"))
+
+                start = time.perf_counter()
+                solver.solve(game)
+                seconds += time.perf_counter() - start
+                nodes += solver.nodes
+
+            print("%4d  %5d  %7.4f  %6d" % (size, num_empty,
+                                            seconds / num_positions,
+                                            nodes // num_positions))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", help="Board sizes to benchmark.",
+                        type=int, nargs="+", default=[6, 8])
+    parser.add_argument("--empties", help="Numbers of empty squares.",
+                        type=int, nargs="+", default=[4, 6, 8, 10])
+    parser.add_argument("--num_positions", help="Positions per measurement.",
+                        type=int, default=10)
+    parser.add_argument("--seed", help="Seed for the random positions.",
+                        type=int, default=0)
+    arguments = parser.parse_args()
+
+    run(arguments.sizes, arguments.empties, arguments.num_positions,
+        arguments.seed)
@@ -0,0 +1,104 @@
+# MIT License
+#
+# Copyright (c) 2018 Blanyal D'Souza
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+"""Startup time benchmark and guard against eager TensorFlow imports.
+
+Imports each entry point in a fresh interpreter, measures the time and
+checks that TensorFlow was not imported. Run from the repository root with:
+
+    python -m benchmarks.startup --max_seconds 1.0
+
+The command exits with status 1 if an entry point imports TensorFlow or
+takes longer than --max_seconds to import.
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+# Entry points which must start without TensorFlow.
+MODULES = ["main", "registry", "train", "evaluate", "human_play", "numpy_net",
+           "mcts", "tic_tac_toe.tic_tac_toe_game",
+           "tic_tac_toe.tic_tac_toe_tablebase", "othello.othello_game",
+           "othello.othello_solver", "connect_four.connect_four_game",
+           "connect_four.connect_four_solver"]
+
+# Imports a module and reports the time and whether TensorFlow was loaded.
+CODE = """
+import json, sys, time
+start = time.perf_counter()
+import %s
+print(json.dumps({"seconds": time.perf_counter() - start,
+                  "tensorflow": "tensorflow" in sys.modules}))
+"""
+
+
+def measure_import(module, repeat=3):
+    """Imports a module in fresh interpreters.
+
+    Args:
+        module: A string module name.
+        repeat: An integer number of interpreters. The fastest is reported.
+
+    Returns:
+        A dictionary with the import seconds and whether TensorFlow was
+        imported.
+    """
+    results = []
+    for i in range(repeat):
+        output = subprocess.run([sys.executable, "-c", CODE % module],
+                                check=True, stdout=subprocess.PIPE,
+                                universal_newlines=True).stdout
+        results.append(json.loads(output.splitlines()[-1]))
+
+    return min(results, key=lambda result: result["seconds"])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--max_seconds", help="Maximum import time.",
+                        type=float, default=1.0)
+    parser.add_argument("--repeat", help="Interpreters per module.",
+                        type=int, default=3)
+    parser.add_argument("--output", help="JSON file for the results.")
+    arguments = parser.parse_args()
+
+    report = {}
+    failures = []
+
+    for module in MODULES:
+        result = measure_import(module, arguments.repeat)
+        report[module] = result
+        print("%-40s %8.3f s%s" % (module, result["seconds"],
+                                   "  imports TensorFlow"
+                                   if result["tensorflow"] else ""))
+
+        if result["tensorflow"] or result["seconds"] > arguments.max_seconds:
+            failures.append(module)
+
+    if arguments.output:
+        with open(arguments.output, "w") as output_file:
+            json.dump(report, output_file, indent=1, sort_keys=True)
+
+    if failures:
+        print("Slow or TensorFlow importing modules:", ", ".join(failures))
+        sys.exit(1)
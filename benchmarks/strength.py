@@ -0,0 +1,225 @@
+# MIT License
+#
+# Copyright (c) 2018 Blanyal D'Souza
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+"""Benchmark of playing strength against compute.
+
+Plays MCTS with the network against a fixed opponent under several
+simulation counts, move times and network sizes, and reports the win rate
+against the CPU time used. Run from the repository root with, for example:
+
+    python -m benchmarks.strength --game 2 --opponent alphabeta \
+        --sims 25 50 100 --resnet_blocks 5 10 --output strength.json
+
+Each configuration is one JSON object in the output list. Every player
+has its own Config and its own search tree, so the opponent stays fixed
+while the configuration under test changes.
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+import registry
+from config import CFG
+from evaluate import play_game
+from mcts import MonteCarloTreeSearch
+from players import AlphaBetaPlayer, RandomPlayer
+
+
+class TimedSearch(object):
+    """Measures the CPU time and simulations of a search.
+
+    Attributes:
+        mcts: The MonteCarloTreeSearch being measured.
+        cpu_seconds: A float CPU time spent in searches.
+        simulations: An integer number of simulations run.
+        moves: An integer number of searches.
+    """
+
+    def __init__(self, mcts):
+        """Initializes TimedSearch with the search to measure."""
+        self.mcts = mcts
+        self.cpu_seconds = 0.0
+        self.simulations = 0
+        self.moves = 0
+
+    def search(self, game, node, temperature, num_sims=None):
+        """Runs the search and records its cost."""
+        start = time.process_time()
+        best_child = self.mcts.search(game, node, temperature, num_sims)
+        self.cpu_seconds += time.process_time() - start
+        self.simulations += self.mcts.sims_per_move[-1]
+        self.moves += 1
+        return best_child
+
+    def root_value(self):
+        """Returns the root value of the search."""
+        return self.mcts.root_value()
+
+    def reset_budget(self):
+        """Resets the budget of the search."""
+        self.mcts.reset_budget()
+
+    def set_root(self, node):
+        """Moves the root of the search."""
+        self.mcts.set_root(node)
+
+
+def make_opponent(name, game, depth, config):
+    """Creates the fixed opponent.
+
+    Args:
+        name: "random", "alphabeta" or the name of a saved model.
+        game: An object containing the game state.
+        depth: An integer search depth of the alpha-beta opponent.
+        config: The Config of a saved model opponent, which no configuration
+            under test shares.
+
+    Returns:
+        An object with the interface of a MonteCarloTreeSearch.
+    """
+    if name == "random":
+        return RandomPlayer()
+    elif name == "alphabeta":
+        return AlphaBetaPlayer(depth)
+
+    # The opponent only predicts, so it runs on the NumPy backend.
+    net = registry.make_network(game, "numpy", config)
+    net.load_model(name)
+    return MonteCarloTreeSearch(net, config=config)
+
+
+def run_config(net, game, opponent, num_sims, move_time, num_games):
+    """Plays one configuration against the opponent.
+
+    Args:
+        net: An object containing the neural network, whose config the
+            configuration is derived from.
+        game: An object containing the game state.
+        opponent: An object with the interface of a MonteCarloTreeSearch.
+        num_sims: An integer number of simulations per move.
+        move_time: A float number of seconds per move, or None.
+        num_games: An integer number of games, played with alternating colors.
+
+    Returns:
+        A dictionary with the results and the cost of the configuration.
+    """
+    config = net.config.copy(num_mcts_sims=num_sims)
+    search = TimedSearch(MonteCarloTreeSearch(net, move_time=move_time,
+                                              config=config))
+
+    results = []
+    start = time.time()
+
+    for i in range(num_games):
+        color = game.current_player * (1 - 2 * (i % 2))
+        results.append(play_game(search, opponent, game, color,
+                                 temperature=config.temp_final))
+
+    wins = results.count(1)
+    losses = results.count(-1)
+
+    return {"sims": num_sims,
+            "move_time": move_time,
+            "games": num_games,
+            "wins": wins,
+            "losses": losses,
+            "draws": num_games - wins - losses,
+            "score": (wins + (num_games - wins - losses) / 2) / num_games,
+            "cpu_seconds": search.cpu_seconds,
+            "cpu_seconds_per_move": search.cpu_seconds / max(search.moves, 1),
+            "sims_per_second": search.simulations /
+            max(search.cpu_seconds, 1e-9),
+            "wall_seconds": time.time() - start}
+
+
+def run(arguments):
+    """Runs every configuration and collects the results.
+
+    Args:
+        arguments: The parsed command line arguments.
+
+    Returns:
+        A list with a dictionary per configuration.
+    """
+    np.random.seed(arguments.seed)
+    base_config = CFG.copy(game=arguments.game)
+    game = registry.make_game(config=base_config)
+
+    opponent = make_opponent(arguments.opponent, game, arguments.depth,
+                             base_config.copy())
+    move_times = arguments.move_time or [None]
+    report = []
+
+    for resnet_blocks in arguments.resnet_blocks:
+        net = registry.make_network(
+            game, "tensorflow", base_config.copy(resnet_blocks=resnet_blocks))
+
+        if arguments.model:
+            net.load_model(arguments.model)
+
+        for num_sims in arguments.sims:
+            for move_time in move_times:
+                result = run_config(net, game, opponent, num_sims, move_time,
+                                    arguments.num_games)
+                result.update(game=arguments.game,
+                              opponent=arguments.opponent,
+                              resnet_blocks=resnet_blocks)
+                print(json.dumps(result))
+                report.append(result)
+
+    return report
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--game", help="0: Tic Tac Toe, 1: Othello, "
+                                       "2: Connect Four.",
+                        type=int, default=CFG.game)
+    parser.add_argument("--opponent", help="random, alphabeta or the name of "
+                                           "a saved model.",
+                        default="random")
+    parser.add_argument("--depth", help="Search depth of alphabeta.",
+                        type=int, default=4)
+    parser.add_argument("--model", help="Saved model to load for every "
+                                        "network size, or none.",
+                        default="")
+    parser.add_argument("--sims", help="Simulation counts per move.",
+                        type=int, nargs="+", default=[CFG.num_mcts_sims])
+    parser.add_argument("--move_time", help="Seconds per move. Combine with "
+                                            "a large --sims.",
+                        type=float, nargs="*", default=[])
+    parser.add_argument("--resnet_blocks", help="Network sizes.",
+                        type=int, nargs="+", default=[CFG.resnet_blocks])
+    parser.add_argument("--num_games", help="Games per configuration.",
+                        type=int, default=10)
+    parser.add_argument("--seed", help="Random seed.", type=int, default=0)
+    parser.add_argument("--output", help="JSON file for the results.",
+                        default="")
+    arguments = parser.parse_args()
+
+    report = run(arguments)
+
+    if arguments.output:
+        with open(arguments.output, "w") as output_file:
+            json.dump(report, output_file, indent=1)
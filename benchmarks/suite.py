@@ -0,0 +1,365 @@
+# MIT License
+#
+# Copyright (c) 2018 Blanyal D'Souza
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+"""Micro and macro benchmark suite with regression checks.
+
+Times the game logic, the tree operations, the search, the network
+predictions and training, writes the results as JSON and compares them
+with a stored baseline. Run from the repository root with:
+
+    python -m benchmarks.suite --output results.json
+
+Every result is in seconds per operation, so lower is better. The command
+exits with status 1 if any result is slower than the baseline by more than
+the tolerance, and also fails if there is no baseline. Timings depend on
+the machine, so no baseline is shipped. Use --update_baseline to store the
+results as the baseline, first and after an intended change.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from config import CFG
+from connect_four.connect_four_game import ConnectFourGame
+from mcts import MonteCarloTreeSearch, TreeNode
+from othello.othello_game import OthelloGame
+from tic_tac_toe.tic_tac_toe_game import TicTacToeGame
+
+GAMES = {"tic_tac_toe": TicTacToeGame,
+         "othello": OthelloGame,
+         "connect_four": ConnectFourGame}
+
+BATCH_SIZES = [1, 2, 4, 8, 16, 32, 64, 128, 256]
+
+
+class UniformEvaluator(object):
+    """Evaluates every position with uniform priors and a zero value.
+
+    Searching with it measures the cost of the tree alone.
+
+    Attributes:
+        action_size: An integer number of actions.
+    """
+
+    def __init__(self, game):
+        """Initializes UniformEvaluator with the size of the action space."""
+        self.action_size = game.action_size
+
+    def predict(self, state):
+        """Returns uniform move probabilities and a zero value."""
+        return np.full(self.action_size, 1 / self.action_size), 0.0
+
+
+def measure(func, number, repeat=5):
+    """Times a function.
+
+    Args:
+        func: A function without arguments which runs number operations.
+        number: An integer number of operations per call.
+        repeat: An integer number of calls. The fastest one is reported.
+
+    Returns:
+        A float number of seconds per operation.
+    """
+    best = float("inf")
+    for i in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best / number
+
+
+def midgame_position(game_class, num_moves, seed=0):
+    """Plays random moves to reach a position in the middle of a game.
+
+    Args:
+        game_class: A Game subclass.
+        num_moves: An integer number of moves to play.
+        seed: An integer seed for the moves.
+
+    Returns:
+        The game and a valid move at its position.
+    """
+    rng = np.random.RandomState(seed)
+
+    while True:
+        game = game_class()
+
+        for i in range(num_moves + 1):
+            valid_moves = [move for move in
+                           game.get_valid_moves(game.current_player)
+                           if move[0] == 1]
+            if not valid_moves or \
+                    game.check_game_over(game.current_player)[0]:
+                break
+
+            move = tuple(valid_moves[rng.randint(len(valid_moves))].tolist())
+            if i == num_moves:
+                return game, move
+
+            game.play_action(move)
+
+
+def game_benchmarks(results, number):
+    """Times the game logic of every game.
+
+    Args:
+        results: A dictionary to add the results to.
+        number: An integer number of operations per timing.
+    """
+    for name, game_class in GAMES.items():
+        game, move = midgame_position(game_class, 4)
+        valid_moves = game.get_valid_moves(game.current_player)
+        clones = []
+
+        def play_actions():
+            for clone in clones:
+                clone.play_action(move)
+
+        results[name + ".clone"] = measure(
+            lambda: [game.clone() for i in range(number)], number)
+
+        best = float("inf")
+        for i in range(5):
+            clones = [game.clone() for j in range(number)]
+            best = min(best, measure(play_actions, number, repeat=1))
+        results[name + ".play_action"] = best
+
+        results[name + ".get_valid_moves"] = measure(
+            lambda: [game.get_valid_moves(game.current_player)
+                     for i in range(number)], number)
+        results[name + ".check_game_over"] = measure(
+            lambda: [game.check_game_over(game.current_player, valid_moves)
+                     for i in range(number)], number)
+
+
+def tree_benchmarks(results, number):
+    """Times the TreeNode operations on a Connect Four position.
+
+    Args:
+        results: A dictionary to add the results to.
+        number: An integer number of operations per timing.
+    """
+    game = ConnectFourGame()
+    psa_vector = np.full(game.action_size, 1 / game.action_size)
+    valid_moves = game.get_valid_moves(game.current_player)
+
+    root = TreeNode()
+    root.expand_node(game, psa_vector)
+    root.Nsa = 100
+    for idx in range(len(root.legal_actions)):
+        child = root.get_child(idx)
+        child.back_prop(0.1 * idx)
+
+    results["tree.select_child"] = measure(
+        lambda: [root.select_child() for i in range(number)], number)
+
+    def expand_nodes():
+        for i in range(number):
+            node = TreeNode()
+            node.valid_moves = valid_moves
+            node.terminal = False
+            node.expand_node(game, psa_vector)
+
+    results["tree.expand_node"] = measure(expand_nodes, number)
+
+    # A path as deep as a long game.
+    leaf = root
+    for depth in range(40):
+        leaf = TreeNode(parent=leaf)
+    mcts = MonteCarloTreeSearch(None)
+
+    results["tree.back_prop_40"] = measure(
+        lambda: [mcts.back_prop(leaf, 0.5) for i in range(number)], number)
+
+
+def search_benchmarks(results, num_sims, game_names, net=None, config=None):
+    """Times full searches from the start of the games.
+
+    Args:
+        results: A dictionary to add the results to.
+        num_sims: An integer number of simulations per search.
+        game_names: A list of GAMES keys to search.
+        net: An object containing the neural network, or None to search with
+            uniform priors.
+        config: The Config of the searches. Defaults to CFG.
+    """
+    config = CFG if config is None else config
+    label = "search_uniform" if net is None else "search_net"
+
+    for name in game_names:
+        game = GAMES[name]()
+        evaluator = UniformEvaluator(game) if net is None else net
+
+        def search():
+            mcts = MonteCarloTreeSearch(evaluator, config=config)
+            mcts.search(game, TreeNode(), config.temp_final, num_sims)
+
+        results[name + "." + label + "_per_sim"] = measure(
+            search, num_sims, repeat=3)
+
+
+def network_benchmarks(results, game_name, train_batches):
+    """Times the network predictions and training.
+
+    Args:
+        results: A dictionary to add the results to.
+        game_name: A string key of GAMES to size the network for.
+        train_batches: An integer number of training batches.
+
+    Returns:
+        The network, or None if TensorFlow is not installed.
+    """
+    try:
+        from neural_net import NeuralNetworkWrapper
+    except ImportError:
+        print("TensorFlow is not installed, skipping the network benchmarks.")
+        return None
+
+    # A training timing runs one epoch and records no loss.
+    config = CFG.copy(epochs=1, record_loss=0)
+    game = GAMES[game_name]()
+    net = NeuralNetworkWrapper(game, config)
+    state = np.asarray(game.state, dtype=np.float32)
+
+    for batch_size in BATCH_SIZES:
+        states = np.repeat(state[np.newaxis], batch_size, axis=0)
+        net.predict_batch(states)  # Warm up.
+        results["predict_batch_%d" % batch_size] = measure(
+            lambda: net.predict_batch(states), 1)
+
+    training_data = [[state, np.full(game.action_size, 1 / game.action_size),
+                      0.0]] * (config.batch_size * train_batches)
+
+    results["train_step"] = measure(lambda: net.train(training_data),
+                                    train_batches, repeat=2)
+
+    return net
+
+
+def compare(results, baseline, tolerance):
+    """Finds the results which are slower than the baseline.
+
+    Args:
+        results: A dictionary of results.
+        baseline: A dictionary of baseline results.
+        tolerance: A float allowed relative slowdown.
+
+    Returns:
+        A list of (name, result, baseline result) tuples of regressions.
+    """
+    regressions = []
+
+    for name, value in sorted(results.items()):
+        if name not in baseline:
+            continue
+
+        ratio = value / baseline[name]
+        print("%-40s %12.3e %7.2fx" % (name, value, ratio))
+
+        if ratio > 1 + tolerance:
+            regressions.append((name, value, baseline[name]))
+
+    return regressions
+
+
+def run(arguments):
+    """Runs the benchmarks selected on the command line.
+
+    Args:
+        arguments: The parsed command line arguments.
+
+    Returns:
+        A dictionary with the seconds per operation of every benchmark.
+    """
+    results = {}
+
+    game_benchmarks(results, arguments.number)
+    tree_benchmarks(results, arguments.number)
+    search_benchmarks(results, arguments.num_sims, list(GAMES))
+
+    if not arguments.skip_network:
+        net = network_benchmarks(results, arguments.network_game,
+                                 arguments.train_batches)
+        if net is not None:
+            search_benchmarks(results, arguments.num_sims,
+                              [arguments.network_game], net)
+
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--output", help="JSON file for the results.",
+                        default="benchmark_results.json")
+    parser.add_argument("--baseline", help="JSON file with the baseline.",
+                        default=os.path.join("benchmarks", "baseline.json"))
+    parser.add_argument("--tolerance", help="Allowed relative slowdown.",
+                        type=float, default=0.2)
+    parser.add_argument("--update_baseline", help="Store the results as the "
+                                                  "new baseline.",
+                        action="store_true")
+    parser.add_argument("--number", help="Operations per timing of the "
+                                         "micro benchmarks.",
+                        type=int, default=1000)
+    parser.add_argument("--num_sims", help="Simulations per search.",
+                        type=int, default=100)
+    parser.add_argument("--network_game", help="Game the network is sized "
+                                               "for.",
+                        choices=list(GAMES), default="connect_four")
+    parser.add_argument("--train_batches", help="Batches per training "
+                                                "timing.",
+                        type=int, default=10)
+    parser.add_argument("--skip_network", help="Skip the TensorFlow "
+                                               "benchmarks.",
+                        action="store_true")
+    arguments = parser.parse_args()
+
+    results = run(arguments)
+
+    with open(arguments.output, "w") as output_file:
+        json.dump(results, output_file, indent=1, sort_keys=True)
+
+    if arguments.update_baseline:
+        with open(arguments.baseline, "w") as baseline_file:
+            json.dump(results, baseline_file, indent=1, sort_keys=True)
+        print("Baseline updated:", arguments.baseline)
+    elif os.path.exists(arguments.baseline):
+        with open(arguments.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+
+        regressions = compare(results, baseline, arguments.tolerance)
+
+        for name, value, baseline_value in regressions:
+            print("Regression:", name, "%.3e s, baseline %.3e s" %
+                  (value, baseline_value))
+
+        if regressions:
+            sys.exit(1)
+    else:
+        # Without a baseline the check would pass without comparing anything.
+        sys.exit("No baseline at %s. Create one with --update_baseline on "
+                 "the machine the checks run on." % arguments.baseline)
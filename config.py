@@ -23,8 +23,14 @@
 """Class to represent a configuration file."""
 
 
-class CFG(object):
-    """Represents a static configuration file used through the application.
+class Config(object):
+    """Represents a configuration used through the application.
+
+    The class attributes are the defaults, and every instance can override
+    them, so several configurations can live in one process. CFG is the
+    default instance, used by the classes which aren't given a configuration
+    explicitly. main.py builds its own instance from the command line and
+    passes it down, so CFG always holds the defaults.
 
     Attributes:
         num_iterations: Number of iterations.
@@ -51,6 +57,66 @@ class CFG(object):
         record_loss: Binary to record policy and value loss to a file.
         loss_file: Name of the file to record loss.
         game: Number of the game. 0: Tic Tac Toe, 1: Othello, 2: Connect Four.
+        max_tree_nodes: Node budget of the MCTS tree. 0 means no limit.
+        opening_cache_plies: Number of opening plies whose evaluations and
+            search statistics are shared by the self-play games of an
+            iteration. 0 disables the cache.
+        playout_cap_fraction: Fraction of self-play moves which get a full
+            search and become training examples. 1 searches every move fully.
+        num_fast_mcts_sims: Number of MCTS simulations of the other moves.
+        resign: Binary to let players resign hopeless games.
+        resign_threshold: Initial root value below which a player resigns.
+        resign_disable_fraction: Fraction of self-play games played to the
+            end to measure the false resign rate.
+        resign_false_positive_rate: Target false resign rate used to tune the
+            resign threshold.
+        gumbel: Binary to use the Gumbel root search with sequential halving
+            and completed Q policy targets.
+        gumbel_max_actions: Number of root moves sampled by the Gumbel search.
+        gumbel_c_visit: Visit offset of the sigma transform of Q values.
+        gumbel_c_scale: Scale of the sigma transform of Q values.
+        adaptive_sims: Binary to stop searches early once the root policy has
+            converged and spend the saved simulations on later moves.
+        kl_threshold: KL divergence between successive root visit
+            distributions below which the search stops.
+        kl_check_interval: Number of simulations between convergence checks.
+        column_actions: Binary to encode Connect Four moves by column, which
+            shrinks the action space from 42 to 7.
+        solver_empty_squares: Number of empty squares at or below which
+            positions are solved exactly instead of searched. 0 disables the
+            endgame solver.
+        solver_node_limit: Maximum number of positions searched by the
+            endgame solver before it gives up on a position.
+        eval_workers: Number of worker processes playing evaluation games in
+            parallel. 0 plays them one after another in the main process.
+        sprt_margin: Distance of the SPRT hypotheses from eval_win_rate.
+        sprt_alpha: SPRT probability of accepting a network which is not
+            better.
+        sprt_beta: SPRT probability of rejecting a network which is better.
+        ladder: Binary to rate every accepted network with Elo against the
+            earlier ones.
+        ladder_games: Number of games per pair of networks on the ladder.
+        ladder_opponents: Number of closest rated networks a new network
+            plays on the ladder.
+        tablebase_eval: Binary to also evaluate the Tic Tac Toe network
+            against perfect play from the tablebase after each iteration.
+        profile: Binary to time the phases of every iteration.
+        profile_iteration: Number of the iteration to run under cProfile.
+            0 disables cProfile.
+        profile_file: Name of the JSON lines file with the phase times.
+        metrics_port: Port serving the training metrics in the Prometheus
+            text format. 0 disables the server.
+        metrics_textfile: Path of a file the metrics are written to after
+            every self-play game and iteration. Empty disables the file.
+        log_max_bytes: Size in bytes at which the loss file is rotated.
+            0 never rotates it.
+        log_backups: Number of rotated loss files to keep.
+        run_state: Binary to checkpoint the progress of training, so a run
+            can be resumed after a crash. Off by default, since it adds
+            disk writes to every self-play game.
+        resume: Binary to continue training from the last run state.
+        backend: Name of the network backend. "tensorflow" trains and plays,
+            "numpy" only plays, from weights saved by the tensorflow backend.
     """
     num_iterations = 4
     num_games = 30
@@ -76,3 +142,73 @@ class CFG(object):
     record_loss = 1
     loss_file = "loss.txt"
     game = 2
+    max_tree_nodes = 0
+    opening_cache_plies = 0
+    playout_cap_fraction = 1.0
+    num_fast_mcts_sims = 8
+    resign = 0
+    resign_threshold = -0.9
+    resign_disable_fraction = 0.1
+    resign_false_positive_rate = 0.05
+    gumbel = 0
+    gumbel_max_actions = 16
+    gumbel_c_visit = 50
+    gumbel_c_scale = 0.1
+    adaptive_sims = 0
+    kl_threshold = 0.002
+    kl_check_interval = 8
+    column_actions = 0
+    solver_empty_squares = 0
+    solver_node_limit = 100000
+    eval_workers = 0
+    sprt_margin = 0.15
+    sprt_alpha = 0.05
+    sprt_beta = 0.05
+    ladder = 0
+    ladder_games = 10
+    ladder_opponents = 2
+    tablebase_eval = 0
+    profile = 0
+    profile_iteration = 0
+    profile_file = "profile.jsonl"
+    metrics_port = 0
+    metrics_textfile = ""
+    log_max_bytes = 10000000
+    log_backups = 3
+    run_state = 0
+    resume = 0
+    backend = "tensorflow"
+
+    def __init__(self, **values):
+        """Initializes Config with the values which differ from the defaults.
+
+        Args:
+            values: Option names and their values.
+
+        Raises:
+            AttributeError: If an option doesn't exist.
+        """
+        for name, value in values.items():
+            if not hasattr(Config, name) or name.startswith("_"):
+                raise AttributeError("Unknown option: %s" % name)
+            setattr(self, name, value)
+
+    def as_dict(self):
+        """Returns a dictionary with the value of every option."""
+        return {name: getattr(self, name) for name in vars(Config)
+                if not name.startswith("_") and
+                not callable(getattr(Config, name))}
+
+    def copy(self, **values):
+        """Returns a copy of this configuration with some values changed.
+
+        Args:
+            values: Option names and their new values.
+        """
+        options = self.as_dict()
+        options.update(values)
+        return Config(**options)
+
+
+# Default configuration.
+CFG = Config()
@@ -25,7 +25,8 @@ from copy import deepcopy
 
 import numpy as np
 
-from game import Game
+from game import Game, find_winner, get_square_windows, get_symmetries, \
+    get_windows, get_zobrist_keys
 
 
 class ConnectFourGame(Game):
@@ -37,19 +38,30 @@ class ConnectFourGame(Game):
         connect: An integer indicating the number of pieces to connect.
         current_player: An integer to keep track of the current player.
         state: A list which stores the game state in matrix form.
-        action_size: An integer indicating the total number of board squares.
-        directions: A dictionary containing tuples to check for valid moves.
+        column_actions: A boolean value indicating if moves are encoded by
+            column instead of by board square.
+        action_size: An integer indicating the number of possible actions.
+            This is the number of board squares, or the number of columns if
+            moves are encoded by column.
+        windows: A matrix with the flat square indices of every line of
+            connect squares.
+        square_windows: A tuple with the lines through each square.
     """
 
-    def __init__(self):
+    def __init__(self, column_actions=False, row=6, column=7, connect=4):
         """Initializes ConnectFourGame with the initial board state."""
         super().__init__()
-        self.row = 6
-        self.column = 7
-        self.connect = 4
+        self.row = row
+        self.column = column
+        self.connect = connect
         self.current_player = 1
         self.state = []
-        self.action_size = self.row * self.column
+        self.column_actions = column_actions
+
+        if self.column_actions:
+            self.action_size = self.column
+        else:
+            self.action_size = self.row * self.column
 
         # Create a n x n matrix to represent the board
         for i in range(self.row):
@@ -57,16 +69,11 @@ class ConnectFourGame(Game):
 
         self.state = np.array(self.state)
 
-        self.directions = {
-            0: (-1, -1),
-            1: (-1, 0),
-            2: (-1, 1),
-            3: (0, -1),
-            4: (0, 1),
-            5: (1, -1),
-            6: (1, 0),
-            7: (1, 1)
-        }
+        self.windows = get_windows(self.row, self.column, self.connect)
+        self.square_windows = get_square_windows(self.row, self.column,
+                                                 self.connect)
+        self.symmetries = get_symmetries(self.row, self.column, "mirror")
+        self.zobrist = get_zobrist_keys(self.row * self.column)
 
     def clone(self):
         """Creates a deep clone of the game object.
@@ -74,11 +81,27 @@ class ConnectFourGame(Game):
         Returns:
             the cloned game object.
         """
-        game_clone = ConnectFourGame()
+        game_clone = ConnectFourGame(self.column_actions, self.row,
+                                     self.column, self.connect)
         game_clone.state = deepcopy(self.state)
         game_clone.current_player = self.current_player
+        self.copy_key(game_clone)
         return game_clone
 
+    def get_action_symmetry(self, index):
+        """Returns how a symmetry of the board maps the actions.
+
+        Args:
+            index: An integer position in symmetries.
+
+        Returns:
+            A tuple with the image of every action id.
+        """
+        # The mirror keeps the rows, so the top row maps the columns.
+        if self.column_actions:
+            return self.symmetries[index][:self.column]
+        return super().get_action_symmetry(index)
+
     def play_action(self, action):
         """Plays an action on the game board.
 
@@ -89,18 +112,33 @@ class ConnectFourGame(Game):
         y = action[2]
 
         self.state[x][y] = self.current_player
+        self.toggle_key(x * self.column + y, self.current_player)
         self.current_player = -self.current_player
 
     def get_valid_moves(self, current_player):
         """Returns a list of moves along with their validity.
 
         Searches the board for zeros(0). 0 represents an empty square.
+        There is one move per board square, or one per column if moves are
+        encoded by column.
 
         Returns:
             A list containing moves in the form of (validity, row, column).
         """
         valid_moves = []
 
+        if self.column_actions:
+            for y in range(self.column):
+                # A piece drops to the lowest empty square of the column.
+                for x in range(self.row - 1, -1, -1):
+                    if self.state[x][y] == 0:
+                        valid_moves.append((1, x, y))
+                        break
+                else:
+                    valid_moves.append((0, None, None))
+
+            return np.array(valid_moves)
+
         for x in range(self.row):
             for y in range(self.column):
                 if self.state[x][y] == 0:
@@ -116,7 +154,8 @@ class ConnectFourGame(Game):
 
         return np.array(valid_moves)
 
-    def check_game_over(self, current_player):
+    def check_game_over(self, current_player, valid_moves=None,
+                        last_move=None):
         """Checks if the game is over and return a possible winner.
 
         There are 3 possible scenarios.
@@ -126,101 +165,41 @@ class ConnectFourGame(Game):
 
         Args:
             current_player: An integer representing the current player.
+            valid_moves: The result of get_valid_moves for the current player
+                if it is already known, which saves generating it again.
+            last_move: The move which led to this state from a state where
+                the game was not over. Only the lines through it are checked.
 
         Returns:
             A bool representing the game over state.
             An integer action value. (win: 1, loss: -1, draw: 0
         """
+        if last_move is None:
+            windows = self.windows
+        else:
+            windows = self.square_windows[
+                last_move[1] * self.column + last_move[2]]
 
-        player_a = current_player
-        player_b = -current_player
-
-        for x in range(self.row):
-            for y in range(self.column):
-                player_a_count = 0
-                player_b_count = 0
-
-                # Search for the player a.
-                if self.state[x][y] == player_a:
-                    player_a_count += 1
+        winner = find_winner(self.state, windows, self.connect)
 
-                    # Search in all 8 directions for a similar piece.
-                    for i in range(len(self.directions)):
-                        d = self.directions[i]
-
-                        r = x + d[0]
-                        c = y + d[1]
-
-                        if r < self.row and c < self.column:
-                            count = 1
-
-                            # Keep searching for a connect.
-                            while True:
-                                r = x + d[0] * count
-                                c = y + d[1] * count
-
-                                count += 1
-
-                                if 0 <= r < self.row and 0 <= c < self.column:
-                                    if self.state[r][c] == player_a:
-                                        player_a_count += 1
-                                    else:
-                                        break
-                                else:
-                                    break
-
-                        if player_a_count >= self.connect:
-                            return True, 1
-
-                        player_a_count = 1
-
-                # Search for the player b.
-                if self.state[x][y] == player_b:
-                    player_b_count += 1
-
-                    # Search in all 8 directions for a similar piece.
-                    for i in range(len(self.directions)):
-                        d = self.directions[i]
-
-                        r = x + d[0]
-                        c = y + d[1]
-
-                        if r < self.row and c < self.column:
-                            count = 1
-
-                            # Keep searching for a connect.
-                            while True:
-                                r = x + d[0] * count
-                                c = y + d[1] * count
-
-                                count += 1
-
-                                if 0 <= r < self.row and 0 <= c < self.column:
-                                    if self.state[r][c] == player_b:
-                                        player_b_count += 1
-                                    else:
-                                        break
-                                else:
-                                    break
-
-                        if player_b_count >= self.connect:
-                            return True, -1
-
-                        player_b_count = 1
+        if winner == current_player:
+            return True, 1
+        elif winner == -current_player:
+            return True, -1
 
         # There are still moves left so the game is not over
-        valid_moves = self.get_valid_moves(current_player)
-
-        for move in valid_moves:
-            if move[0] is 1:
+        if valid_moves is None:
+            if (np.asarray(self.state) == 0).any():
                 return False, 0
+        elif any(move[0] == 1 for move in valid_moves):
+            return False, 0
 
         # If there are no moves left the game is over without a winner
         return True, 0
 
     def print_board(self):
         """Prints the board state."""
-        print("   0    1    2    3    4    5    6")
+        print("   " + "    ".join(str(y) for y in range(self.column)))
         for x in range(self.row):
             print(x, end='')
             for y in range(self.column):
@@ -0,0 +1,269 @@
+# MIT License
+#
+# Copyright (c) 2018 Blanyal D'Souza
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+"""Exact endgame solver for Connect Four."""
+import numpy as np
+
+from solver import Solver
+
+
+class ConnectFourSolver(Solver):
+    """Solves Connect Four positions with a bitboard negamax search.
+
+    The board is packed into integers with one bit per square and a spare
+    bit on top of every column, so connections are found with a few shifts.
+    Positions are solved for win, draw or loss with alpha-beta pruning,
+    centre first move ordering and a transposition table.
+
+    Attributes:
+        max_table_size: An integer number of positions after which the
+            transposition table is cleared.
+        table: A dictionary which maps positions to their bounded values.
+        row: An integer indicating the length of the board row.
+        column: An integer indicating the length of the board column.
+        connect: An integer indicating the number of pieces to connect.
+        bottom: A list with the bit of the lowest square of every column.
+        top: A list with the bit of the highest square of every column.
+        shifts: A tuple of bit shifts along the four line directions.
+        order: A tuple with the columns in search order.
+    """
+
+    LOWER = 0
+    EXACT = 1
+    UPPER = 2
+
+    def __init__(self, max_empty=None, node_limit=None, max_table_size=1000000,
+                 config=None):
+        """Initializes ConnectFourSolver with its limits and empty stats."""
+        super().__init__(max_empty, node_limit, config)
+        self.max_table_size = max_table_size
+        self.table = {}
+        self.row = 0
+        self.column = 0
+        self.connect = 0
+        self.bottom = []
+        self.top = []
+        self.shifts = ()
+        self.order = ()
+
+    def solve_position(self, game):
+        """Searches a position to the end of the game.
+
+        Args:
+            game: A ConnectFourGame which is not over.
+
+        Returns:
+            A tuple of the value of the position for the player to move and
+            the action id of a best move.
+        """
+        self.set_board(game)
+        position, mask = self.encode(np.asarray(game.state),
+                                     game.current_player)
+        value, column = self.solve_root(position, mask)
+
+        valid_moves = game.get_valid_moves(game.current_player)
+        for idx, move in enumerate(valid_moves):
+            if move[0] == 1 and move[2] == column:
+                return value, idx
+
+    def set_board(self, game):
+        """Sets up the masks for the board size of a game.
+
+        Args:
+            game: A ConnectFourGame.
+        """
+        if (self.row, self.column, self.connect) == \
+                (game.row, game.column, game.connect):
+            return
+
+        self.row = game.row
+        self.column = game.column
+        self.connect = game.connect
+        self.table = {}
+
+        height = self.row + 1
+        self.bottom = [1 << (y * height) for y in range(self.column)]
+        self.top = [1 << (self.row - 1 + y * height)
+                    for y in range(self.column)]
+        self.shifts = (1, height, height - 1, height + 1)
+
+        # Search the centre columns first.
+        self.order = tuple(sorted(range(self.column),
+                                  key=lambda y: abs(2 * y - self.column + 1)))
+
+    def encode(self, state, current_player):
+        """Packs a board into bitboards.
+
+        Bit y * (row + 1) + k stands for the k-th square from the bottom of
+        column y.
+
+        Args:
+            state: A matrix with the game state.
+            current_player: An integer representing the player to move.
+
+        Returns:
+            An integer with the pieces of the player to move.
+            An integer with the pieces of both players.
+        """
+        position = 0
+        mask = 0
+
+        for x in range(self.row):
+            for y in range(self.column):
+                if state[x][y] != 0:
+                    bit = 1 << (y * (self.row + 1) + self.row - 1 - x)
+                    mask |= bit
+                    if state[x][y] == current_player:
+                        position |= bit
+
+        return position, mask
+
+    def is_connected(self, position):
+        """Checks if a bitboard contains a connection.
+
+        Args:
+            position: An integer with the pieces of one player.
+
+        Returns:
+            A boolean value indicating if the pieces connect.
+        """
+        for shift in self.shifts:
+            pieces = position
+            for i in range(self.connect - 1):
+                pieces &= pieces >> shift
+            if pieces:
+                return True
+        return False
+
+    def winning_column(self, position, mask):
+        """Returns a column where the player to move connects at once.
+
+        Args:
+            position: An integer with the pieces of the player to move.
+            mask: An integer with the pieces of both players.
+
+        Returns:
+            An integer column, or None if there is no winning move.
+        """
+        for y in self.order:
+            if not mask & self.top[y]:
+                move = (mask + self.bottom[y]) & ~mask
+                if self.is_connected(position | move):
+                    return y
+        return None
+
+    def solve_root(self, position, mask):
+        """Searches the root for its value and a best move.
+
+        Args:
+            position: An integer with the pieces of the player to move.
+            mask: An integer with the pieces of both players.
+
+        Returns:
+            The value of the position for the player to move.
+            An integer column of a best move.
+        """
+        column = self.winning_column(position, mask)
+        if column is not None:
+            return 1, column
+
+        best_value = -2
+        best_column = None
+        alpha = -1
+
+        for y in self.order:
+            if mask & self.top[y]:
+                continue
+
+            value = -self.negamax(position ^ mask,
+                                  mask | (mask + self.bottom[y]), -1, -alpha)
+
+            if value > best_value:
+                best_value = value
+                best_column = y
+                alpha = max(alpha, value)
+
+                if value == 1:
+                    break
+
+        return best_value, best_column
+
+    def negamax(self, position, mask, alpha, beta):
+        """Negamax search with alpha-beta pruning.
+
+        Args:
+            position: An integer with the pieces of the player to move.
+            mask: An integer with the pieces of both players.
+            alpha: The lower bound of the search window.
+            beta: The upper bound of the search window.
+
+        Returns:
+            The value of the position for the player to move.
+        """
+        self.count_node()
+
+        if self.winning_column(position, mask) is not None:
+            return 1
+
+        moves = [y for y in self.order if not mask & self.top[y]]
+        if not moves:
+            return 0
+
+        key = position + mask
+        entry = self.table.get(key)
+        if entry is not None:
+            flag, value = entry
+            if flag == self.EXACT:
+                return value
+            if flag == self.LOWER:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+            if alpha >= beta:
+                return value
+
+        alpha_orig = alpha
+        best_value = -1
+
+        for y in moves:
+            value = -self.negamax(position ^ mask,
+                                  mask | (mask + self.bottom[y]), -beta,
+                                  -alpha)
+
+            if value > best_value:
+                best_value = value
+                alpha = max(alpha, value)
+                if alpha >= beta:
+                    break
+
+        if len(self.table) >= self.max_table_size:
+            self.table = {}
+
+        if best_value <= alpha_orig:
+            flag = self.UPPER
+        elif best_value >= beta:
+            flag = self.LOWER
+        else:
+            flag = self.EXACT
+        self.table[key] = (flag, best_value)
+
+        return best_value
@@ -23,6 +23,8 @@
 """Class to run unit tests for the ConnectFourGame class."""
 from unittest import TestCase
 
+import numpy as np
+
 from connect_four.connect_four_game import ConnectFourGame
 
 
@@ -96,3 +98,48 @@ class TestConnectFourGame(TestCase):
 
         self.assertEqual(game_over, False)
         self.assertEqual(value, 0)
+
+    def test_get_valid_moves(self):
+        """Test case for the get_valid_moves function.
+
+        Test for one move per column with column actions.
+        """
+        game = ConnectFourGame(column_actions=True)
+        game.state = np.array([[1, 0, 0, 0, 0, 0, 0],
+                               [-1, 0, 0, 0, 0, 0, 0],
+                               [1, 0, 0, 0, 0, 0, 0],
+                               [-1, 0, 0, 0, 0, 0, 0],
+                               [1, 0, -1, 0, 0, 0, 0],
+                               [-1, 0, 1, 0, 0, 0, 1]])
+        valid_moves = game.get_valid_moves(1)
+
+        self.assertEqual(game.action_size, 7)
+        self.assertEqual(len(valid_moves), 7)
+        self.assertEqual(tuple(valid_moves[0]), (0, None, None))
+        self.assertEqual(tuple(valid_moves[1]), (1, 5, 1))
+        self.assertEqual(tuple(valid_moves[2]), (1, 3, 2))
+
+    def test_check_game_over5(self):
+        """Test case for the check_game_over function.
+
+        Test for a win on a board with 7 rows and 9 columns, with and
+        without the last move.
+        """
+        game = ConnectFourGame(row=7, column=9)
+        game.state = [[0, 0, 0, 0, 0, 0, 0, 0, 0],
+                      [0, 0, 0, 0, 0, 0, 0, 0, 0],
+                      [0, 0, 0, 0, 0, 0, 0, 0, 0],
+                      [0, 0, 0, 0, 0, 0, 0, 0, 0],
+                      [0, 0, 0, 0, 0, 0, 0, 0, 0],
+                      [0, 0, 0, 0, -1, -1, -1, 0, 0],
+                      [0, 0, 0, 0, 1, 1, 1, 1, 0]]
+        game_over, value = game.check_game_over(-1, last_move=(1, 6, 7))
+
+        self.assertEqual(len(game.windows), 6 * 7 + 9 * 4 + 2 * 6 * 4)
+        self.assertEqual(game_over, True)
+        self.assertEqual(value, -1)
+
+        # Only the lines through the last move are checked.
+        game_over, value = game.check_game_over(-1, last_move=(1, 5, 4))
+
+        self.assertEqual(game_over, False)
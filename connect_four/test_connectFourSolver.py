@@ -0,0 +1,92 @@
+# MIT License
+#
+# Copyright (c) 2018 Blanyal D'Souza
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+"""Class to run unit tests for the ConnectFourSolver class."""
+from unittest import TestCase
+
+import numpy as np
+
+from connect_four.connect_four_game import ConnectFourGame
+from connect_four.connect_four_solver import ConnectFourSolver
+
+
+class TestConnectFourSolver(TestCase):
+    """Class to run unit tests for the ConnectFourSolver class."""
+
+    def test_solve1(self):
+        """Test case for the solve function.
+
+        Test for a win with the winning move.
+        """
+        game = ConnectFourGame(column_actions=True)
+        game.state = np.array([[0, 0, 0, 0, 0, 0, 0],
+                               [0, 0, 0, 0, 0, 0, 0],
+                               [0, 0, 0, 0, 0, 0, 0],
+                               [0, 0, 0, 0, 0, 0, 0],
+                               [-1, -1, -1, 0, 0, 0, 0],
+                               [1, 1, 1, 0, 0, 0, 0]])
+        solver = ConnectFourSolver(max_empty=42)
+
+        self.assertEqual(solver.solve(game), (1, 3))
+        self.assertEqual(solver.solved, 1)
+
+    def test_solve2(self):
+        """Test case for the solve function.
+
+        Test for a loss against two threats.
+        """
+        game = ConnectFourGame()
+        game.current_player = -1
+        game.state = np.array([[0, 0, 0, 0, 0, 0, 0],
+                               [0, 0, 0, 0, 0, 0, 0],
+                               [0, 0, 0, 0, 0, 0, 0],
+                               [0, 0, 0, 0, 0, 0, 0],
+                               [0, 0, -1, -1, 0, 0, 0],
+                               [0, 1, 1, 1, 0, 0, 0]])
+        solver = ConnectFourSolver(max_empty=42)
+        value, action_id = solver.solve(game)
+
+        self.assertEqual(value, -1)
+        self.assertEqual(game.get_valid_moves(-1)[action_id][0], 1)
+
+    def test_solve3(self):
+        """Test case for the solve function.
+
+        Test for positions with too many empty squares or nodes, and that
+        a position abandoned at the node limit is remembered.
+        """
+        game = ConnectFourGame()
+        solver = ConnectFourSolver(max_empty=20)
+
+        self.assertIsNone(solver.solve(game))
+        self.assertEqual(solver.calls, 0)
+
+        solver = ConnectFourSolver(max_empty=42, node_limit=100)
+
+        self.assertIsNone(solver.solve(game))
+        self.assertEqual(solver.aborted, 1)
+
+        # The abandoned position is not searched again.
+        nodes = solver.nodes
+
+        self.assertIsNone(solver.solve(game))
+        self.assertEqual((solver.calls, solver.nodes), (1, nodes))
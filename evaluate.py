@@ -21,24 +21,113 @@
 # SOFTWARE.
 # ==============================================================================
 """Class to evaluate network."""
-from config import CFG
-from mcts import TreeNode
+import math
+import multiprocessing
+
+from config import CFG, Config
+from mcts import MonteCarloTreeSearch, TreeNode
+from numpy_net import NumpyNetwork
+from metrics import METRICS
+from profiler import PROFILER
+
+# Searches, game and config of the worker process, set up by init_worker.
+worker_searches = None
+
+
+class SPRT(object):
+    """Sequential probability ratio test on the win rate of decisive games.
+
+    Tests the hypothesis that the win rate is eval_win_rate + margin against
+    eval_win_rate - margin. Draws carry no information about either, so
+    they are skipped like in the win rate.
+
+    Attributes:
+        llr: A float log likelihood ratio of the games so far.
+        win_llr: A float added to the ratio for a win.
+        loss_llr: A float added to the ratio for a loss.
+        upper: A float bound above which the candidate is accepted.
+        lower: A float bound below which the candidate is rejected.
+    """
+
+    def __init__(self, win_rate=None, margin=None, alpha=None, beta=None):
+        """Initializes SPRT with the hypotheses and error rates."""
+        win_rate = CFG.eval_win_rate if win_rate is None else win_rate
+        margin = CFG.sprt_margin if margin is None else margin
+        alpha = CFG.sprt_alpha if alpha is None else alpha
+        beta = CFG.sprt_beta if beta is None else beta
+
+        p0 = max(win_rate - margin, 1e-6)
+        p1 = min(win_rate + margin, 1 - 1e-6)
+
+        self.llr = 0.0
+        self.win_llr = math.log(p1 / p0)
+        self.loss_llr = math.log((1 - p1) / (1 - p0))
+        self.upper = math.log((1 - beta) / alpha)
+        self.lower = math.log(beta / (1 - alpha))
+
+    def update(self, value):
+        """Adds a game result to the test.
+
+        Args:
+            value: The result for the candidate. (win: 1, loss: -1, draw: 0)
+
+        Returns:
+            True if the candidate is accepted, False if it is rejected, or
+            None if more games are needed.
+        """
+        if value == 1:
+            self.llr += self.win_llr
+        elif value == -1:
+            self.llr += self.loss_llr
+
+        if self.llr >= self.upper:
+            return True
+        elif self.llr <= self.lower:
+            return False
+        return None
 
 
 class Evaluate(object):
-    """Represents the Policy and Value Resnet.
+    """Plays the current network against the evaluation network.
+
+    The networks swap colors every game, and the games stop early once the
+    SPRT decides. With eval_workers the games are played in parallel by
+    worker processes, which load both networks from saved models into
+    NumpyNetworks, so they never import TF.
 
     Attributes:
         current_mcts: An object for the current network's MCTS.
         eval_mcts: An object for the evaluation network's MCTS.
         game: An object containing the game state.
+        resignation: A Resignation object whose threshold ends hopeless games,
+            or None if games are always played to the end.
+        model_names: A tuple with the saved model names of the current and the
+            evaluation network, needed by the worker processes.
+        solver: An exact endgame solver for the worker searches, or None.
+        stop_early: A boolean value indicating if the games stop once the
+            SPRT decides.
+        num_games: An integer maximum number of games. Defaults to
+            num_eval_games of the config.
+        decision: True if the SPRT accepted the current network, False if it
+            rejected it, or None if the games ran out first.
+        config: The Config of the evaluation.
     """
 
-    def __init__(self, current_mcts, eval_mcts, game):
+    def __init__(self, current_mcts, eval_mcts, game, resignation=None,
+                 model_names=None, solver=None, stop_early=True,
+                 num_games=None, config=None):
         """Initializes Evaluate with the both network's MCTS and game state."""
+        self.config = CFG if config is None else config
         self.current_mcts = current_mcts
         self.eval_mcts = eval_mcts
         self.game = game
+        self.resignation = resignation
+        self.model_names = model_names
+        self.solver = solver
+        self.stop_early = stop_early
+        self.num_games = self.config.num_eval_games if num_games is None \
+            else num_games
+        self.decision = None
 
     def evaluate(self):
         """Play self-play games between the two networks and record game stats.
@@ -48,48 +137,178 @@ class Evaluate(object):
         """
         wins = 0
         losses = 0
+        sprt = SPRT(self.config.eval_win_rate, self.config.sprt_margin,
+                    self.config.sprt_alpha, self.config.sprt_beta)
+        self.decision = None
+
+        resign_threshold = None
+        if self.resignation is not None:
+            resign_threshold = self.resignation.threshold
+
+        # The current network plays first in every other game.
+        colors = [self.game.current_player * (1 - 2 * (i % 2))
+                  for i in range(self.num_games)]
+
+        pool = None
+        if self.config.eval_workers > 0 and self.model_names is not None:
+            # TF sessions don't survive a fork, so the workers are spawned.
+            pool = multiprocessing.get_context("spawn").Pool(
+                self.config.eval_workers, initializer=init_worker,
+                initargs=(self.config.as_dict(), self.game, self.model_names,
+                          self.solver))
+            # Results are taken in the order the games were handed out, so
+            # quick, often one-sided games can't stop the SPRT early.
+            results = pool.imap(
+                play_worker_game,
+                [(color, resign_threshold) for color in colors])
+        else:
+            results = (play_game(self.current_mcts, self.eval_mcts, self.game,
+                                 color, resign_threshold,
+                                 self.config.temp_final)
+                       for color in colors)
+
+        try:
+            for i, value in enumerate(results):
+                if value == 1:
+                    wins += 1
+                elif value == -1:
+                    losses += 1
+
+                PROFILER.count("evaluation_games")
+
+                result = {1: "win", -1: "loss", 0: "draw"}[value]
+                METRICS.inc("alphazero_evaluation_games_total", result=result)
 
-        # Self-play loop
-        for i in range(CFG.num_eval_games):
-            print("Start Evaluation Self-Play Game:", i, "\n")
-
-            game = self.game.clone()  # Create a fresh clone for each game.
-            game_over = False
-            value = 0
-            node = TreeNode()
-
-            player = game.current_player
-
-            # Keep playing until the game is in a terminal state.
-            while not game_over:
-                # MCTS simulations to get the best child node.
-                # If player_to_eval is 1 play using the current network
-                # Else play using the evaluation network.
-                if game.current_player == 1:
-                    best_child = self.current_mcts.search(game, node,
-                                                          CFG.temp_final)
-                else:
-                    best_child = self.eval_mcts.search(game, node,
-                                                       CFG.temp_final)
-
-                action = best_child.action
-                game.play_action(action)  # Play the child node's action.
-
-                game.print_board()
-
-                game_over, value = game.check_game_over(player)
-
-                best_child.parent = None
-                node = best_child  # Make the child node the root node.
-
-            if value == 1:
-                print("win")
-                wins += 1
-            elif value == -1:
-                print("loss")
-                losses += 1
-            else:
-                print("draw")
-            print("\n")
+                print("Evaluation game", i + 1, result)
+
+                decision = sprt.update(value)
+                if self.stop_early and decision is not None:
+                    self.decision = decision
+                    print("SPRT", "accepted" if self.decision else "rejected",
+                          "the current network after", i + 1, "games.")
+                    break
+        finally:
+            if pool is not None:
+                pool.terminate()
 
         return wins, losses
+
+
+def play_game(current_mcts, eval_mcts, game, current_color,
+              resign_threshold=None, temperature=None):
+    """Plays one game between two searches.
+
+    Args:
+        current_mcts: An object for the current network's MCTS.
+        eval_mcts: An object for the evaluation network's MCTS.
+        game: An object containing the starting game state.
+        current_color: An integer representing the player the current network
+            plays as.
+        resign_threshold: A float root value below which the player to move
+            resigns, or None if games are always played to the end.
+        temperature: A float to control the level of exploration. Defaults
+            to CFG.temp_final.
+
+    Returns:
+        The result for the current network. (win: 1, loss: -1, draw: 0)
+    """
+    if temperature is None:
+        temperature = CFG.temp_final
+
+    game = game.clone()  # Create a fresh clone for each game.
+    game_over = False
+    value = 0
+    searches = (current_mcts, eval_mcts)
+
+    # Each search keeps its own tree, so neither builds on the statistics
+    # the other gathered.
+    nodes = [TreeNode(), TreeNode()]
+
+    current_mcts.reset_budget()
+    eval_mcts.reset_budget()
+
+    # Keep playing until the game is in a terminal state.
+    while not game_over:
+        turn = 0 if game.current_player == current_color else 1
+        mcts = searches[turn]
+
+        with PROFILER.timer("evaluation_search"):
+            best_child = mcts.search(game, nodes[turn], temperature)
+
+        # The player to move gives up a hopeless position.
+        if resign_threshold is not None and \
+                mcts.root_value() < resign_threshold:
+            return -1 if mcts is current_mcts else 1
+
+        action = best_child.action
+        game.play_action(action)  # Play the child node's action.
+
+        game_over, value = game.check_game_over(current_color,
+                                                last_move=action)
+
+        # Move both trees to the new position.
+        nodes = [advance_tree(search, node, action)
+                 for search, node in zip(searches, nodes)]
+
+    return value
+
+
+def advance_tree(mcts, node, action):
+    """Moves the tree of a search to the position after a move.
+
+    Args:
+        mcts: An object for the MCTS owning the tree.
+        node: A TreeNode representing the root of the tree.
+        action: The move which was played at the root.
+
+    Returns:
+        The child of the root reached by the move, which becomes the new
+        root, or a new TreeNode if the search never created it.
+    """
+    for child in node.children.values():
+        if child.action == action:
+            mcts.set_root(child)
+            return child
+
+    node.release()
+    return TreeNode()
+
+
+def init_worker(config, game, model_names, solver):
+    """Sets up the searches of an evaluation worker process.
+
+    Args:
+        config: A dictionary with the Config values of the parent process.
+        game: An object containing the game state.
+        model_names: A tuple with the saved model names of the current and the
+            evaluation network.
+        solver: An exact endgame solver, or None.
+    """
+    global worker_searches
+
+    config = Config(**config)
+
+    worker_searches = []
+    for model_name in model_names:
+        net = NumpyNetwork(game, config)
+        net.load_model(model_name)
+        worker_searches.append(MonteCarloTreeSearch(net, solver=solver,
+                                                    config=config))
+
+    worker_searches += [game, config]
+
+
+def play_worker_game(arguments):
+    """Plays one evaluation game in a worker process.
+
+    Args:
+        arguments: A tuple with the color of the current network and the
+            resign threshold.
+
+    Returns:
+        The result for the current network. (win: 1, loss: -1, draw: 0)
+    """
+    current_mcts, eval_mcts, game, config = worker_searches
+    current_color, resign_threshold = arguments
+    return play_game(current_mcts, eval_mcts, game, current_color,
+                     resign_threshold, config.temp_final)
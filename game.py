@@ -21,14 +21,249 @@
 # SOFTWARE.
 # ==============================================================================
 """Base Game Class."""
+from functools import lru_cache
+
+import numpy as np
+
+
+@lru_cache(maxsize=None)
+def get_windows(row, column, connect):
+    """Returns every line of connect squares on a board.
+
+    The table is built once per board size and shared by all games of that
+    size.
+
+    Args:
+        row: An integer indicating the length of the board row.
+        column: An integer indicating the length of the board column.
+        connect: An integer indicating the number of squares in a line.
+
+    Returns:
+        A matrix with the flat square indices of one line per row.
+    """
+    windows = []
+
+    # Horizontal, vertical, major and minor diagonal lines.
+    for dx, dy in ((0, 1), (1, 0), (1, 1), (1, -1)):
+        for x in range(row):
+            for y in range(column):
+                end_x = x + dx * (connect - 1)
+                end_y = y + dy * (connect - 1)
+
+                if 0 <= end_x < row and 0 <= end_y < column:
+                    windows.append([(x + dx * i) * column + y + dy * i
+                                    for i in range(connect)])
+
+    windows = np.array(windows, dtype=np.intp).reshape(-1, connect)
+    windows.flags.writeable = False
+    return windows
+
+
+@lru_cache(maxsize=None)
+def get_square_windows(row, column, connect):
+    """Returns the lines of connect squares through each square of a board.
+
+    Args:
+        row: An integer indicating the length of the board row.
+        column: An integer indicating the length of the board column.
+        connect: An integer indicating the number of squares in a line.
+
+    Returns:
+        A tuple with a matrix of lines, as in get_windows, for every square.
+    """
+    windows = get_windows(row, column, connect)
+    return tuple(windows[np.any(windows == square, axis=1)]
+                 for square in range(row * column))
+
+
+def find_winner(state, windows, connect):
+    """Finds a player who fills a line of a board.
+
+    Args:
+        state: A matrix with the game state.
+        windows: A matrix of lines as returned by get_windows.
+        connect: An integer indicating the number of squares in a line.
+
+    Returns:
+        An integer representing the player with a full line, or 0 if there
+        is none.
+    """
+    sums = np.asarray(state).reshape(-1)[windows].sum(axis=1)
+    full = sums[np.abs(sums) == connect]
+
+    if full.size:
+        return int(np.sign(full[0]))
+    return 0
+
+
+@lru_cache(maxsize=None)
+def get_zobrist_keys(num_squares):
+    """Returns random 64 bit keys for the pieces on every square.
+
+    The keys come from a fixed seed, so every process hashes a position to
+    the same key.
+
+    Args:
+        num_squares: An integer number of board squares.
+
+    Returns:
+        A tuple with the keys of player 1's pieces, the keys of player -1's
+        pieces and the key of player -1 to move.
+    """
+    rng = np.random.RandomState(num_squares)
+    halves = rng.randint(0, 2 ** 32, size=(2, 2, num_squares + 1),
+                         dtype=np.uint64)
+    keys = [[int(high) << 32 | int(low) for high, low in zip(*player)]
+            for player in halves]
+
+    return tuple(keys[0][:-1]), tuple(keys[1][:-1]), keys[0][-1]
+
+
+@lru_cache(maxsize=None)
+def get_symmetries(row, column, group):
+    """Returns the square permutations of a symmetry group of the board.
+
+    Args:
+        row: An integer indicating the length of the board row.
+        column: An integer indicating the length of the board column.
+        group: "dihedral" for the rotations and reflections of a square
+            board, "mirror" for the left-right reflection, or "identity".
+
+    Returns:
+        A tuple of permutations, which map each flat square index to its
+        image. The identity comes first.
+    """
+    squares = np.arange(row * column).reshape(row, column)
+
+    if group == "dihedral":
+        boards = [np.rot90(squares, i) for i in range(4)] + \
+                 [np.fliplr(np.rot90(squares, i)) for i in range(4)]
+    elif group == "mirror":
+        boards = [squares, np.fliplr(squares)]
+    else:
+        boards = [squares]
+
+    return tuple(tuple(int(square) for square in np.argsort(board.flatten()))
+                 for board in boards)
 
 
 class Game(object):
-    """Represents the game board and its logic for a 2 player board game."""
+    """Represents the game board and its logic for a 2 player board game.
+
+    Games keep a Zobrist key of the position up to date as moves are played.
+    A key is recomputed from scratch only after the state is replaced by a
+    new array. Changing the state in place other than by play_action
+    leaves the key out of date.
+
+    Attributes:
+        symmetries: The square permutations of the game's symmetry group as
+            returned by get_symmetries.
+        zobrist: The Zobrist keys as returned by get_zobrist_keys.
+        board_keys: A list with the key of the board under each symmetry.
+        key_state: The state object the board keys were computed for.
+    """
 
     def __init__(self):
         """Initializes Game with the initial board state."""
-        pass
+        self.symmetries = None
+        self.zobrist = None
+        self.board_keys = None
+        self.key_state = None
+
+    def get_key(self):
+        """Returns the Zobrist key of the position.
+
+        Returns:
+            A 64 bit integer key of the board and the player to move.
+        """
+        return self.side_key(self.get_board_keys()[0])
+
+    def get_canonical_key(self):
+        """Returns the key of the position shared by all its symmetries.
+
+        Returns:
+            A 64 bit integer key, which is the smallest key of the board
+            under the game's symmetry group combined with the player to move.
+        """
+        return self.side_key(min(self.get_board_keys()))
+
+    def get_canonical_symmetry(self):
+        """Returns the symmetry which maps the board to its canonical key.
+
+        Returns:
+            An integer position in symmetries.
+        """
+        board_keys = self.get_board_keys()
+        return board_keys.index(min(board_keys))
+
+    def get_action_symmetry(self, index):
+        """Returns how a symmetry of the board maps the actions.
+
+        Args:
+            index: An integer position in symmetries.
+
+        Returns:
+            A tuple with the image of every action id. Actions are board
+            squares unless a game encodes them differently.
+        """
+        return self.symmetries[index]
+
+    def side_key(self, board_key):
+        """Adds the player to move to a board key.
+
+        Args:
+            board_key: An integer key of the board.
+
+        Returns:
+            The integer key of the position.
+        """
+        if self.current_player == -1:
+            return board_key ^ self.zobrist[2]
+        return board_key
+
+    def get_board_keys(self):
+        """Returns the board keys, computing them if the state was replaced.
+
+        Returns:
+            A list with the key of the board under each symmetry.
+        """
+        if self.key_state is not self.state:
+            self.board_keys = [0] * len(self.symmetries)
+            self.key_state = self.state
+
+            for square, piece in enumerate(np.asarray(self.state).flatten()):
+                if piece != 0:
+                    self.toggle_key(square, piece)
+
+        return self.board_keys
+
+    def toggle_key(self, square, piece):
+        """Adds or removes a piece on a square from the board keys.
+
+        Games call this for every square they change in place. It does
+        nothing while the keys are out of date.
+
+        Args:
+            square: An integer flat index of the square.
+            piece: An integer representing the player owning the piece.
+        """
+        if self.key_state is not self.state:
+            return
+
+        keys = self.zobrist[0] if piece == 1 else self.zobrist[1]
+
+        for idx, permutation in enumerate(self.symmetries):
+            self.board_keys[idx] ^= keys[permutation[square]]
+
+    def copy_key(self, game_clone):
+        """Hands the board keys to a clone so it doesn't recompute them.
+
+        Args:
+            game_clone: A clone of this game with a copy of the state.
+        """
+        if self.key_state is self.state:
+            game_clone.board_keys = list(self.board_keys)
+            game_clone.key_state = game_clone.state
 
     def clone(self):
         """Creates a deep clone of the game object.
@@ -54,7 +289,8 @@ class Game(object):
         """
         pass
 
-    def check_game_over(self, current_player):
+    def check_game_over(self, current_player, valid_moves=None,
+                        last_move=None):
         """Checks if the game is over and return a possible winner.
 
         There are 3 possible scenarios.
@@ -64,6 +300,11 @@ class Game(object):
 
         Args:
             current_player: An integer representing the current player.
+            valid_moves: The result of get_valid_moves for the current player
+                if it is already known, which saves generating it again.
+            last_move: The move which led to this state from a state where
+                the game was not over, or None if it is not known. Games may
+                use it to only check what the move changed.
 
         Returns:
             A bool representing the game over state.
@@ -31,24 +31,32 @@ class HumanPlay(object):
     Attributes:
         game: An object containing the game state.
         net: An object containing the neural network.
+        solver: An exact endgame solver used by the search, or None.
+        config: The Config of the search.
     """
 
-    def __init__(self, game, net):
+    def __init__(self, game, net, solver=None, config=None):
         """Initializes HumanPlay with the board state and neural network."""
+        self.config = CFG if config is None else config
         self.game = game
         self.net = net
+        self.solver = solver
 
     def play(self):
         """Function to play a game vs the AI."""
         print("Start Human vs AI\n")
 
-        mcts = MonteCarloTreeSearch(self.net)
+        mcts = MonteCarloTreeSearch(self.net, solver=self.solver,
+                                    config=self.config)
         game = self.game.clone()  # Create a fresh clone for each game.
         game_over = False
         value = 0
         node = TreeNode()
 
-        print("Enter your move in the form: row, column. Eg: 1,1")
+        if getattr(game, "column_actions", False):
+            print("Enter your move in the form: column. Eg: 3")
+        else:
+            print("Enter your move in the form: row, column. Eg: 1,1")
         go_first = input("Do you want to go first: y/n?")
 
         if go_first.lower().strip() == 'y':
@@ -66,23 +74,19 @@ class HumanPlay(object):
             # If player_to_eval is 1 play as the Human.
             # Else play as the AI.
             if game.current_player == human_value:
-                action = input("Enter your move: ")
-                if isinstance(action, str):
-                    action = [int(n, 10) for n in action.split(",")]
-                    action = (1, action[0], action[1])
-
                 best_child = TreeNode()
-                best_child.action = action
+                best_child.action = self.get_human_move(game)
             else:
                 best_child = mcts.search(game, node,
-                                         CFG.temp_final)
+                                         self.config.temp_final)
 
             action = best_child.action
             game.play_action(action)  # Play the child node's action.
 
             game.print_board()
 
-            game_over, value = game.check_game_over(game.current_player)
+            game_over, value = game.check_game_over(game.current_player,
+                                                    last_move=action)
 
             best_child.parent = None
             node = best_child  # Make the child node the root node.
@@ -94,3 +98,33 @@ class HumanPlay(object):
         else:
             print("Draw Match")
         print("\n")
+
+    def get_human_move(self, game):
+        """Asks the human for a move until a valid one is entered.
+
+        A move is either "row, column" or a single action number, such as the
+        column in Connect Four when moves are encoded by column.
+
+        Args:
+            game: An object containing the game state.
+
+        Returns:
+            A tuple with the valid move as returned by get_valid_moves.
+        """
+        valid_moves = game.get_valid_moves(game.current_player)
+
+        while True:
+            try:
+                numbers = [int(n, 10) for n in input("Enter your move: ")
+                           .split(",")]
+            except ValueError:
+                numbers = []
+
+            for idx, move in enumerate(valid_moves):
+                if move[0] != 1:
+                    continue
+
+                if numbers == [idx] or numbers == [move[1], move[2]]:
+                    return tuple(move.tolist())
+
+            print("Invalid move.")
@@ -0,0 +1,186 @@
+# MIT License
+#
+# Copyright (c) 2018 Blanyal D'Souza
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+"""Class to rate checkpoints against each other with Elo."""
+import json
+import math
+import os
+
+import numpy as np
+
+from config import CFG
+
+
+class EloLadder(object):
+    """Keeps Elo ratings of every accepted checkpoint.
+
+    Match results are stored in a JSON file, so a pair of checkpoints is
+    only ever played once, even across runs. The ratings are the maximum a
+    posteriori Bradley-Terry fit of all results with a Gaussian prior, which
+    keeps checkpoints with few games close to the rest. Each fit starts
+    from the previous ratings, so it converges in a few Newton steps.
+
+    Attributes:
+        file_path: A string path of the JSON file.
+        prior: A float standard deviation of the rating prior in Elo.
+        ratings: A dictionary which maps checkpoint names to their Elo
+            rating, in the order the checkpoints were added.
+        results: A dictionary which maps a pair of checkpoint names to the
+            wins, losses and draws of the first one.
+    """
+
+    def __init__(self, file_path=None, prior=400.0):
+        """Initializes EloLadder and loads the stored results."""
+        if file_path is None:
+            file_path = CFG.model_directory + "ladder.json"
+
+        self.file_path = file_path
+        self.prior = prior
+        self.ratings = {}
+        self.results = {}
+
+        if os.path.exists(file_path):
+            with open(file_path) as ladder_file:
+                data = json.load(ladder_file)
+
+            self.ratings = data["ratings"]
+            for name_a, name_b, wins, losses, draws in data["results"]:
+                self.results[(name_a, name_b)] = (wins, losses, draws)
+
+    def save(self):
+        """Writes the ratings and results to the JSON file."""
+        directory = os.path.dirname(self.file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        data = {"ratings": self.ratings,
+                "results": [[name_a, name_b] + list(result) for
+                            (name_a, name_b), result in self.results.items()]}
+
+        with open(self.file_path, "w") as ladder_file:
+            json.dump(data, ladder_file, indent=1)
+
+    def add_player(self, name, rating=None):
+        """Adds a checkpoint to the ladder.
+
+        Args:
+            name: A string name of the saved model.
+            rating: A float starting rating. Defaults to the rating of the
+                last checkpoint added, which the new one was gated against.
+        """
+        if name in self.ratings:
+            return
+
+        if rating is None:
+            rating = list(self.ratings.values())[-1] if self.ratings else 0.0
+
+        self.ratings[name] = rating
+
+    def has_played(self, name_a, name_b):
+        """Checks if two checkpoints already played each other.
+
+        Args:
+            name_a: A string name of a checkpoint.
+            name_b: A string name of another checkpoint.
+
+        Returns:
+            A boolean value indicating if their results are stored.
+        """
+        return (name_a, name_b) in self.results or \
+            (name_b, name_a) in self.results
+
+    def schedule(self, name, num_opponents=None):
+        """Picks the closest rated opponents a checkpoint hasn't played yet.
+
+        Args:
+            name: A string name of a checkpoint.
+            num_opponents: An integer maximum number of opponents.
+
+        Returns:
+            A list of opponent names, closest rating first.
+        """
+        if num_opponents is None:
+            num_opponents = CFG.ladder_opponents
+
+        opponents = [other for other in self.ratings if other != name and
+                     not self.has_played(name, other)]
+        opponents.sort(key=lambda other: abs(self.ratings[other] -
+                                             self.ratings[name]))
+
+        return opponents[:num_opponents]
+
+    def record(self, name_a, name_b, wins, losses, draws):
+        """Stores the result of a match.
+
+        Args:
+            name_a: A string name of the first checkpoint.
+            name_b: A string name of the second checkpoint.
+            wins: An integer number of wins of the first checkpoint.
+            losses: An integer number of losses of the first checkpoint.
+            draws: An integer number of draws.
+        """
+        self.results[(name_a, name_b)] = (wins, losses, draws)
+
+    def fit(self, max_steps=50):
+        """Fits the ratings to all stored results.
+
+        Args:
+            max_steps: An integer maximum number of Newton steps.
+        """
+        names = list(self.ratings)
+        index = {name: idx for idx, name in enumerate(names)}
+
+        # Work in natural log odds units instead of Elo.
+        scale = math.log(10) / 400
+        strengths = np.array([self.ratings[name] for name in names]) * scale
+        prior_precision = 1 / (self.prior * scale) ** 2
+
+        for step in range(max_steps):
+            gradient = -prior_precision * strengths
+            hessian = -prior_precision * np.eye(len(names))
+
+            for (name_a, name_b), (wins, losses, draws) in \
+                    self.results.items():
+                a = index[name_a]
+                b = index[name_b]
+                games = wins + losses + draws
+
+                # A draw counts as half a win for each side.
+                expected = 1 / (1 + math.exp(strengths[b] - strengths[a]))
+                residual = wins + draws / 2 - games * expected
+                curvature = games * expected * (1 - expected)
+
+                gradient[a] += residual
+                gradient[b] -= residual
+                hessian[a, a] -= curvature
+                hessian[b, b] -= curvature
+                hessian[a, b] += curvature
+                hessian[b, a] += curvature
+
+            delta = np.linalg.solve(hessian, -gradient)
+            strengths += delta
+
+            if np.max(np.abs(delta)) < 1e-6:
+                break
+
+        for name, strength in zip(names, strengths):
+            self.ratings[name] = float(strength / scale)
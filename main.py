@@ -24,13 +24,8 @@
 import argparse
 import os
 
-from tic_tac_toe.tic_tac_toe_game import TicTacToeGame
-from othello.othello_game import OthelloGame
-from connect_four.connect_four_game import ConnectFourGame
-from neural_net import NeuralNetworkWrapper
-from train import Train
-from human_play import HumanPlay
-from config import CFG
+import registry
+from config import CFG, Config
 
 # Code to read command line arguments
 parser = argparse.ArgumentParser()
@@ -179,61 +174,271 @@ parser.add_argument("--game",
                     type=int,
                     default=CFG.game)
 
+parser.add_argument("--max_tree_nodes",
+                    help="Node budget of the MCTS tree. 0 means no limit.",
+                    dest="max_tree_nodes",
+                    type=int,
+                    default=CFG.max_tree_nodes)
+
+parser.add_argument("--opening_cache_plies",
+                    help="Number of opening plies shared by self play games.",
+                    dest="opening_cache_plies",
+                    type=int,
+                    default=CFG.opening_cache_plies)
+
+parser.add_argument("--playout_cap_fraction",
+                    help="Fraction of self play moves with a full search.",
+                    dest="playout_cap_fraction",
+                    type=float,
+                    default=CFG.playout_cap_fraction)
+
+parser.add_argument("--num_fast_mcts_sims",
+                    help="Number of MCTS simulations of the cheap moves.",
+                    dest="num_fast_mcts_sims",
+                    type=int,
+                    default=CFG.num_fast_mcts_sims)
+
+parser.add_argument("--resign",
+                    help="Binary to let players resign hopeless games.",
+                    dest="resign",
+                    type=int,
+                    default=CFG.resign)
+
+parser.add_argument("--resign_threshold",
+                    help="Initial root value below which a player resigns.",
+                    dest="resign_threshold",
+                    type=float,
+                    default=CFG.resign_threshold)
+
+parser.add_argument("--resign_disable_fraction",
+                    help="Fraction of self play games without resignation.",
+                    dest="resign_disable_fraction",
+                    type=float,
+                    default=CFG.resign_disable_fraction)
+
+parser.add_argument("--resign_false_positive_rate",
+                    help="Target false resign rate for the resign threshold.",
+                    dest="resign_false_positive_rate",
+                    type=float,
+                    default=CFG.resign_false_positive_rate)
+
+parser.add_argument("--gumbel",
+                    help="Binary to use the Gumbel root search.",
+                    dest="gumbel",
+                    type=int,
+                    default=CFG.gumbel)
+
+parser.add_argument("--gumbel_max_actions",
+                    help="Number of root moves sampled by the Gumbel search.",
+                    dest="gumbel_max_actions",
+                    type=int,
+                    default=CFG.gumbel_max_actions)
+
+parser.add_argument("--gumbel_c_visit",
+                    help="Visit offset of the sigma transform of Q values.",
+                    dest="gumbel_c_visit",
+                    type=float,
+                    default=CFG.gumbel_c_visit)
+
+parser.add_argument("--gumbel_c_scale",
+                    help="Scale of the sigma transform of Q values.",
+                    dest="gumbel_c_scale",
+                    type=float,
+                    default=CFG.gumbel_c_scale)
+
+parser.add_argument("--adaptive_sims",
+                    help="Binary to stop searches once the root converged.",
+                    dest="adaptive_sims",
+                    type=int,
+                    default=CFG.adaptive_sims)
+
+parser.add_argument("--kl_threshold",
+                    help="KL divergence below which the search stops.",
+                    dest="kl_threshold",
+                    type=float,
+                    default=CFG.kl_threshold)
+
+parser.add_argument("--kl_check_interval",
+                    help="Number of simulations between convergence checks.",
+                    dest="kl_check_interval",
+                    type=int,
+                    default=CFG.kl_check_interval)
+
+parser.add_argument("--column_actions",
+                    help="Binary to encode Connect Four moves by column.",
+                    dest="column_actions",
+                    type=int,
+                    default=CFG.column_actions)
+
+parser.add_argument("--solver_empty_squares",
+                    help="Number of empty squares to start solving exactly.",
+                    dest="solver_empty_squares",
+                    type=int,
+                    default=CFG.solver_empty_squares)
+
+parser.add_argument("--solver_node_limit",
+                    help="Maximum number of positions searched per solve.",
+                    dest="solver_node_limit",
+                    type=int,
+                    default=CFG.solver_node_limit)
+
+parser.add_argument("--eval_workers",
+                    help="Number of processes playing evaluation games.",
+                    dest="eval_workers",
+                    type=int,
+                    default=CFG.eval_workers)
+
+parser.add_argument("--sprt_margin",
+                    help="Distance of the SPRT hypotheses from eval_win_rate.",
+                    dest="sprt_margin",
+                    type=float,
+                    default=CFG.sprt_margin)
+
+parser.add_argument("--sprt_alpha",
+                    help="SPRT probability of accepting a worse network.",
+                    dest="sprt_alpha",
+                    type=float,
+                    default=CFG.sprt_alpha)
+
+parser.add_argument("--sprt_beta",
+                    help="SPRT probability of rejecting a better network.",
+                    dest="sprt_beta",
+                    type=float,
+                    default=CFG.sprt_beta)
+
+parser.add_argument("--ladder",
+                    help="Binary to rate every accepted network with Elo.",
+                    dest="ladder",
+                    type=int,
+                    default=CFG.ladder)
+
+parser.add_argument("--ladder_games",
+                    help="Number of games per pair of networks on the ladder.",
+                    dest="ladder_games",
+                    type=int,
+                    default=CFG.ladder_games)
+
+parser.add_argument("--ladder_opponents",
+                    help="Number of opponents of a new network on the ladder.",
+                    dest="ladder_opponents",
+                    type=int,
+                    default=CFG.ladder_opponents)
+
+parser.add_argument("--tablebase_eval",
+                    help="Binary to evaluate Tic Tac Toe against perfect play.",
+                    dest="tablebase_eval",
+                    type=int,
+                    default=CFG.tablebase_eval)
+
+parser.add_argument("--profile",
+                    help="Binary to time the phases of every iteration.",
+                    dest="profile",
+                    type=int,
+                    default=CFG.profile)
+
+parser.add_argument("--profile_iteration",
+                    help="Iteration to run under cProfile. 0 disables it.",
+                    dest="profile_iteration",
+                    type=int,
+                    default=CFG.profile_iteration)
+
+parser.add_argument("--profile_file",
+                    help="Name of the file to record phase times.",
+                    dest="profile_file",
+                    default=CFG.profile_file)
+
+parser.add_argument("--metrics_port",
+                    help="Port serving Prometheus metrics. 0 disables it.",
+                    dest="metrics_port",
+                    type=int,
+                    default=CFG.metrics_port)
+
+parser.add_argument("--metrics_textfile",
+                    help="File the Prometheus metrics are written to.",
+                    dest="metrics_textfile",
+                    default=CFG.metrics_textfile)
+
+parser.add_argument("--log_max_bytes",
+                    help="Size at which the loss file is rotated.",
+                    dest="log_max_bytes",
+                    type=int,
+                    default=CFG.log_max_bytes)
+
+parser.add_argument("--log_backups",
+                    help="Number of rotated loss files to keep.",
+                    dest="log_backups",
+                    type=int,
+                    default=CFG.log_backups)
+
+parser.add_argument("--run_state",
+                    help="Binary to checkpoint the progress of training.",
+                    dest="run_state",
+                    type=int,
+                    default=CFG.run_state)
+
+parser.add_argument("--resume",
+                    help="Binary to resume training from the last run state.",
+                    dest="resume",
+                    type=int,
+                    default=CFG.resume)
+
+parser.add_argument("--backend",
+                    help="Network backend. Only tensorflow can train.",
+                    dest="backend",
+                    choices=list(registry.BACKENDS),
+                    default=CFG.backend)
+
 if __name__ == '__main__':
     """Initializes game state, neural network and the training loop"""
     arguments = parser.parse_args()
 
-    # Replace CFG values with the values from the command line.
-    CFG.num_iterations = arguments.num_iterations
-    CFG.num_games = arguments.num_games
-    CFG.num_mcts_sims = arguments.num_mcts_sims
-    CFG.c_puct = arguments.c_puct
-    CFG.l2_val = arguments.l2_val
-    CFG.momentum = arguments.momentum
-    CFG.learning_rate = arguments.learning_rate
-    CFG.t_policy_val = arguments.t_policy_val
-    CFG.temp_init = arguments.temp_init
-    CFG.temp_final = arguments.temp_final
-    CFG.temp_thresh = arguments.temp_thresh
-    CFG.epochs = arguments.epochs
-    CFG.batch_size = arguments.batch_size
-    CFG.dirichlet_alpha = arguments.dirichlet_alpha
-    CFG.epsilon = arguments.epsilon
-    CFG.model_directory = arguments.model_directory
-    CFG.num_eval_games = arguments.num_eval_games
-    CFG.eval_win_rate = arguments.eval_win_rate
-    CFG.load_model = arguments.load_model
-    CFG.human_play = arguments.human_play
-    CFG.resnet_blocks = arguments.resnet_blocks
-    CFG.record_loss = arguments.record_loss
-    CFG.loss_file = arguments.loss_file
-    CFG.game = arguments.game
-
-    # Initialize the game object with the chosen game.
-    game = object
-    if CFG.game == 0:
-        game = TicTacToeGame()
-    elif CFG.game == 1:
-        game = OthelloGame()
-    elif CFG.game == 2:
-        game = ConnectFourGame()
-
-    net = NeuralNetworkWrapper(game)
+    # The run's configuration is built from the command line. CFG keeps
+    # the defaults.
+    config = Config(**vars(arguments))
+
+    if config.backend != "tensorflow" and not config.human_play:
+        parser.error("Training needs the tensorflow backend.")
+
+    # Initialize the game object with the chosen game. Only the modules of
+    # the chosen game, backend and runner are imported.
+    game = registry.make_game(config=config)
+
+    # Solve endgames exactly where a solver exists for the game.
+    solver = None
+    if config.solver_empty_squares > 0:
+        solver = registry.make_solver(config=config)
+
+    # The tablebase knows every Tic Tac Toe position, so it plays perfectly.
+    perfect_player = None
+    if config.tablebase_eval and config.game == 0:
+        from solver import PerfectPlayer
+
+        perfect_player = PerfectPlayer(
+            registry.make_solver(config=config, max_empty=game.action_size))
+
+    net = registry.make_network(game, config=config)
 
     # Initialize the network with the best model.
-    if CFG.load_model:
-        file_path = CFG.model_directory + "best_model.meta"
-        if os.path.exists(file_path):
-            net.load_model("best_model")
-        else:
-            print("Trained model doesn't exist. Starting from scratch.")
+    extension = ".meta" if config.backend == "tensorflow" else ".npz"
+    file_path = config.model_directory + "best_model" + extension
+    if config.load_model and os.path.exists(file_path):
+        net.load_model("best_model")
+    elif config.backend != "tensorflow":
+        # Only the tensorflow backend can start from random weights.
+        parser.error("The %s backend needs the weights in %s, which the "
+                     "tensorflow backend saves with every model." %
+                     (config.backend, file_path))
+    elif config.load_model:
+        print("Trained model doesn't exist. Starting from scratch.")
     else:
         print("Trained model not loaded. Starting from scratch.")
 
     # Play vs the AI as a human instead of training.
-    if CFG.human_play:
-        human_play = HumanPlay(game, net)
+    if config.human_play:
+        human_play = registry.get_runner("human_play")(game, net, solver,
+                                                       config=config)
         human_play.play()
     else:
-        train = Train(game, net)
+        train = registry.get_runner("train")(game, net, solver,
+                                             perfect_player, config=config)
         train.start()
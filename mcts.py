@@ -22,11 +22,13 @@
 # ==============================================================================
 """Classes for Monte Carlo Tree Search."""
 import math
+import sys
+import time
 
 import numpy as np
 
 from config import CFG
-from copy import deepcopy
+from profiler import PROFILER
 
 
 class TreeNode(object):
@@ -38,11 +40,24 @@ class TreeNode(object):
         Qsa: A float for the mean action value.
         Psa: A float for the prior probability of reaching this node.
         action: A tuple(row, column) of the prior move of reaching this node.
-        children: A list which stores child nodes.
+        children: A dictionary which maps action ids to child nodes. Children
+            are only created the first time they are selected.
         child_psas: A vector containing child probabilities.
+        legal_actions: A tuple with the action ids of the valid moves.
+        legal_moves: A tuple with the valid moves in legal_actions order.
         parent: A TreeNode representing the parent node.
+        proven: The game theoretic value of this node from the perspective of
+            the player who moved into it (win: 1, loss: -1, draw: 0), or None
+            if the node has not been solved.
+        valid_moves: The valid moves at this node until it is expanded.
+        terminal: A boolean value indicating if the game is over at this node,
+            or None if the position has not been checked yet.
     """
 
+    __slots__ = ("Nsa", "Wsa", "Qsa", "Psa", "action", "children",
+                 "child_psas", "legal_actions", "legal_moves", "parent",
+                 "proven", "valid_moves", "terminal")
+
     def __init__(self, parent=None, action=None, psa=0.0, child_psas=[]):
         """Initializes TreeNode with the initial statistics and data."""
         self.Nsa = 0
@@ -50,9 +65,14 @@ class TreeNode(object):
         self.Qsa = 0.0
         self.Psa = psa
         self.action = action
-        self.children = []
+        self.children = {}
         self.child_psas = child_psas
+        self.legal_actions = ()
+        self.legal_moves = ()
         self.parent = parent
+        self.proven = None
+        self.valid_moves = None
+        self.terminal = None
 
     def is_not_leaf(self):
         """Checks if a TreeNode is a leaf.
@@ -60,73 +80,241 @@ class TreeNode(object):
         Returns:
             A boolean value indicating if a TreeNode is a leaf.
         """
-        if len(self.children) > 0:
+        if len(self.legal_actions) > 0:
             return True
         return False
 
-    def select_child(self):
+    def select_child(self, c_puct=None):
         """Selects a child node based on the AlphaZero PUCT formula.
 
+        A move without a child node is scored with its prior and zero visits,
+        and its node is created once it is picked.
+
+        Args:
+            c_puct: A float level of exploration. Defaults to CFG.c_puct.
+
         Returns:
             A child TreeNode which is the most promising according to PUCT.
         """
-        c_puct = CFG.c_puct
+        if c_puct is None:
+            c_puct = CFG.c_puct
+        sqrt_nsa = math.sqrt(self.Nsa)
 
-        highest_uct = 0
+        highest_uct = -float("inf")
         highest_index = 0
 
         # Select the child with the highest Q + U value
-        for idx, child in enumerate(self.children):
-            uct = child.Qsa + child.Psa * c_puct * (
-                    math.sqrt(self.Nsa) / (1 + child.Nsa))
+        for idx, action_id in enumerate(self.legal_actions):
+            child = self.children.get(action_id)
+
+            if child is None:
+                uct = self.child_psas[action_id] * c_puct * sqrt_nsa
+            elif child.proven == -1:
+                # Never walk into a proven loss.
+                continue
+            else:
+                uct = child.Qsa + child.Psa * c_puct * (
+                        sqrt_nsa / (1 + child.Nsa))
+
             if uct > highest_uct:
                 highest_uct = uct
                 highest_index = idx
 
-        return self.children[highest_index]
+        return self.get_child(highest_index)
+
+    def get_child(self, index):
+        """Returns the child node of a valid move, creating it if needed.
+
+        Args:
+            index: An integer position of the move in legal_actions.
+
+        Returns:
+            The child TreeNode reached by playing the move.
+        """
+        action_id = self.legal_actions[index]
+        child = self.children.get(action_id)
+
+        if child is None:
+            child = self.add_child_node(parent=self,
+                                        action=self.legal_moves[index],
+                                        psa=float(self.child_psas[action_id]),
+                                        action_id=action_id)
+        return child
+
+    def check_position(self, game):
+        """Generates the valid moves and the game over state of this node.
+
+        Both are computed once per node and then reused by the search,
+        the expansion and the back up, so move generation runs a single time
+        per position.
+
+        Args:
+            game: An object containing the game state at this node.
+
+        Returns:
+            A boolean value indicating if the game is over at this node.
+        """
+        if self.terminal is None:
+            with PROFILER.timer("move_generation"):
+                self.valid_moves = game.get_valid_moves(game.current_player)
+
+            # The parent was not over, so only the move into this node can
+            # have ended the game.
+            with PROFILER.timer("game_over_check"):
+                self.terminal, wsa = game.check_game_over(
+                    game.current_player, self.valid_moves, self.action)
+
+            # Store the outcome so revisits skip the network entirely.
+            if self.terminal:
+                self.proven = -wsa
+
+        return self.terminal
 
     def expand_node(self, game, psa_vector):
-        """Expands the current node by adding valid moves as children.
+        """Expands the current node by storing the priors of its valid moves.
+
+        Child nodes are not created here, see get_child. Only the valid moves
+        are kept from the full list of moves.
 
         Args:
             game: An object containing the game state.
             psa_vector: A list containing move probabilities for each move.
         """
-        self.child_psas = deepcopy(psa_vector)
-        valid_moves = game.get_valid_moves(game.current_player)
-        for idx, move in enumerate(valid_moves):
-            if move[0] is not 0:
-                action = deepcopy(move)
-                self.add_child_node(parent=self, action=action,
-                                    psa=psa_vector[idx])
+        self.child_psas = np.asarray(psa_vector, dtype=np.float32)
+        self.check_position(game)
+        self.legal_actions = tuple(idx for idx, move in
+                                   enumerate(self.valid_moves) if move[0] != 0)
+        self.legal_moves = tuple(tuple(self.valid_moves[idx].tolist())
+                                 for idx in self.legal_actions)
+        self.valid_moves = None
 
-    def add_child_node(self, parent, action, psa=0.0):
+    def add_child_node(self, parent, action, psa=0.0, action_id=None):
         """Creates and adds a child TreeNode to the current node.
 
         Args:
             parent: A TreeNode which is the parent of this node.
             action: A tuple(row, column) of the prior move to reach this node.
             psa: A float representing the raw move probability for this node.
+            action_id: An integer index of the move in the valid moves.
 
         Returns:
             The newly created child TreeNode.
         """
 
         child_node = TreeNode(parent=parent, action=action, psa=psa)
-        self.children.append(child_node)
+        self.children[action_id] = child_node
         return child_node
 
-    def back_prop(self, wsa, v):
+    def back_prop(self, v):
         """Update the current node's statistics based on the game outcome.
 
         Args:
-            wsa: A float representing the action value for this state.
-            v: A float representing the network value of this state.
+            v: A float representing the value of the evaluated state from the
+                perspective of the player who moved into this node.
         """
         self.Nsa += 1
-        self.Wsa = wsa + v
+        self.Wsa += v
         self.Qsa = self.Wsa / self.Nsa
 
+    def update_proven(self):
+        """Tries to solve this node from its children (MCTS-solver).
+
+        A node is a proven loss for the player who moved into it as soon as
+        one child is a proven win for the opponent. Once every child is
+        proven, the node takes the negated best value among the children.
+
+        Returns:
+            A boolean value indicating if the node is proven.
+        """
+        if self.proven is not None:
+            return True
+
+        if not self.children:
+            return False
+
+        best_value = -1
+
+        # Moves without a child node are unproven.
+        if len(self.children) < len(self.legal_actions):
+            best_value = None
+
+        for child in self.children.values():
+            if child.proven is None:
+                best_value = None
+            elif child.proven == 1:
+                self.proven = -1
+                return True
+            elif best_value is not None:
+                best_value = max(best_value, child.proven)
+
+        if best_value is None:
+            return False
+
+        self.proven = -best_value
+        return True
+
+    def walk(self):
+        """Iterates over every node of the subtree rooted at this node.
+
+        Yields:
+            The TreeNodes of the subtree in depth first order.
+        """
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(node.children.values())
+
+    def count_nodes(self):
+        """Counts the nodes of the subtree rooted at this node.
+
+        Returns:
+            An integer with the number of nodes, including this node.
+        """
+        return sum(1 for _ in self.walk())
+
+    def collapse(self):
+        """Turns an expanded node back into a leaf.
+
+        The node keeps its own statistics, only its children are dropped.
+        A solved node also forgets its proven value, which needs the children
+        to play, so it is searched again if it is reached.
+
+        Returns:
+            The number of nodes removed from the tree.
+        """
+        removed = 0
+        for child in self.children.values():
+            removed += child.release()
+        self.children = {}
+        self.child_psas = []
+        self.legal_actions = ()
+        self.legal_moves = ()
+        self.terminal = None
+        self.proven = None
+        return removed
+
+    def release(self):
+        """Releases the subtree rooted at this node.
+
+        Parent and child references form cycles, so the links are cleared to
+        let reference counting free the nodes straight away instead of
+        waiting for the cycle collector.
+
+        Returns:
+            The number of nodes released.
+        """
+        removed = 0
+        for node in list(self.walk()):
+            node.children = {}
+            node.child_psas = []
+            node.legal_actions = ()
+            node.legal_moves = ()
+            node.valid_moves = None
+            node.parent = None
+            removed += 1
+        return removed
+
 
 class MonteCarloTreeSearch(object):
     """Represents a Monte Carlo Tree Search Algorithm.
@@ -135,79 +323,654 @@ class MonteCarloTreeSearch(object):
         root: A TreeNode representing the board state and its statistics.
         game: An object containing the game state.
         net: An object containing the neural network.
+        max_nodes: An integer node budget for the tree. 0 means no limit.
+        node_count: An integer with the number of nodes in the tree.
+        opening_cache: An OpeningCache shared with other searches, or None.
+        solver: An exact endgame solver, or None. Its solve(game) method
+            returns the value of a position for the player to move and the
+            action id of a best move, or None if it can't solve the position.
+        move_time: A float number of seconds after which a search stops
+            even if simulations are left, or None for no time limit. The
+            Gumbel search ignores it.
+        sim_bank: An integer number of simulations saved by earlier moves of
+            the game which later moves may spend.
+        sims_per_move: A list with the number of simulations run per move.
+        config: The Config of the search.
     """
 
-    def __init__(self, net):
+    def __init__(self, net, max_nodes=None, opening_cache=None, solver=None,
+                 move_time=None, config=None):
         """Initializes TreeNode with the TreeNode, board and neural network."""
+        self.config = CFG if config is None else config
         self.root = None
         self.game = None
         self.net = net
+        self.max_nodes = self.config.max_tree_nodes if max_nodes is None \
+            else max_nodes
+        self.node_count = 0
+        self.opening_cache = opening_cache
+        self.solver = solver
+        self.move_time = move_time
+        self.sim_bank = 0
+        self.sims_per_move = []
 
-    def search(self, game, node, temperature):
+    def search(self, game, node, temperature, num_sims=None):
         """MCTS loop to get the best move which can be played at a given state.
 
         Args:
             game: An object containing the game state.
             node: A TreeNode representing the board state and its statistics.
             temperature: A float to control the level of exploration.
+            num_sims: An integer number of simulations to run. Defaults to
+                num_mcts_sims of the config.
 
         Returns:
             A child node representing the best move to play at this state.
         """
+        # The root changed hands or was rebuilt, so recount its subtree.
+        recount = node is not self.root
+
+        # Start from the statistics other games gathered for this opening.
+        if self.opening_cache is not None and \
+                self.opening_cache.has_statistics(game):
+            if not node.is_not_leaf() and not node.check_position(game):
+                self.evaluate_leaf(game, node)
+
+            self.opening_cache.load_statistics(game, node)
+            recount = True
+
+        if recount:
+            self.node_count = node.count_nodes()
+
         self.root = node
         self.game = game
 
-        for i in range(CFG.num_mcts_sims):
-            node = self.root
+        if num_sims is None:
+            num_sims = self.config.num_mcts_sims
+
+        # A forced or solved move needs no search at all.
+        best_child = self.get_forced_move()
+        if best_child is None:
+            best_child = self.get_solved_move()
+
+        # A solved root is not searched, but it needs moves to choose from.
+        if best_child is None and self.root.proven is not None and \
+                not self.root.is_not_leaf() and \
+                not self.root.check_position(game):
+            self.evaluate_leaf(game, self.root)
+
+        if best_child is not None:
+            self.sims_per_move.append(0)
+            self.sim_bank += num_sims if self.config.adaptive_sims else 0
+        elif self.config.gumbel:
+            best_child = self.gumbel_search(temperature, num_sims)
+            self.sims_per_move.append(num_sims)
+        else:
+            budget = num_sims
+            if self.config.adaptive_sims:
+                budget += min(self.sim_bank, num_sims)
+
+            sims_used = self.run_simulations(budget)
+            self.sims_per_move.append(sims_used)
+
+            if self.config.adaptive_sims:
+                self.sim_bank += num_sims - sims_used
+
+            best_child = self.select_move(temperature)
+
+        if self.opening_cache is not None:
+            self.opening_cache.store_statistics(self.game, self.root)
+
+        return best_child
+
+    def run_simulations(self, budget):
+        """Runs simulations from the root until the budget is spent.
+
+        With adaptive_sims in the config the search stops early once the
+        root's visit distribution stops changing, measured by the KL
+        divergence between two checks kl_check_interval simulations apart.
+        The search also stops once move_time runs out.
+
+        Args:
+            budget: An integer maximum number of simulations.
+
+        Returns:
+            The number of simulations run.
+        """
+        previous = None
+
+        deadline = None
+        if self.move_time:
+            deadline = time.time() + self.move_time
+
+        for i in range(budget):
+            # Further simulations can't change a solved root.
+            if self.root.proven is not None:
+                return i
+
+            if deadline is not None and i > 0 and time.time() >= deadline:
+                return i
+
+            self.simulate()
+
+            if self.config.adaptive_sims and \
+                    (i + 1) % self.config.kl_check_interval == 0:
+                current = self.visit_distribution()
+
+                if previous is not None and np.sum(current * np.log(
+                        current / previous)) < self.config.kl_threshold:
+                    return i + 1
+
+                previous = current
+
+        return budget
+
+    def visit_distribution(self):
+        """Returns the smoothed visit distribution over the root's moves.
+
+        Returns:
+            A probability vector in legal_actions order.
+        """
+        visits = np.ones(len(self.root.legal_actions))
+
+        for idx, action_id in enumerate(self.root.legal_actions):
+            child = self.root.children.get(action_id)
+            if child is not None:
+                visits[idx] += child.Nsa
+
+        return visits / visits.sum()
+
+    def get_forced_move(self):
+        """Returns the child of the root if the root has one valid move.
+
+        The root is expanded with a one-hot prior if needed, which skips
+        the network.
+
+        Returns:
+            The only child TreeNode of the root, or None if there is a choice.
+        """
+        root = self.root
+
+        if root.is_not_leaf():
+            if len(root.legal_actions) != 1:
+                return None
+        else:
+            if root.check_position(self.game):
+                return None
+
+            psa_vector = [float(move[0] != 0) for move in root.valid_moves]
+            if sum(psa_vector) != 1:
+                return None
+
+            root.expand_node(self.game, psa_vector)
+
+        return self.get_child(root, 0)
+
+    def get_solved_move(self):
+        """Returns the child of the root chosen by the endgame solver.
+
+        The root and the chosen child are marked as proven, so the search and
+        the training targets use the exact value.
+
+        Returns:
+            The child TreeNode of a best move, or None if the solver can't
+            solve the root.
+        """
+        root = self.root
+
+        if self.solver is None or root.check_position(self.game):
+            return None
+
+        result = self.solver.solve(self.game)
+        if result is None:
+            return None
+
+        value, action_id = result
+
+        if not root.is_not_leaf():
+            psa_vector = np.zeros(len(root.valid_moves), dtype=np.float32)
+            psa_vector[action_id] = 1
+            root.expand_node(self.game, psa_vector)
+
+        child = self.get_child(root, root.legal_actions.index(action_id))
+
+        child.proven = value
+        root.proven = -value
+        return child
+
+    def get_child(self, node, index):
+        """Returns a child of a node and counts it if it is created.
+
+        Args:
+            node: An expanded TreeNode.
+            index: An integer position in the node's legal_actions.
+
+        Returns:
+            The child TreeNode of the move.
+        """
+        num_children = len(node.children)
+        child = node.get_child(index)
+        self.node_count += len(node.children) - num_children
+        return child
+
+    def reset_budget(self):
+        """Clears the simulation bank and the per move log for a new game."""
+        self.sim_bank = 0
+        self.sims_per_move = []
+
+    def simulate(self, index=None):
+        """Runs one simulation from the root down to a leaf and back.
+
+        Args:
+            index: An integer position in the root's legal_actions of a move
+                to play first, or None to select every move with PUCT.
+        """
+        # Prune the tree before it grows past the node budget.
+        if self.max_nodes and self.node_count >= self.max_nodes:
+            self.make_room(1)
+
+        node = self.root
+
+        with PROFILER.timer("clone"):
             game = self.game.clone()  # Create a fresh clone for each loop.
 
-            # Loop when node is not a leaf
-            while node.is_not_leaf():
-                node = node.select_child()
+        # Loop when node is not a leaf
+        with PROFILER.timer("select"):
+            while node.is_not_leaf() and node.proven is None:
+                num_children = len(node.children)
+                parent = node
+                if index is not None:
+                    node = node.get_child(index)
+                    index = None
+                else:
+                    node = node.select_child(self.config.c_puct)
+                self.node_count += len(parent.children) - num_children
                 game.play_action(node.action)
 
-            # Get move probabilities and values from the network for this state.
-            psa_vector, v = self.net.predict(game.state)
+        if node.proven is None:
+            node.check_position(game)
 
-            # Add Dirichlet noise to the psa_vector of the root node.
-            if node.parent is None:
-                psa_vector = self.add_dirichlet_noise(game, psa_vector)
+        # Leaves deep enough into the endgame are solved instead.
+        if node.proven is None and self.solver is not None:
+            with PROFILER.timer("solve"):
+                result = self.solver.solve(game)
+            if result is not None:
+                node.proven = -result[0]
 
-            valid_moves = game.get_valid_moves(game.current_player)
-            for idx, move in enumerate(valid_moves):
-                if move[0] is 0:
-                    psa_vector[idx] = 0
+        if node.proven is not None:
+            v = -node.proven
+        else:
+            v = self.evaluate_leaf(game, node)
 
-            psa_vector_sum = sum(psa_vector)
+        with PROFILER.timer("backprop"):
+            self.back_prop(node, v)
 
-            # Renormalize psa vector
-            if psa_vector_sum > 0:
-                psa_vector /= psa_vector_sum
+        PROFILER.count("simulations")
 
-            # Try expanding the current node.
-            node.expand_node(game=game, psa_vector=psa_vector)
-
-            game_over, wsa = game.check_game_over(game.current_player)
+    def select_move(self, temperature):
+        """Selects the move to play from the root's visit counts.
 
-            # Back propagate node statistics up to the root node.
-            while node is not None:
-                wsa = -wsa
-                v = -v
-                node.back_prop(wsa, v)
-                node = node.parent
+        Args:
+            temperature: A float to control the level of exploration.
 
-        highest_nsa = 0
-        highest_index = 0
+        Returns:
+            A child node representing the best move to play at this state.
+        """
+        highest_nsa = -1
+        best_child = None
 
         # Select the child's move using a temperature parameter.
-        for idx, child in enumerate(self.root.children):
+        for child in self.root.children.values():
+            # Play a proven win straight away.
+            if child.proven == 1:
+                return child
+
+            # Avoid proven losses unless every move loses.
+            if child.proven == -1 and self.root.proven != 1:
+                continue
+
             temperature_exponent = int(1 / temperature)
 
             if child.Nsa ** temperature_exponent > highest_nsa:
                 highest_nsa = child.Nsa ** temperature_exponent
-                highest_index = idx
+                best_child = child
+
+        # A solved root may have no visited child, so play the move with the
+        # highest prior which isn't a proven loss.
+        if best_child is None:
+            root = self.root
+            indices = [idx for idx, action_id in enumerate(root.legal_actions)
+                       if action_id not in root.children or
+                       root.children[action_id].proven != -1]
+            index = max(indices or range(len(root.legal_actions)),
+                        key=lambda idx: root.child_psas[
+                            root.legal_actions[idx]])
+
+            best_child = self.get_child(root, index)
+
+        return best_child
+
+    def gumbel_search(self, temperature, num_sims):
+        """Gumbel root search with sequential halving.
+
+        Samples the top k root moves without replacement with the
+        Gumbel-top-k trick, then splits the simulations over them in rounds,
+        halving the candidates after each round by Gumbel + logit +
+        sigma(Q). This gives a policy improvement even with few simulations.
+        Moves below the root are still selected with PUCT.
+
+        Args:
+            temperature: A float scaling the Gumbel noise. With a temperature
+                below 1 the noise is scaled down and the search becomes
+                close to deterministic.
+            num_sims: An integer number of simulations to run.
+
+        Returns:
+            A child node representing the best move to play at this state.
+        """
+        if not self.root.is_not_leaf():
+            self.simulate()
+            num_sims -= 1
+
+        legal_actions = self.root.legal_actions
+
+        logits = self.gumbel_logits(self.root)
+        gumbel = np.random.gumbel(size=len(legal_actions))
+        if temperature < 1:
+            gumbel *= temperature
+
+        # Gumbel-top-k sampling of the candidate moves.
+        num_considered = min(self.config.gumbel_max_actions,
+                             len(legal_actions), max(num_sims, 1))
+        candidates = list(np.argsort(-(gumbel + logits))[:num_considered])
+
+        num_phases = max(1, int(math.ceil(math.log2(num_considered))))
+        sims_left = num_sims
+
+        # Sequential halving over the candidates.
+        while len(candidates) > 1 and sims_left > 0:
+            if self.root.proven is not None:
+                break
+
+            visits = max(1, num_sims // (num_phases * len(candidates)))
+
+            for index in candidates:
+                for j in range(visits):
+                    if sims_left == 0 or self.root.proven is not None:
+                        break
+                    self.simulate(index)
+                    sims_left -= 1
+
+            scores = self.gumbel_scores(gumbel, logits, candidates)
+            candidates = [candidates[idx] for idx in
+                          np.argsort(-scores)[:(len(candidates) + 1) // 2]]
+
+        # A proven win is played regardless of the Gumbel scores.
+        for child in self.root.children.values():
+            if child.proven == 1:
+                return child
+
+        scores = self.gumbel_scores(gumbel, logits, candidates)
+        return self.get_child(self.root, candidates[int(np.argmax(scores))])
 
-        return self.root.children[highest_index]
+    def gumbel_logits(self, node):
+        """Returns the log priors of the valid moves of a node.
+
+        Args:
+            node: An expanded TreeNode.
+
+        Returns:
+            A vector of logits in legal_actions order.
+        """
+        priors = np.asarray(node.child_psas)[list(node.legal_actions)]
+        return np.log(np.maximum(priors, 1e-12))
+
+    def completed_q(self, node):
+        """Returns the completed Q values of the valid moves of a node.
+
+        Unvisited moves get the mixed value estimate, which blends the node's
+        value with the prior weighted Q values of the visited moves. Values
+        are rescaled from [-1, 1] to [0, 1].
+
+        Args:
+            node: An expanded TreeNode.
+
+        Returns:
+            A vector of completed Q values in legal_actions order.
+            The largest visit count among the moves.
+        """
+        priors = np.asarray(node.child_psas)[list(node.legal_actions)]
+        q_values = np.zeros(len(node.legal_actions))
+        visits = np.zeros(len(node.legal_actions))
+
+        for idx, action_id in enumerate(node.legal_actions):
+            child = node.children.get(action_id)
+            if child is not None:
+                visits[idx] = child.Nsa
+                q_values[idx] = child.Qsa if child.proven is None \
+                    else child.proven
+
+        visited = visits > 0
+        value = -node.Qsa
+
+        if visited.any():
+            weighted_q = np.sum(priors[visited] * q_values[visited]) / \
+                max(np.sum(priors[visited]), 1e-12)
+            value = (value + visits.sum() * weighted_q) / (1 + visits.sum())
+
+        q_values[~visited] = value
+
+        return (q_values + 1) / 2, visits.max()
+
+    def gumbel_scores(self, gumbel, logits, candidates):
+        """Scores candidate root moves by Gumbel + logit + sigma(Q).
+
+        Args:
+            gumbel: A vector of Gumbel noise in legal_actions order.
+            logits: A vector of logits in legal_actions order.
+            candidates: A list of positions in legal_actions.
+
+        Returns:
+            A vector with the score of every candidate.
+        """
+        q_values, max_visits = self.completed_q(self.root)
+        sigma = (self.config.gumbel_c_visit + max_visits) * \
+            self.config.gumbel_c_scale * q_values
+
+        return np.array([gumbel[idx] + logits[idx] + sigma[idx]
+                          for idx in candidates])
+
+    def evaluate_leaf(self, game, node):
+        """Evaluates a leaf with the network and expands it.
+
+        Args:
+            game: An object containing the game state at the leaf.
+            node: A TreeNode representing the leaf.
+
+        Returns:
+            A float representing the network value of the leaf.
+        """
+        # Get move probabilities and values from the network for this state.
+        with PROFILER.timer("eval"):
+            if self.opening_cache is not None:
+                psa_vector, v = self.opening_cache.predict(self.net, game)
+            else:
+                psa_vector, v = self.net.predict(game.state)
+
+        # Add Dirichlet noise to the psa_vector of the root node. The Gumbel
+        # search explores with its own noise instead.
+        if node.parent is None and not self.config.gumbel:
+            psa_vector = self.add_dirichlet_noise(game, psa_vector)
+
+        for idx, move in enumerate(node.valid_moves):
+            if move[0] == 0:
+                psa_vector[idx] = 0
+
+        psa_vector_sum = sum(psa_vector)
+
+        # Renormalize psa vector
+        if psa_vector_sum > 0:
+            psa_vector /= psa_vector_sum
+
+        # Expand the current node.
+        with PROFILER.timer("expand"):
+            node.expand_node(game=game, psa_vector=psa_vector)
+
+        return v
+
+    def root_value(self):
+        """Returns the value of the searched root for the player to move.
+
+        Returns:
+            A float with the proven value of the root if it is solved, or the
+            mean value of its most visited child.
+        """
+        if self.root.proven is not None:
+            return -self.root.proven
+
+        if not self.root.children:
+            return -self.root.Qsa
+
+        child = max(self.root.children.values(), key=lambda c: c.Nsa)
+        return child.Qsa
+
+    def search_policy(self, game, node):
+        """Returns the policy target found by the search at a node.
+
+        This is the visit count distribution over the moves of the node, or
+        the completed Q policy when the Gumbel root search is used.
+
+        Args:
+            game: An object containing the game state.
+            node: A TreeNode representing the searched root.
+
+        Returns:
+            A probability vector with an entry for every action.
+        """
+        pi = np.zeros(game.action_size, dtype=np.float32)
+
+        # Gumbel search trains on softmax(logits + sigma(completed Q)).
+        if self.config.gumbel and node.legal_actions:
+            q_values, max_visits = self.completed_q(node)
+            logits = self.gumbel_logits(node) + (
+                self.config.gumbel_c_visit + max_visits) * \
+                self.config.gumbel_c_scale * q_values
+            improved = np.exp(logits - logits.max())
+            pi[list(node.legal_actions)] = improved / improved.sum()
+            return pi
+
+        for action_id, child in node.children.items():
+            pi[action_id] = child.Nsa
+
+        if pi.sum() > 0:
+            pi /= pi.sum()
+        else:
+            pi = np.array(node.child_psas, dtype=np.float32)
+
+        return pi
+
+    def back_prop(self, node, v):
+        """Back propagates a leaf value and proven results up to the root.
+
+        Args:
+            node: A TreeNode representing the evaluated leaf.
+            v: A float representing the value of the leaf from the perspective
+                of the player to move at the leaf.
+        """
+        # Solve the ancestors of a proven leaf as far up as possible.
+        if node.proven is not None:
+            parent = node.parent
+            while parent is not None and parent.update_proven():
+                parent = parent.parent
+
+        # Back propagate node statistics up to the root node.
+        while node is not None:
+            v = -v
+            node.back_prop(v)
+            node = node.parent
+
+    def make_room(self, num_nodes):
+        """Prunes the tree so that num_nodes new nodes fit in the node budget.
+
+        The least visited nodes whose child nodes are all leaves are collapsed
+        back into leaves first. The root is never pruned. If no node can be
+        collapsed any more, the tree may stay over the budget.
+
+        Args:
+            num_nodes: An integer with the number of nodes to be added.
+        """
+        if not self.max_nodes or \
+                self.node_count + num_nodes <= self.max_nodes:
+            return
+
+        # Free a tenth of the budget at once so pruning is not run every time.
+        target = min(self.max_nodes - num_nodes, self.max_nodes * 9 // 10)
+
+        while self.node_count > target:
+            frontier = [node for node in self.root.walk()
+                        if node.children and node is not self.root and
+                        not any(child.children
+                                for child in node.children.values())]
+
+            if not frontier:
+                break
+
+            frontier.sort(key=lambda n: n.Nsa)
+
+            for node in frontier:
+                self.node_count -= node.collapse()
+                if self.node_count <= target:
+                    break
+
+    def set_root(self, node):
+        """Reuses a child of the root as the new root of the search tree.
+
+        The rest of the old tree is released and the reused subtree is pruned
+        back to the node budget.
+
+        Args:
+            node: A TreeNode which becomes the new root.
+        """
+        parent = node.parent
+        if parent is not None:
+            for child in parent.children.values():
+                if child is not node:
+                    child.release()
+            parent.children = {}
+
+            # Release the ancestors of the old root as well.
+            while parent.parent is not None:
+                parent = parent.parent
+            parent.release()
+
+        node.parent = None
+        self.root = node
+        self.node_count = node.count_nodes()
+
+        if self.max_nodes and self.node_count > self.max_nodes:
+            self.make_room(0)
+
+    def memory_usage(self):
+        """Reports the size of the search tree.
+
+        Returns:
+            An integer with the number of nodes in the tree.
+            An integer with the approximate number of bytes used by the tree.
+        """
+        if self.root is None:
+            return 0, 0
+
+        num_bytes = 0
+        for node in self.root.walk():
+            num_bytes += sys.getsizeof(node) + sys.getsizeof(node.children)
+            num_bytes += sys.getsizeof(node.legal_actions)
+            num_bytes += sum(sys.getsizeof(move) for move in node.legal_moves)
+            if isinstance(node.child_psas, np.ndarray):
+                num_bytes += node.child_psas.nbytes
+            if node.valid_moves is not None:
+                num_bytes += sys.getsizeof(node.valid_moves)
+
+        return self.node_count, num_bytes
 
     def add_dirichlet_noise(self, game, psa_vector):
         """Add Dirichlet noise to the psa_vector of the root node.
@@ -221,13 +984,191 @@ class MonteCarloTreeSearch(object):
         Returns:
             A probability vector which has Dirichlet noise added to it.
         """
-        dirichlet_input = [CFG.dirichlet_alpha for x in range(game.action_size)]
+        dirichlet_input = [self.config.dirichlet_alpha
+                           for x in range(game.action_size)]
 
         dirichlet_list = np.random.dirichlet(dirichlet_input)
         noisy_psa_vector = []
 
         for idx, psa in enumerate(psa_vector):
             noisy_psa_vector.append(
-                (1 - CFG.epsilon) * psa + CFG.epsilon * dirichlet_list[idx])
+                (1 - self.config.epsilon) * psa +
+                self.config.epsilon * dirichlet_list[idx])
 
         return noisy_psa_vector
+
+
+class OpeningCache(object):
+    """Shares the opening of the search between self-play games.
+
+    Every self-play game of an iteration starts from the same position and
+    uses the same network, so the network evaluations and the root
+    statistics of the first plies are kept here and reused by later games.
+    Positions are keyed by their canonical key, so symmetric positions share
+    an entry. Each game still adds its own Dirichlet noise at the root.
+
+    Network evaluations are only ever added. The root statistics of a
+    position are replaced by those of its latest search, and are scaled
+    down to at most max_visits visits when they are loaded, so the shared
+    counts can't outgrow the search of a single game.
+
+    Attributes:
+        max_plies: An integer with the number of plies covered by the cache.
+        max_visits: An integer maximum visit count seeded into a root.
+        initial_pieces: An integer with the number of pieces at the start.
+        evaluations: A dictionary mapping positions to network outputs.
+        statistics: A dictionary mapping positions to root statistics.
+        hits: An integer with the number of evaluations served by the cache.
+        misses: An integer with the number of evaluations sent to the network.
+    """
+
+    def __init__(self, game, max_plies=None, max_visits=None):
+        """Initializes OpeningCache with the initial game state."""
+        if max_plies is None:
+            max_plies = CFG.opening_cache_plies
+        if max_visits is None:
+            max_visits = CFG.num_mcts_sims
+
+        self.max_plies = max_plies
+        self.max_visits = max_visits
+        self.initial_pieces = np.count_nonzero(game.state)
+        self.evaluations = {}
+        self.statistics = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get_key(self, game):
+        """Returns a hashable key for the position if it is in the opening.
+
+        Positions which are symmetric to each other share one key.
+
+        Args:
+            game: An object containing the game state.
+
+        Returns:
+            The canonical Zobrist key of the position, or None if it is past
+            the opening.
+        """
+        ply = np.count_nonzero(game.state) - self.initial_pieces
+
+        if ply >= self.max_plies:
+            return None
+
+        return game.get_canonical_key()
+
+    def get_permutation(self, game):
+        """Returns how the actions of a position map to its canonical board.
+
+        Args:
+            game: An object containing the game state.
+
+        Returns:
+            A list with the canonical action id of every action id.
+        """
+        return list(game.get_action_symmetry(game.get_canonical_symmetry()))
+
+    def predict(self, net, game):
+        """Predicts move probabilities and state values given a game state.
+
+        Policies are stored in the orientation of the canonical board, so a
+        symmetric position reuses them with its moves mapped.
+
+        Args:
+            net: An object containing the neural network.
+            game: An object containing the game state.
+
+        Returns:
+            A probability vector and a value scalar
+        """
+        key = self.get_key(game)
+
+        if key is None:
+            return net.predict(game.state)
+
+        permutation = self.get_permutation(game)
+
+        if key in self.evaluations:
+            self.hits += 1
+            canonical_psa_vector, v = self.evaluations[key]
+        else:
+            self.misses += 1
+            psa_vector, v = net.predict(game.state)
+            canonical_psa_vector = np.zeros(len(permutation))
+            canonical_psa_vector[permutation] = psa_vector
+            self.evaluations[key] = (canonical_psa_vector, v)
+
+        # Indexing hands out a copy, which callers may mask in place.
+        return canonical_psa_vector[permutation], v
+
+    def has_statistics(self, game):
+        """Checks if root statistics are stored for a position.
+
+        Args:
+            game: An object containing the game state.
+
+        Returns:
+            A boolean value indicating if statistics are stored.
+        """
+        key = self.get_key(game)
+        return key is not None and key in self.statistics
+
+    def store_statistics(self, game, node):
+        """Stores the statistics of a searched root node.
+
+        Args:
+            game: An object containing the game state at the node.
+            node: A TreeNode representing the root of the search.
+        """
+        key = self.get_key(game)
+
+        if key is None:
+            return
+
+        permutation = self.get_permutation(game)
+
+        child_stats = {}
+        for action_id, child in node.children.items():
+            child_stats[permutation[action_id]] = (child.Nsa, child.Wsa)
+
+        self.statistics[key] = (node.Nsa, node.Wsa, child_stats)
+
+    def load_statistics(self, game, node):
+        """Seeds an expanded root node with the stored statistics.
+
+        The stored visit counts are scaled down to at most max_visits at the
+        root, keeping their mean values. Statistics are only taken over
+        where the scaled visit count is higher than the one already on the
+        node.
+
+        Args:
+            game: An object containing the game state at the node.
+            node: A TreeNode representing the root of the search.
+        """
+        nsa, wsa, child_stats = self.statistics[self.get_key(game)]
+        permutation = self.get_permutation(game)
+
+        scale = min(1.0, self.max_visits / nsa)
+
+        if int(nsa * scale) <= node.Nsa:
+            return
+
+        node.Nsa = int(nsa * scale)
+        node.Wsa = wsa * node.Nsa / nsa
+        node.Qsa = wsa / nsa
+
+        for idx, action_id in enumerate(node.legal_actions):
+            if permutation[action_id] not in child_stats:
+                continue
+
+            child_nsa, child_wsa = child_stats[permutation[action_id]]
+            scaled_nsa = int(round(child_nsa * scale))
+
+            if scaled_nsa == 0:
+                continue
+
+            child = node.get_child(idx)
+
+            if scaled_nsa > child.Nsa:
+                child.Nsa = scaled_nsa
+                child.Wsa = child_wsa * scaled_nsa / child_nsa
+                child.Qsa = child_wsa / child_nsa
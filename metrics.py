@@ -0,0 +1,344 @@
+# MIT License
+#
+# Copyright (c) 2018 Blanyal D'Souza
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+"""Classes to export training metrics and to write buffered logs."""
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config import CFG
+
+# Upper bounds of the latency histogram buckets in seconds.
+LATENCY_BUCKETS = (0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2,
+                   0.5, 1.0)
+
+# Upper bounds of the batch occupancy histogram buckets.
+OCCUPANCY_BUCKETS = (0.125, 0.25, 0.5, 0.75, 0.9, 1.0)
+
+
+class BufferedLog(object):
+    """Appends lines to a file in batches and rotates it by size.
+
+    Lines are kept in memory until the buffer is full or flush is called, so
+    the file is opened once per batch of lines instead of once per line.
+    Once the file grows past max_bytes it is renamed to file_path.1, older
+    files move up by one and the oldest is removed.
+
+    Attributes:
+        file_path: A string path of the log file.
+        max_bytes: An integer size at which the file is rotated. 0 never
+            rotates it.
+        backups: An integer number of rotated files to keep.
+        capacity: An integer number of lines kept before they are written.
+        lines: A list of lines waiting to be written.
+    """
+
+    def __init__(self, file_path, max_bytes=None, backups=None, capacity=1000):
+        """Initializes BufferedLog with the file path and rotation limits."""
+        self.file_path = file_path
+        self.max_bytes = CFG.log_max_bytes if max_bytes is None else max_bytes
+        self.backups = CFG.log_backups if backups is None else backups
+        self.capacity = capacity
+        self.lines = []
+
+    def write(self, line):
+        """Adds a line to the log.
+
+        Args:
+            line: A string without the trailing newline.
+        """
+        self.lines.append(line + "\n")
+
+        if len(self.lines) >= self.capacity:
+            self.flush()
+
+    def flush(self):
+        """Writes the buffered lines to the file."""
+        if not self.lines:
+            return
+
+        directory = os.path.dirname(self.file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        data = "".join(self.lines)
+        self.lines = []
+
+        if self.max_bytes and os.path.exists(self.file_path) and \
+                os.path.getsize(self.file_path) + len(data) > self.max_bytes:
+            self.rotate()
+
+        with open(self.file_path, 'a') as log_file:
+            log_file.write(data)
+
+    def rotate(self):
+        """Moves the log file to the first backup."""
+        if self.backups <= 0:
+            os.remove(self.file_path)
+            return
+
+        for i in range(self.backups - 1, 0, -1):
+            source = "%s.%d" % (self.file_path, i)
+            if os.path.exists(source):
+                os.replace(source, "%s.%d" % (self.file_path, i + 1))
+
+        os.replace(self.file_path, self.file_path + ".1")
+
+
+class Metrics(object):
+    """Counters, gauges and histograms in the Prometheus text format.
+
+    Metrics are declared once with their type and help text. While the
+    exporter is off every update returns at once. Once started, the metrics
+    are served over HTTP on the metrics_port of the config and written to
+    its metrics_textfile, for example for the textfile collector of the
+    Prometheus node exporter.
+
+    Attributes:
+        enabled: A boolean value indicating if updates are recorded.
+        kinds: A dictionary which maps metric names to their type and help.
+        values: A dictionary which maps metric names to a dictionary of
+            label tuples and values.
+        buckets: A dictionary which maps histogram names to their bucket
+            upper bounds.
+        lock: A threading.Lock shared by the updates and the HTTP server.
+        server: The ThreadingHTTPServer serving the metrics, or None.
+        config: The Config the exporter was started with.
+    """
+
+    def __init__(self):
+        """Initializes Metrics with the exporter switched off."""
+        self.enabled = False
+        self.kinds = {}
+        self.values = {}
+        self.buckets = {}
+        self.lock = threading.Lock()
+        self.server = None
+        self.config = CFG
+
+    def declare(self, name, kind, help_text, buckets=None):
+        """Declares a metric.
+
+        Args:
+            name: A string metric name.
+            kind: A string "counter", "gauge" or "histogram".
+            help_text: A string describing the metric.
+            buckets: A tuple of bucket upper bounds for histograms.
+        """
+        self.kinds[name] = (kind, help_text)
+        self.values[name] = {}
+        if kind == "histogram":
+            self.buckets[name] = buckets
+
+    def start(self, config=None):
+        """Starts recording and the HTTP server if the config asks for them.
+
+        Args:
+            config: The Config of the run. Defaults to CFG.
+        """
+        self.config = config = CFG if config is None else config
+        self.enabled = bool(config.metrics_port or config.metrics_textfile)
+
+        if config.metrics_port and self.server is None:
+            metrics = self
+
+            class Handler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    body = metrics.render().encode()
+                    self.send_response(200)
+                    self.send_header("Content-Type",
+                                     "text/plain; version=0.0.4")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, *args):
+                    pass  # Scrapes would flood the training output.
+
+            self.server = ThreadingHTTPServer(("", config.metrics_port),
+                                              Handler)
+            thread = threading.Thread(target=self.server.serve_forever,
+                                      daemon=True)
+            thread.start()
+            print("Serving metrics on port", self.server.server_address[1])
+
+    def stop(self):
+        """Stops recording and shuts the HTTP server down."""
+        self.enabled = False
+
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def inc(self, name, value=1, **labels):
+        """Adds to a counter.
+
+        Args:
+            name: A string metric name.
+            value: A number to add.
+            labels: String label values of the series.
+        """
+        if not self.enabled:
+            return
+
+        key = tuple(sorted(labels.items()))
+        with self.lock:
+            series = self.values[name]
+            series[key] = series.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        """Sets a gauge.
+
+        Args:
+            name: A string metric name.
+            value: A number.
+            labels: String label values of the series.
+        """
+        if not self.enabled:
+            return
+
+        key = tuple(sorted(labels.items()))
+        with self.lock:
+            self.values[name][key] = value
+
+    def observe(self, name, value, **labels):
+        """Adds an observation to a histogram.
+
+        Args:
+            name: A string metric name.
+            value: A number.
+            labels: String label values of the series.
+        """
+        if not self.enabled:
+            return
+
+        key = tuple(sorted(labels.items()))
+        buckets = self.buckets[name]
+        with self.lock:
+            series = self.values[name]
+            if key not in series:
+                # Bucket counts, then the sum and the count of observations.
+                series[key] = [0] * len(buckets) + [0.0, 0]
+            counts = series[key]
+
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    counts[i] += 1
+            counts[-2] += value
+            counts[-1] += 1
+
+    def render(self):
+        """Formats every metric in the Prometheus text format.
+
+        Returns:
+            A string with one line per series.
+        """
+        lines = []
+
+        with self.lock:
+            for name, (kind, help_text) in self.kinds.items():
+                lines.append("# HELP %s %s" % (name, help_text))
+                lines.append("# TYPE %s %s" % (name, kind))
+
+                for key, value in self.values[name].items():
+                    if kind != "histogram":
+                        lines.append("%s%s %s" % (name, format_labels(key),
+                                                  repr(float(value))))
+                        continue
+
+                    bounds = [repr(float(bound)) for bound in
+                              self.buckets[name]] + ["+Inf"]
+                    for bound, count in zip(bounds,
+                                            value[:-2] + [value[-1]]):
+                        lines.append("%s_bucket%s %d" % (
+                            name, format_labels(key + (("le", bound),)),
+                            count))
+                    lines.append("%s_sum%s %s" % (name, format_labels(key),
+                                                  repr(float(value[-2]))))
+                    lines.append("%s_count%s %d" % (name, format_labels(key),
+                                                    value[-1]))
+
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self):
+        """Writes the metrics to the metrics_textfile of the config, if set.
+
+        The file is replaced in one step, so readers never see half of it.
+        """
+        metrics_textfile = self.config.metrics_textfile
+        if not self.enabled or not metrics_textfile:
+            return
+
+        temp_path = metrics_textfile + ".tmp"
+        with open(temp_path, 'w') as textfile:
+            textfile.write(self.render())
+        os.replace(temp_path, metrics_textfile)
+
+
+def format_labels(key):
+    """Formats label pairs as a Prometheus label set.
+
+    Args:
+        key: A tuple of (name, value) label pairs.
+
+    Returns:
+        A string like {name="value"}, or an empty string without labels.
+    """
+    if not key:
+        return ""
+
+    return "{%s}" % ",".join('%s="%s"' % (name, str(value).replace(
+        "\\", "\\\\").replace('"', '\\"')) for name, value in key)
+
+
+# Metrics shared by self-play, the network, training and evaluation.
+METRICS = Metrics()
+METRICS.declare("alphazero_iteration", "gauge",
+                "Number of the current training iteration.")
+METRICS.declare("alphazero_self_play_games_total", "counter",
+                "Self-play games finished.")
+METRICS.declare("alphazero_self_play_positions_total", "counter",
+                "Moves played in self-play games.")
+METRICS.declare("alphazero_self_play_games_per_hour", "gauge",
+                "Self-play games per hour during the last iteration.")
+METRICS.declare("alphazero_self_play_positions_per_second", "gauge",
+                "Self-play moves per second during the last iteration.")
+METRICS.declare("alphazero_training_examples", "gauge",
+                "Training examples gathered in the last iteration.")
+METRICS.declare("alphazero_predict_seconds", "histogram",
+                "Latency of network predictions.", LATENCY_BUCKETS)
+METRICS.declare("alphazero_batch_occupancy", "histogram",
+                "Fraction of the batch size filled by a training batch.",
+                OCCUPANCY_BUCKETS)
+METRICS.declare("alphazero_train_steps_total", "counter",
+                "Training steps run.")
+METRICS.declare("alphazero_policy_loss", "gauge",
+                "Policy loss of the last training step.")
+METRICS.declare("alphazero_value_loss", "gauge",
+                "Value loss of the last training step.")
+METRICS.declare("alphazero_evaluation_games_total", "counter",
+                "Evaluation games by result for the current network.")
+METRICS.declare("alphazero_evaluation_win_rate", "gauge",
+                "Win rate of the last evaluation.")
+METRICS.declare("alphazero_models_accepted_total", "counter",
+                "Networks accepted as the best model.")
@@ -22,11 +22,14 @@
 # ==============================================================================
 """Class to represent the Neural Network."""
 import os
+import time
 
 import tensorflow as tf
 import numpy as np
 
 from config import CFG
+from metrics import METRICS, BufferedLog
+from profiler import PROFILER
 
 
 class NeuralNetwork(object):
@@ -47,11 +50,14 @@ class NeuralNetwork(object):
         total_loss: A TF tensor to store the addition of pi and v losses.
         train_op: A TF tensor for the train output of the optimizer.
         saver: A TF saver for writing training checkpoints.
+        inference_variables: A list of the TF variables needed for
+            predictions, without the optimizer state.
         sess: A TF session for running Ops on the Graph.
     """
 
-    def __init__(self, game):
+    def __init__(self, game, config=None):
         """Initializes NeuralNetwork with the Resnet network graph."""
+        config = CFG if config is None else config
         self.row = game.row
         self.column = game.column
         self.action_size = game.action_size
@@ -86,7 +92,7 @@ class NeuralNetwork(object):
             resnet_in_out = relu1
 
             # Residual Tower
-            for i in range(CFG.resnet_blocks):
+            for i in range(config.resnet_blocks):
                 # Residual Block
                 conv2 = tf.layers.conv2d(
                     inputs=resnet_in_out,
@@ -154,7 +160,7 @@ class NeuralNetwork(object):
 
             relu5 = tf.nn.relu(batch_norm5)
 
-            relu5_flat = tf.reshape(relu5, [-1, self.action_size])
+            relu5_flat = tf.reshape(relu5, [-1, self.row * self.column])
 
             dense1 = tf.layers.dense(inputs=relu5_flat,
                                      units=256)
@@ -188,8 +194,8 @@ class NeuralNetwork(object):
             #                                            staircase=True)
 
             optimizer = tf.train.MomentumOptimizer(
-                learning_rate=CFG.learning_rate,
-                momentum=CFG.momentum,
+                learning_rate=config.learning_rate,
+                momentum=config.momentum,
                 use_nesterov=False)
 
             self.train_op = optimizer.minimize(self.total_loss)
@@ -197,6 +203,10 @@ class NeuralNetwork(object):
             # Create a saver for writing training checkpoints.
             self.saver = tf.train.Saver()
 
+            self.inference_variables = [
+                variable for variable in tf.global_variables()
+                if "Momentum" not in variable.name]
+
             # Create a session for running Ops on the Graph.
             self.sess = tf.Session()
 
@@ -211,13 +221,18 @@ class NeuralNetworkWrapper(object):
         game: An object containing the game state.
         net: An object containing the neural network.
         sess: A TF session for running Ops on the Graph.
+        loss_log: A BufferedLog of the policy and value loss, created by the
+            first training step with record_loss.
+        config: The Config of the network.
     """
 
-    def __init__(self, game):
+    def __init__(self, game, config=None):
         """Initializes NeuralNetworkWrapper with game state and TF session."""
+        self.config = CFG if config is None else config
         self.game = game
-        self.net = NeuralNetwork(self.game)
+        self.net = NeuralNetwork(self.game, self.config)
         self.sess = self.net.sess
+        self.loss_log = None
 
     def predict(self, state):
         """Predicts move probabilities and state values given a game state.
@@ -229,13 +244,38 @@ class NeuralNetworkWrapper(object):
             A probability vector and a value scalar
         """
         state = state[np.newaxis, :, :]
+        start = time.perf_counter()
 
         pi, v = self.sess.run([self.net.pi, self.net.v],
                               feed_dict={self.net.states: state,
                                          self.net.training: False})
 
+        METRICS.observe("alphazero_predict_seconds",
+                        time.perf_counter() - start, batch_size="1")
+
         return pi[0], v[0][0]
 
+    def predict_batch(self, states):
+        """Predicts move probabilities and state values for several states.
+
+        Args:
+            states: A list of game states in matrix form.
+
+        Returns:
+            A matrix with a probability vector per state and a vector of values.
+        """
+        start = time.perf_counter()
+
+        pi, v = self.sess.run([self.net.pi, self.net.v],
+                              feed_dict={self.net.states: np.asarray(states),
+                                         self.net.training: False})
+
+        METRICS.observe("alphazero_predict_seconds",
+                        time.perf_counter() - start,
+                        batch_size=str(len(states)))
+
+        return pi, v[:, 0]
+
     def train(self, training_data):
         """Trains the network using states, pis and vs from self play games.
 
@@ -244,38 +284,51 @@ class NeuralNetworkWrapper(object):
         """
         print("\nTraining the network.\n")
 
-        for epoch in range(CFG.epochs):
+        batch_size = self.config.batch_size
+
+        for epoch in range(self.config.epochs):
             print("Epoch", epoch + 1)
 
             examples_num = len(training_data)
 
             # Divide epoch into batches.
-            for i in range(0, examples_num, CFG.batch_size):
+            for i in range(0, examples_num, batch_size):
                 states, pis, vs = map(list,
-                                      zip(*training_data[i:i + CFG.batch_size]))
+                                      zip(*training_data[i:i + batch_size]))
 
                 feed_dict = {self.net.states: states,
                              self.net.train_pis: pis,
                              self.net.train_vs: vs,
                              self.net.training: True}
 
-                self.sess.run(self.net.train_op,
-                              feed_dict=feed_dict)
+                with PROFILER.timer("train_step"):
+                    self.sess.run(self.net.train_op,
+                                  feed_dict=feed_dict)
 
-                pi_loss, v_loss = self.sess.run(
-                    [self.net.loss_pi, self.net.loss_v],
-                    feed_dict=feed_dict)
+                with PROFILER.timer("train_loss"):
+                    pi_loss, v_loss = self.sess.run(
+                        [self.net.loss_pi, self.net.loss_v],
+                        feed_dict=feed_dict)
 
-                # Record pi and v loss to a file.
-                if CFG.record_loss:
-                    # Create directory if it doesn't exist.
-                    if not os.path.exists(CFG.model_directory):
-                        os.mkdir(CFG.model_directory)
+                PROFILER.count("train_examples", len(states))
+
+                METRICS.inc("alphazero_train_steps_total")
+                METRICS.set("alphazero_policy_loss", pi_loss)
+                METRICS.set("alphazero_value_loss", v_loss)
+                METRICS.observe("alphazero_batch_occupancy",
+                                len(states) / batch_size)
 
-                    file_path = CFG.model_directory + CFG.loss_file
+                # Record pi and v loss to a file.
+                if self.config.record_loss:
+                    if self.loss_log is None:
+                        self.loss_log = BufferedLog(
+                            self.config.model_directory +
+                            self.config.loss_file,
+                            self.config.log_max_bytes, self.config.log_backups)
+                    self.loss_log.write('%f|%f' % (pi_loss, v_loss))
 
-                    with open(file_path, 'a') as loss_file:
-                        loss_file.write('%f|%f\n' % (pi_loss, v_loss))
+        if self.loss_log is not None:
+            self.loss_log.flush()
 
         print("\n")
 
@@ -286,21 +339,27 @@ class NeuralNetworkWrapper(object):
             filename: A string representing the model name.
         """
         # Create directory if it doesn't exist.
-        if not os.path.exists(CFG.model_directory):
-            os.mkdir(CFG.model_directory)
+        os.makedirs(self.config.model_directory, exist_ok=True)
 
-        file_path = CFG.model_directory + filename
+        file_path = self.config.model_directory + filename
 
-        print("Saving model:", filename, "at", CFG.model_directory)
+        print("Saving model:", filename, "at", self.config.model_directory)
         self.net.saver.save(self.sess, file_path)
 
+        # The weights are also saved for NumpyNetwork, which holds networks
+        # only used for predictions without another TF graph and session.
+        values = self.sess.run(self.net.inference_variables)
+        np.savez(file_path + ".npz",
+                 **{variable.name.split(":")[0]: value for variable, value in
+                    zip(self.net.inference_variables, values)})
+
     def load_model(self, filename="current_model"):
         """Loads the network model at the given file path.
 
         Args:
             filename: A string representing the model name.
         """
-        file_path = CFG.model_directory + filename
+        file_path = self.config.model_directory + filename
 
-        print("Loading model:", filename, "from", CFG.model_directory)
+        print("Loading model:", filename, "from", self.config.model_directory)
         self.net.saver.restore(self.sess, file_path)
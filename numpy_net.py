@@ -0,0 +1,234 @@
+# MIT License
+#
+# Copyright (c) 2018 Blanyal D'Souza
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+"""Class to run the Policy and Value Resnet with NumPy for inference."""
+import os
+
+import numpy as np
+
+from config import CFG
+
+# Default epsilon of tf.layers.batch_normalization.
+BATCH_NORM_EPSILON = 1e-3
+
+
+class NumpyNetwork(object):
+    """Inference-only copy of the Resnet in NeuralNetwork.
+
+    Runs the forward pass with NumPy on weights saved by
+    NeuralNetworkWrapper.save_model, so holding another set of weights
+    needs neither a TF graph nor a session, nor the optimizer state. Batch
+    normalization is folded into the convolutions when the weights are
+    loaded, and the number of residual blocks is read from the weights.
+
+    Attributes:
+        game: An object containing the game state.
+        row: An integer indicating the length of the board row.
+        column: An integer indicating the length of the board column.
+        action_size: An integer indicating the total number of actions.
+        convs: A list of (kernel, bias) pairs of the folded convolutions, the
+            first one followed by two per residual block.
+        policy_conv: A (kernel, bias) pair of the policy head convolution.
+        policy_dense: A (kernel, bias) pair of the policy head dense layer.
+        value_conv: A (kernel, bias) pair of the value head convolution.
+        value_dense: A list of (kernel, bias) pairs of the value head dense
+            layers.
+        config: The Config with the model directory.
+    """
+
+    def __init__(self, game, config=None):
+        """Initializes NumpyNetwork for the game's board and action sizes."""
+        self.config = CFG if config is None else config
+        self.game = game
+        self.row = game.row
+        self.column = game.column
+        self.action_size = game.action_size
+        self.convs = []
+        self.policy_conv = None
+        self.policy_dense = None
+        self.value_conv = None
+        self.value_dense = []
+
+    def set_weights(self, weights):
+        """Sets the layers from the variables of a NeuralNetwork.
+
+        Args:
+            weights: A dictionary which maps TF variable names without the
+                output index, like "conv2d_1/kernel", to their values.
+        """
+        def layer(kind, index):
+            return kind if index == 0 else "%s_%d" % (kind, index)
+
+        def folded_conv(index):
+            conv = layer("conv2d", index)
+            norm = layer("batch_normalization", index)
+
+            scale = weights[norm + "/gamma"] / np.sqrt(
+                weights[norm + "/moving_variance"] + BATCH_NORM_EPSILON)
+            kernel = weights[conv + "/kernel"] * scale
+            bias = (weights[conv + "/bias"] - weights[norm + "/moving_mean"]) \
+                * scale + weights[norm + "/beta"]
+
+            # Flatten the kernel to multiply it with the stacked neighborhoods.
+            return (kernel.reshape(-1, kernel.shape[-1]).astype(np.float32),
+                    bias.astype(np.float32))
+
+        def dense(index):
+            name = layer("dense", index)
+            return (weights[name + "/kernel"].astype(np.float32),
+                    weights[name + "/bias"].astype(np.float32))
+
+        # Layers are numbered in the order NeuralNetwork creates them: the
+        # first convolution, two per residual block and one per head.
+        num_convs = sum(name.startswith("conv2d") and name.endswith("/kernel")
+                        for name in weights)
+        num_blocks = (num_convs - 3) // 2
+        self.convs = [folded_conv(i) for i in range(2 * num_blocks + 1)]
+        self.policy_conv = folded_conv(2 * num_blocks + 1)
+        self.policy_dense = dense(0)
+        self.value_conv = folded_conv(2 * num_blocks + 2)
+        self.value_dense = [dense(1), dense(2)]
+
+    def load_model(self, filename="current_model"):
+        """Loads the weights saved next to a network model.
+
+        Args:
+            filename: A string representing the model name.
+
+        Raises:
+            FileNotFoundError: If the weights were never saved, for example
+                for a model saved before the weights were saved with it.
+        """
+        file_path = self.config.model_directory + filename + ".npz"
+
+        # Reading the TF checkpoint itself would import TF.
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(
+                "No weights at %s. NeuralNetworkWrapper.save_model writes "
+                "them next to the TF checkpoint, so load and save the model "
+                "once with the tensorflow backend." % file_path)
+
+        print("Loading weights:", filename, "from",
+              self.config.model_directory)
+        with np.load(file_path) as weights:
+            self.set_weights(dict(weights))
+
+    def predict(self, state):
+        """Predicts move probabilities and state values given a game state.
+
+        Args:
+            state: A list containing the game state in matrix form.
+
+        Returns:
+            A probability vector and a value scalar
+        """
+        pi, v = self.predict_batch([state])
+
+        return pi[0], v[0]
+
+    def predict_batch(self, states):
+        """Predicts move probabilities and state values for several states.
+
+        Args:
+            states: A list of game states in matrix form.
+
+        Returns:
+            A matrix with a probability vector per state and a vector of values.
+        """
+        x = np.asarray(states, dtype=np.float32)[..., np.newaxis]
+
+        x = relu(conv3x3(x, *self.convs[0]))
+
+        # Residual Tower
+        for i in range(1, len(self.convs), 2):
+            y = relu(conv3x3(x, *self.convs[i]))
+            x = relu(conv3x3(y, *self.convs[i + 1]) + x)
+
+        num_states = x.shape[0]
+
+        # Policy Head
+        policy = relu(conv1x1(x, *self.policy_conv)).reshape(num_states, -1)
+        logits = dense(policy, *self.policy_dense)
+        logits -= logits.max(axis=1, keepdims=True)
+        pi = np.exp(logits)
+        pi /= pi.sum(axis=1, keepdims=True)
+
+        # Value Head
+        value = relu(conv1x1(x, *self.value_conv)).reshape(num_states, -1)
+        value = relu(dense(value, *self.value_dense[0]))
+        v = np.tanh(dense(value, *self.value_dense[1]))
+
+        return pi, v[:, 0]
+
+
+def conv3x3(x, kernel, bias):
+    """Applies a 3x3 convolution with same padding.
+
+    Args:
+        x: An array of shape (states, row, column, channels).
+        kernel: An array of shape (9 * channels, filters).
+        bias: An array of shape (filters,).
+
+    Returns:
+        An array of shape (states, row, column, filters).
+    """
+    num_states, row, column, channels = x.shape
+    padded = np.pad(x, ((0, 0), (1, 1), (1, 1), (0, 0)))
+
+    # Stack the 3x3 neighborhood of every square in the kernel's order.
+    patches = np.concatenate([padded[:, i:i + row, j:j + column]
+                              for i in range(3) for j in range(3)], axis=3)
+
+    return patches @ kernel + bias
+
+
+def conv1x1(x, kernel, bias):
+    """Applies a 1x1 convolution.
+
+    Args:
+        x: An array of shape (states, row, column, channels).
+        kernel: An array of shape (channels, filters).
+        bias: An array of shape (filters,).
+
+    Returns:
+        An array of shape (states, row, column, filters).
+    """
+    return x @ kernel + bias
+
+
+def dense(x, kernel, bias):
+    """Applies a fully connected layer.
+
+    Args:
+        x: An array of shape (states, inputs).
+        kernel: An array of shape (inputs, units).
+        bias: An array of shape (units,).
+
+    Returns:
+        An array of shape (states, units).
+    """
+    return x @ kernel + bias
+
+
+def relu(x):
+    """Returns the rectified input."""
+    return np.maximum(x, 0)
@@ -22,11 +22,10 @@
 # ==============================================================================
 """Class for Board State and Logic."""
 from copy import deepcopy
-from collections import Counter
 
 import numpy as np
 
-from game import Game
+from game import Game, get_symmetries, get_zobrist_keys
 
 
 class OthelloGame(Game):
@@ -41,11 +40,11 @@ class OthelloGame(Game):
         directions: A dictionary containing tuples to check for valid moves.
     """
 
-    def __init__(self):
-        """Initializes TicTacToeGame with the initial board state."""
+    def __init__(self, size=6):
+        """Initializes OthelloGame with the initial board state."""
         super().__init__()
-        self.row = 6
-        self.column = 6
+        self.row = size
+        self.column = size
         self.current_player = -1
         self.state = []
         self.action_size = self.row * self.column
@@ -61,6 +60,11 @@ class OthelloGame(Game):
 
         self.state = np.array(self.state)
 
+        # Moves flip a single direction picked in a fixed order, so rotated
+        # positions don't play alike and only the identity is a symmetry.
+        self.symmetries = get_symmetries(self.row, self.column, "identity")
+        self.zobrist = get_zobrist_keys(self.action_size)
+
         self.directions = {
             0: (-1, -1),
             1: (-1, 0),
@@ -78,9 +82,10 @@ class OthelloGame(Game):
         Returns:
             the cloned game object.
         """
-        game_clone = OthelloGame()
+        game_clone = OthelloGame(self.row)
         game_clone.state = deepcopy(self.state)
         game_clone.current_player = self.current_player
+        self.copy_key(game_clone)
         return game_clone
 
     def play_action(self, action):
@@ -94,6 +99,7 @@ class OthelloGame(Game):
         d = action[3]
 
         self.state[x][y] = self.current_player
+        self.toggle_key(x * self.column + y, self.current_player)
 
         count = 1
 
@@ -104,6 +110,8 @@ class OthelloGame(Game):
 
             if self.state[row][col] == -self.current_player:
                 self.state[row][col] = self.current_player
+                self.toggle_key(row * self.column + col, -self.current_player)
+                self.toggle_key(row * self.column + col, self.current_player)
                 count += 1
             else:
                 break
@@ -120,54 +128,83 @@ class OthelloGame(Game):
         """
         valid_moves = []
 
-        pl = current_player
+        for x in range(self.row):
+            for y in range(self.column):
+                d = self.find_direction(x, y, current_player)
 
-        side = self.row
+                if d is not None:
+                    valid_moves.append((1, x, y, d))
+                else:
+                    valid_moves.append((0, None, None, None))
 
+        # The direction tuples make the rows ragged, so keep them as objects.
+        return np.array(valid_moves, dtype=object)
+
+    def has_valid_move(self, current_player):
+        """Checks if a player has at least one valid move.
+
+        Stops at the first valid move instead of generating all of them.
+
+        Args:
+            current_player: An integer representing the player to check.
+
+        Returns:
+            A boolean value indicating if the player can move.
+        """
         for x in range(self.row):
             for y in range(self.column):
-                found = False
+                if self.find_direction(x, y, current_player) is not None:
+                    return True
+        return False
 
-                # Search for empty squares.
-                if self.state[x][y] == 0:
+    def find_direction(self, x, y, current_player):
+        """Finds the direction of a sandwich move on a square.
+
+        Args:
+            x: An integer for the row of the square.
+            y: An integer for the column of the square.
+            current_player: An integer representing the player to move.
+
+        Returns:
+            A tuple with the direction of the first sandwich found, or None if
+            the square is not a valid move.
+        """
+        pl = current_player
 
-                    # Search in all 8 directions for a square of the opponent.
-                    for i in range(len(self.directions)):
-                        d = self.directions[i]
+        side = self.row
 
-                        row = x + d[0]
-                        col = y + d[1]
+        # Search for empty squares.
+        if self.state[x][y] != 0:
+            return None
 
-                        if row < side and col < side:
-                            if self.state[row][col] == -pl:
-                                found_valid_move = False
-                                count = 2
+        # Search in all 8 directions for a square of the opponent.
+        for i in range(len(self.directions)):
+            d = self.directions[i]
 
-                                # Keep searching for a sandwich condition.
-                                while True:
-                                    row = x + d[0] * count
-                                    col = y + d[1] * count
+            row = x + d[0]
+            col = y + d[1]
 
-                                    if 0 <= row < side and 0 <= col < side:
-                                        if self.state[row][col] == pl:
-                                            valid_moves.append((1, x, y, d))
-                                            found_valid_move = True
-                                            break
-                                    else:
-                                        break
+            if row < side and col < side:
+                if self.state[row][col] == -pl:
+                    count = 2
 
-                                    count += 1
+                    # Keep searching for a sandwich condition.
+                    while True:
+                        row = x + d[0] * count
+                        col = y + d[1] * count
 
-                                if found_valid_move:
-                                    found = True
-                                    break
+                        if 0 <= row < side and 0 <= col < side:
+                            if self.state[row][col] == pl:
+                                return d
+                        else:
+                            break
 
-                if not found:
-                    valid_moves.append((0, None, None, None))
+                        count += 1
 
-        return np.array(valid_moves)
+        return None
 
-    def check_game_over(self, current_player):
+    def check_game_over(self, current_player, valid_moves=None,
+                        last_move=None):
         """Checks if the game is over and return a possible winner.
 
         There are 3 possible scenarios.
@@ -177,6 +214,10 @@ class OthelloGame(Game):
 
         Args:
             current_player: An integer representing the current player.
+            valid_moves: The result of get_valid_moves for the current player
+                if it is already known, which saves generating it again.
+            last_move: Not used, a move can end the game anywhere on the
+                board.
 
         Returns:
             A bool representing the game over state.
@@ -186,21 +227,20 @@ class OthelloGame(Game):
         player_a = current_player
         player_b = -current_player
 
-        player_a_moves = self.get_valid_moves(player_a)
-        player_b_moves = self.get_valid_moves(player_b)
-
-        player_a_valid_count = Counter(x[0] == 1 for x in player_a_moves)
-        player_b_valid_count = Counter(x[0] == 1 for x in player_b_moves)
+        if valid_moves is None:
+            player_a_can_move = self.has_valid_move(player_a)
+        else:
+            player_a_can_move = any(move[0] == 1 for move in valid_moves)
 
         # Check if both players can't play any more moves.
-        if player_a_valid_count[True] == 0 or player_b_valid_count[True] == 0:
-            unique, piece_count = np.unique(self.state,
-                                            return_counts=True)
+        if not player_a_can_move or not self.has_valid_move(player_b):
+            player_a_count = np.count_nonzero(self.state == player_a)
+            player_b_count = np.count_nonzero(self.state == player_b)
 
             # Check for the player with the most number of pieces.
-            if piece_count[player_a] > piece_count[player_b]:
+            if player_a_count > player_b_count:
                 return True, 1
-            elif piece_count[player_a] == piece_count[player_b]:
+            elif player_a_count == player_b_count:
                 return True, 0
             else:
                 return True, -1
@@ -209,7 +249,7 @@ class OthelloGame(Game):
 
     def print_board(self):
         """Prints the board state."""
-        print("   0    1    2    3    4    5")
+        print("   " + "    ".join(str(y) for y in range(self.column)))
         for x in range(self.row):
             print(x, end='')
             for y in range(self.column):
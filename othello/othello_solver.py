@@ -0,0 +1,234 @@
+# MIT License
+#
+# Copyright (c) 2018 Blanyal D'Souza
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+"""Exact endgame solver for Othello."""
+import numpy as np
+
+from solver import Solver
+
+
+class OthelloSolver(Solver):
+    """Solves Othello positions with a few empty squares left.
+
+    The search follows the rules of OthelloGame by using its own move
+    generation and moves, and solves positions for win, draw or loss with
+    a negamax alpha-beta search. Corners are searched first and the squares
+    next to empty corners last, and a transposition table stores bounds of
+    positions reached by different move orders.
+
+    Attributes:
+        max_table_size: An integer number of positions after which the
+            transposition table is cleared.
+        table: A dictionary which maps positions to their bounded values.
+    """
+
+    LOWER = 0
+    EXACT = 1
+    UPPER = 2
+
+    def __init__(self, max_empty=None, node_limit=None, max_table_size=1000000,
+                 config=None):
+        """Initializes OthelloSolver with its limits and empty stats."""
+        super().__init__(max_empty, node_limit, config)
+        self.max_table_size = max_table_size
+        self.table = {}
+
+    def solve_position(self, game):
+        """Searches a position to the end of the game.
+
+        Args:
+            game: An OthelloGame which is not over.
+
+        Returns:
+            A tuple of the value of the position for the player to move and
+            the action id of a best move.
+        """
+        board = game.clone()
+        board.state = np.array(board.state)
+
+        empties = [(x, y) for x in range(board.row)
+                   for y in range(board.column) if board.state[x][y] == 0]
+        empties.sort(key=lambda square: self.square_order(board, square))
+
+        best_value = -2
+        best_square = None
+        alpha = -1
+
+        for x, y, d in self.get_moves(board, empties, board.current_player):
+            value = -self.play(board, empties, (x, y, d), -1, -alpha)
+
+            if value > best_value:
+                best_value = value
+                best_square = (x, y)
+                alpha = max(alpha, value)
+
+                if value == 1:
+                    break
+
+        return best_value, self.get_action_id(game, *best_square)
+
+    def square_order(self, board, square):
+        """Returns the search priority of a square, lowest first.
+
+        Args:
+            board: An OthelloGame.
+            square: A tuple(row, column).
+
+        Returns:
+            An integer priority.
+        """
+        x, y = square
+        last_row = board.row - 1
+        last_column = board.column - 1
+        edge_x = x in (0, last_row)
+        edge_y = y in (0, last_column)
+
+        if edge_x and edge_y:
+            return 0
+
+        # Squares next to a corner give the corner away.
+        near_x = x in (1, last_row - 1)
+        near_y = y in (1, last_column - 1)
+        if (near_x or edge_x) and (near_y or edge_y):
+            return 3 if near_x and near_y else 2
+
+        return 1
+
+    def get_moves(self, board, empties, player):
+        """Returns the valid moves of a player on the empty squares.
+
+        Args:
+            board: An OthelloGame.
+            empties: A list of the empty squares in search order.
+            player: An integer representing the player to move.
+
+        Returns:
+            A list of moves in the form of (row, column, direction).
+        """
+        moves = []
+        for x, y in empties:
+            d = board.find_direction(x, y, player)
+            if d is not None:
+                moves.append((x, y, d))
+        return moves
+
+    def can_move(self, board, empties, player):
+        """Checks if a player has a valid move on the empty squares.
+
+        Args:
+            board: An OthelloGame.
+            empties: A list of the empty squares.
+            player: An integer representing the player to check.
+
+        Returns:
+            A boolean value indicating if the player can move.
+        """
+        for x, y in empties:
+            if board.find_direction(x, y, player) is not None:
+                return True
+        return False
+
+    def play(self, board, empties, move, alpha, beta):
+        """Plays a move, searches the position and takes the move back.
+
+        Args:
+            board: An OthelloGame.
+            empties: A list of the empty squares in search order.
+            move: A tuple in the form of (row, column, direction).
+            alpha: The lower bound of the search window.
+            beta: The upper bound of the search window.
+
+        Returns:
+            The value of the new position for the player to move.
+        """
+        state = board.state.copy()
+        player = board.current_player
+
+        board.play_action((1,) + move)
+        square = move[:2]
+        value = self.negamax(board, [e for e in empties if e != square],
+                             alpha, beta)
+
+        board.state = state
+        board.current_player = player
+        return value
+
+    def negamax(self, board, empties, alpha, beta):
+        """Negamax search with alpha-beta pruning.
+
+        Args:
+            board: An OthelloGame.
+            empties: A list of the empty squares in search order.
+            alpha: The lower bound of the search window.
+            beta: The upper bound of the search window.
+
+        Returns:
+            The value of the position for the player to move.
+        """
+        self.count_node()
+
+        player = board.current_player
+        moves = self.get_moves(board, empties, player)
+
+        # The game ends as soon as either player is out of moves.
+        if not moves or not self.can_move(board, empties, -player):
+            difference = np.count_nonzero(board.state == player) - \
+                np.count_nonzero(board.state == -player)
+            return int(np.sign(difference))
+
+        key = (board.state.tobytes(), player)
+        entry = self.table.get(key)
+        if entry is not None:
+            flag, value = entry
+            if flag == self.EXACT:
+                return value
+            if flag == self.LOWER:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+            if alpha >= beta:
+                return value
+
+        alpha_orig = alpha
+        best_value = -1
+
+        for move in moves:
+            value = -self.play(board, empties, move, -beta, -alpha)
+
+            if value > best_value:
+                best_value = value
+                alpha = max(alpha, value)
+                if alpha >= beta:
+                    break
+
+        if len(self.table) >= self.max_table_size:
+            self.table = {}
+
+        if best_value <= alpha_orig:
+            flag = self.UPPER
+        elif best_value >= beta:
+            flag = self.LOWER
+        else:
+            flag = self.EXACT
+        self.table[key] = (flag, best_value)
+
+        return best_value
@@ -0,0 +1,80 @@
+# MIT License
+#
+# Copyright (c) 2018 Blanyal D'Souza
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+"""Class to run unit tests for the OthelloSolver class."""
+from unittest import TestCase
+
+import numpy as np
+
+from othello.othello_game import OthelloGame
+from othello.othello_solver import OthelloSolver
+
+
+class TestOthelloSolver(TestCase):
+    """Class to run unit tests for the OthelloSolver class."""
+
+    def test_solve1(self):
+        """Test case for the solve function.
+
+        Test for a win by taking the last square.
+        """
+        game = OthelloGame()
+        game.current_player = 1
+        game.state = np.array([[0, -1, 1, 1, 1, 1],
+                               [1, 1, 1, 1, 1, 1],
+                               [1, 1, 1, 1, 1, 1],
+                               [-1, -1, -1, -1, -1, -1],
+                               [-1, -1, -1, -1, -1, -1],
+                               [-1, -1, -1, -1, -1, 1]])
+        solver = OthelloSolver(max_empty=4)
+        value, action_id = solver.solve(game)
+
+        self.assertEqual(value, 1)
+        self.assertEqual(action_id, 0)
+
+    def test_solve2(self):
+        """Test case for the solve function.
+
+        Test for a solve which agrees with playing the best move.
+        """
+        game = OthelloGame()
+        game.current_player = -1
+        game.state = np.array([[0, 0, 1, 1, 1, 1],
+                               [0, 1, 1, -1, 1, 1],
+                               [1, 1, -1, -1, 1, 1],
+                               [-1, -1, -1, -1, 1, 1],
+                               [-1, -1, -1, 1, 1, 1],
+                               [-1, -1, -1, -1, 1, 1]])
+        solver = OthelloSolver(max_empty=4)
+        value, action_id = solver.solve(game)
+        game.play_action(game.get_valid_moves(game.current_player)[action_id])
+
+        game_over, result = game.check_game_over(game.current_player)
+        while not game_over:
+            value_after, action_id = solver.solve(game)
+            self.assertEqual(value_after, -value)
+            value = value_after
+            game.play_action(
+                game.get_valid_moves(game.current_player)[action_id])
+            game_over, result = game.check_game_over(game.current_player)
+
+        self.assertEqual(result, -value)
@@ -0,0 +1,184 @@
+# MIT License
+#
+# Copyright (c) 2018 Blanyal D'Souza
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+"""Classes for fixed opponents used to measure the networks."""
+import numpy as np
+
+from mcts import TreeNode
+
+
+class RandomPlayer(object):
+    """Plays a uniformly random valid move.
+
+    Like every player here it has the interface of a MonteCarloTreeSearch,
+    so it can take the place of one in Evaluate.
+
+    Attributes:
+        value: The value of the last searched position. Always 0.
+    """
+
+    def __init__(self):
+        """Initializes RandomPlayer."""
+        self.value = 0
+
+    def search(self, game, node, temperature, num_sims=None):
+        """Returns a random valid move at a given state.
+
+        Args:
+            game: An object containing the game state.
+            node: A TreeNode representing the board state. Not used.
+            temperature: A float to control the level of exploration. Not used.
+            num_sims: An integer number of simulations. Not used.
+
+        Returns:
+            A child node representing the move to play at this state.
+        """
+        valid_moves = [move for move in
+                       game.get_valid_moves(game.current_player)
+                       if move[0] == 1]
+        move = valid_moves[np.random.randint(len(valid_moves))]
+        return TreeNode(action=tuple(move.tolist()))
+
+    def root_value(self):
+        """Returns the value of the last searched position.
+
+        Returns:
+            A float value for the player to move.
+        """
+        return self.value
+
+    def reset_budget(self):
+        """Does nothing, the player has no simulation budget."""
+        pass
+
+    def set_root(self, node):
+        """Does nothing, the player keeps no tree.
+
+        Args:
+            node: A TreeNode which becomes the new root.
+        """
+        pass
+
+
+class AlphaBetaPlayer(RandomPlayer):
+    """Plays the best move of a depth limited alpha-beta search.
+
+    Only won and lost positions are scored, everything else within the
+    depth counts as a draw, so the player finds short wins and avoids short
+    losses. Equal moves are picked at random.
+
+    Attributes:
+        depth: An integer number of plies searched.
+        nodes: An integer number of positions searched so far.
+    """
+
+    def __init__(self, depth=4):
+        """Initializes AlphaBetaPlayer with its search depth."""
+        super().__init__()
+        self.depth = depth
+        self.nodes = 0
+
+    def search(self, game, node, temperature, num_sims=None):
+        """Returns the best move found by the search at a given state.
+
+        Args:
+            game: An object containing the game state.
+            node: A TreeNode representing the board state. Not used.
+            temperature: A float to control the level of exploration. Not used.
+            num_sims: An integer number of simulations. Not used.
+
+        Returns:
+            A child node representing the best move to play at this state.
+        """
+        moves = self.get_moves(game)
+        best_value = -2
+        best_moves = []
+
+        for move in moves:
+            child = game.clone()
+            child.play_action(move)
+            value = -self.negamax(child, move, self.depth - 1, -1, 1)
+
+            if value > best_value:
+                best_value = value
+                best_moves = [move]
+            elif value == best_value:
+                best_moves.append(move)
+
+        self.value = best_value
+        move = best_moves[np.random.randint(len(best_moves))]
+        return TreeNode(action=move)
+
+    def get_moves(self, game):
+        """Returns the valid moves of the player to move in random order.
+
+        Args:
+            game: An object containing the game state.
+
+        Returns:
+            A list of move tuples.
+        """
+        moves = [tuple(move.tolist()) for move in
+                 game.get_valid_moves(game.current_player) if move[0] == 1]
+        return [moves[idx] for idx in np.random.permutation(len(moves))]
+
+    def negamax(self, game, last_move, depth, alpha, beta):
+        """Negamax search with alpha-beta pruning.
+
+        Args:
+            game: An object containing the game state.
+            last_move: The move which led to this state.
+            depth: An integer number of plies left to search.
+            alpha: The lower bound of the search window.
+            beta: The upper bound of the search window.
+
+        Returns:
+            The value of the position for the player to move.
+        """
+        self.nodes += 1
+
+        valid_moves = game.get_valid_moves(game.current_player)
+        game_over, value = game.check_game_over(game.current_player,
+                                                valid_moves, last_move)
+
+        if game_over:
+            return value
+        if depth == 0:
+            return 0
+
+        best_value = -1
+
+        for move in valid_moves:
+            if move[0] != 1:
+                continue
+
+            move = tuple(move.tolist())
+            child = game.clone()
+            child.play_action(move)
+            value = -self.negamax(child, move, depth - 1, -beta, -alpha)
+
+            best_value = max(best_value, value)
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+
+        return best_value
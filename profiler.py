@@ -0,0 +1,199 @@
+# MIT License
+#
+# Copyright (c) 2018 Blanyal D'Souza
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+"""Class to time the phases of search, self-play, training and evaluation."""
+import cProfile
+import json
+import os
+import time
+from collections import defaultdict
+
+from config import CFG
+
+
+class NullTimer(object):
+    """Timer used while profiling is off. Entering and leaving does nothing."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+# Shared by every disabled timer call, so profiling off allocates nothing.
+NULL_TIMER = NullTimer()
+
+
+class Timer(object):
+    """Adds the time spent inside a with block to a phase of a Profiler.
+
+    Attributes:
+        profiler: The Profiler to add the time to.
+        phase: A string name of the phase.
+        start: A float start time of the block.
+    """
+
+    def __init__(self, profiler, phase):
+        """Initializes Timer with the profiler and the phase name."""
+        self.profiler = profiler
+        self.phase = phase
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.profiler.add_time(self.phase, time.perf_counter() - self.start)
+        return False
+
+
+class Profiler(object):
+    """Aggregates phase times and counters per training iteration.
+
+    Each iteration is appended to a JSON lines file with the seconds and
+    calls of every phase and the counters. One iteration can also be run
+    under cProfile, whose stats are dumped next to the models.
+
+    Attributes:
+        enabled: A boolean value indicating if phases are timed.
+        file_path: A string path of the JSON lines file.
+        iteration: An integer number of the current iteration.
+        start: A float start time of the current iteration.
+        times: A dictionary which maps phases to their total seconds.
+        calls: A dictionary which maps phases to their number of timings.
+        counts: A dictionary which maps counter names to their values.
+        cprofile: A cProfile.Profile of the current iteration, or None.
+        config: The Config of the current iteration.
+    """
+
+    def __init__(self, file_path=None):
+        """Initializes Profiler with profiling switched off."""
+        self.enabled = False
+        self.file_path = file_path
+        self.iteration = 0
+        self.start = 0.0
+        self.times = defaultdict(float)
+        self.calls = defaultdict(int)
+        self.counts = defaultdict(int)
+        self.cprofile = None
+        self.config = CFG
+
+    def timer(self, phase):
+        """Returns a context manager which times a phase.
+
+        Args:
+            phase: A string name of the phase.
+
+        Returns:
+            A Timer, or the shared NULL_TIMER if profiling is off.
+        """
+        if not self.enabled:
+            return NULL_TIMER
+        return Timer(self, phase)
+
+    def add_time(self, phase, seconds):
+        """Adds one timing of a phase.
+
+        Args:
+            phase: A string name of the phase.
+            seconds: A float number of seconds.
+        """
+        self.times[phase] += seconds
+        self.calls[phase] += 1
+
+    def count(self, name, value=1):
+        """Increments a counter if profiling is on.
+
+        Args:
+            name: A string name of the counter.
+            value: An integer amount to add.
+        """
+        if self.enabled:
+            self.counts[name] += value
+
+    def start_iteration(self, iteration, config=None):
+        """Clears the statistics and starts profiling an iteration.
+
+        Profiling is switched on by the profile option of the config, and
+        cProfile runs during iteration profile_iteration.
+
+        Args:
+            iteration: An integer number of the iteration, starting at 1.
+            config: The Config of the run. Defaults to CFG.
+        """
+        self.config = config = CFG if config is None else config
+        self.enabled = bool(config.profile) or \
+            config.profile_iteration == iteration
+        self.iteration = iteration
+        self.times.clear()
+        self.calls.clear()
+        self.counts.clear()
+        self.start = time.perf_counter()
+
+        if config.profile_iteration == iteration:
+            self.cprofile = cProfile.Profile()
+            self.cprofile.enable()
+
+    def end_iteration(self):
+        """Writes the statistics of the current iteration.
+
+        Returns:
+            A dictionary with the statistics, or None if profiling is off.
+        """
+        if not self.enabled:
+            return None
+
+        record = {"iteration": self.iteration,
+                  "seconds": time.perf_counter() - self.start,
+                  "phases": {phase: {"seconds": self.times[phase],
+                                     "calls": self.calls[phase]}
+                             for phase in sorted(self.times)},
+                  "counts": dict(sorted(self.counts.items()))}
+
+        model_directory = self.config.model_directory
+
+        # Create directory if it doesn't exist.
+        os.makedirs(model_directory, exist_ok=True)
+
+        file_path = self.file_path
+        if file_path is None:
+            file_path = model_directory + self.config.profile_file
+
+        with open(file_path, 'a') as profile_file:
+            profile_file.write(json.dumps(record) + "\n")
+
+        if self.cprofile is not None:
+            self.cprofile.disable()
+            stats_path = model_directory + \
+                "profile_iteration_%d.prof" % self.iteration
+            self.cprofile.dump_stats(stats_path)
+            print("cProfile stats saved at", stats_path)
+            self.cprofile = None
+
+        self.enabled = False
+        return record
+
+
+# Profiler shared by the search, the network, training and evaluation.
+PROFILER = Profiler()
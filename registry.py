@@ -0,0 +1,154 @@
+# MIT License
+#
+# Copyright (c) 2018 Blanyal D'Souza
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+"""Registry of games, network backends and runners, imported lazily.
+
+Entries name their classes as "module:Class" strings, so looking them up
+imports only the modules of the chosen game, backend and runner. In
+particular TensorFlow is only imported by the "tensorflow" backend.
+"""
+import importlib
+
+from config import CFG
+
+# Games by the number in CFG.game. "options" maps keyword arguments of the
+# game class to the CFG attributes they are read from.
+GAMES = {
+    0: {"name": "tic_tac_toe",
+        "game": "tic_tac_toe.tic_tac_toe_game:TicTacToeGame",
+        "solver": "tic_tac_toe.tic_tac_toe_tablebase:TicTacToeTablebase",
+        "options": {}},
+    1: {"name": "othello",
+        "game": "othello.othello_game:OthelloGame",
+        "solver": "othello.othello_solver:OthelloSolver",
+        "options": {}},
+    2: {"name": "connect_four",
+        "game": "connect_four.connect_four_game:ConnectFourGame",
+        "solver": "connect_four.connect_four_solver:ConnectFourSolver",
+        "options": {"column_actions": "column_actions"}},
+}
+
+# Network classes by the name in CFG.backend. Only "tensorflow" can train.
+BACKENDS = {
+    "tensorflow": "neural_net:NeuralNetworkWrapper",
+    "numpy": "numpy_net:NumpyNetwork",
+}
+
+# Classes which run the program, by mode.
+RUNNERS = {
+    "train": "train:Train",
+    "human_play": "human_play:HumanPlay",
+}
+
+
+def register_game(number, name, game, solver=None, options=None):
+    """Adds a game to the registry.
+
+    Args:
+        number: An integer selecting the game with CFG.game.
+        name: A string name of the game.
+        game: A "module:Class" string of the Game subclass.
+        solver: A "module:Class" string of its endgame solver, or None.
+        options: A dictionary which maps keyword arguments of the game class
+            to CFG attribute names.
+    """
+    GAMES[number] = {"name": name, "game": game, "solver": solver,
+                     "options": options or {}}
+
+
+def load(path):
+    """Imports a class.
+
+    Args:
+        path: A "module:Class" string.
+
+    Returns:
+        The class.
+    """
+    module_name, class_name = path.split(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def make_game(number=None, config=None):
+    """Creates a game in its starting position.
+
+    Args:
+        number: An integer key of GAMES. Defaults to the game of the config.
+        config: The Config the game options are read from. Defaults to CFG.
+
+    Returns:
+        An object containing the game state.
+    """
+    config = CFG if config is None else config
+    entry = GAMES[config.game if number is None else number]
+    options = {argument: getattr(config, name)
+               for argument, name in entry["options"].items()}
+    return load(entry["game"])(**options)
+
+
+def make_solver(number=None, config=None, **arguments):
+    """Creates the endgame solver of a game.
+
+    Args:
+        number: An integer key of GAMES. Defaults to the game of the config.
+        config: The Config choosing the game, which the solver reads its
+            limits and files from. Defaults to CFG.
+        arguments: Keyword arguments of the solver class, which override
+            the config.
+
+    Returns:
+        A Solver, or None if the game has none.
+    """
+    config = CFG if config is None else config
+    entry = GAMES[config.game if number is None else number]
+    if entry["solver"] is None:
+        return None
+    return load(entry["solver"])(config=config, **arguments)
+
+
+def make_network(game, backend=None, config=None):
+    """Creates a network for a game.
+
+    Args:
+        game: An object containing the game state.
+        backend: A string key of BACKENDS. Defaults to the backend of the
+            config.
+        config: The Config of the network. Defaults to CFG.
+
+    Returns:
+        An object containing the neural network.
+    """
+    config = CFG if config is None else config
+    backend = config.backend if backend is None else backend
+    return load(BACKENDS[backend])(game, config)
+
+
+def get_runner(mode):
+    """Returns the class which runs a mode.
+
+    Args:
+        mode: A string key of RUNNERS.
+
+    Returns:
+        The runner class.
+    """
+    return load(RUNNERS[mode])
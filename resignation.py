@@ -0,0 +1,145 @@
+# MIT License
+#
+# Copyright (c) 2018 Blanyal D'Souza
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+"""Class to decide when to resign and to calibrate the resign threshold."""
+import numpy as np
+
+from config import CFG
+
+
+class Resignation(object):
+    """Resigns hopeless games and keeps the false resign rate on target.
+
+    A fraction of the self-play games is played to the end with resignation
+    disabled. The lowest root value each player saw in those games, together
+    with whether that player went on to lose, tells how often a resignation
+    at the current threshold would have been wrong. The threshold is then
+    moved to the highest value which keeps that rate under the target.
+
+    Attributes:
+        threshold: A float root value below which the player to move resigns.
+        disable_fraction: A float fraction of games played without resigning.
+        target_rate: A float upper bound for the false resign rate.
+        min_samples: An integer number of samples needed before calibrating.
+        samples: A list of (lowest value, lost) pairs from no-resign games.
+        lowest_values: A dictionary with the lowest root value per player in
+            the current game.
+        enabled: A boolean value indicating if the current game may resign.
+    """
+
+    def __init__(self, threshold=None, disable_fraction=None, target_rate=None,
+                 min_samples=10):
+        """Initializes Resignation with the resign configuration."""
+        self.threshold = CFG.resign_threshold if threshold is None \
+            else threshold
+        self.disable_fraction = CFG.resign_disable_fraction \
+            if disable_fraction is None else disable_fraction
+        self.target_rate = CFG.resign_false_positive_rate \
+            if target_rate is None else target_rate
+        self.min_samples = min_samples
+        self.samples = []
+        self.lowest_values = {}
+        self.enabled = True
+
+    def start_game(self):
+        """Starts tracking a new game.
+
+        Returns:
+            A boolean value indicating if the game may be resigned.
+        """
+        self.lowest_values = {}
+        self.enabled = np.random.rand() >= self.disable_fraction
+        return self.enabled
+
+    def check(self, player, value):
+        """Records a root value and checks if the player should resign.
+
+        Args:
+            player: An integer representing the player to move.
+            value: A float root value from the perspective of the player.
+
+        Returns:
+            A boolean value indicating if the player resigns.
+        """
+        self.lowest_values[player] = min(value,
+                                         self.lowest_values.get(player, 1))
+
+        return self.enabled and value < self.threshold
+
+    def end_game(self, current_player, value):
+        """Records the outcome of a game played without resigning.
+
+        Args:
+            current_player: An integer representing the player to move at the
+                end of the game.
+            value: An integer game result for the current player.
+                (win: 1, loss: -1, draw: 0)
+        """
+        if self.enabled:
+            return
+
+        for player, lowest_value in self.lowest_values.items():
+            player_value = value if player == current_player else -value
+            self.samples.append((lowest_value, player_value == -1))
+
+        self.calibrate()
+
+    def false_resign_rate(self):
+        """Computes the false resign rate at the current threshold.
+
+        Returns:
+            A float fraction of would-be resignations by players who did not
+            go on to lose, or None if no player would have resigned.
+        """
+        resigned = [lost for lowest_value, lost in self.samples
+                    if lowest_value < self.threshold]
+
+        if not resigned:
+            return None
+
+        return resigned.count(False) / len(resigned)
+
+    def calibrate(self):
+        """Moves the threshold as high as the target false resign rate allows.
+
+        Candidate thresholds sit just above each observed lowest value. The
+        threshold never goes above a root value of 0.
+        """
+        if len(self.samples) < self.min_samples:
+            return
+
+        samples = sorted(self.samples)
+        threshold = samples[0][0]
+        false_resigns = 0
+
+        for idx, (lowest_value, lost) in enumerate(samples):
+            if not lost:
+                false_resigns += 1
+
+            # Everything up to and including this sample would resign.
+            if false_resigns / (idx + 1) <= self.target_rate:
+                if idx + 1 < len(samples):
+                    threshold = samples[idx + 1][0]
+                else:
+                    threshold = 0
+
+        self.threshold = min(threshold, 0)
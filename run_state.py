@@ -0,0 +1,155 @@
+# MIT License
+#
+# Copyright (c) 2018 Blanyal D'Souza
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+"""Class to save and restore the progress of a training run."""
+import os
+import pickle
+import threading
+
+from config import CFG
+
+
+class RunState(object):
+    """Writes run-state checkpoints atomically in a background thread.
+
+    Each checkpoint is pickled to a temporary file which then replaces the
+    previous checkpoint, so a crash leaves either the old or the new
+    checkpoint on disk, never a partial one. Writes run in a background
+    thread so self-play goes on meanwhile. Only one write is in flight at a
+    time; a new checkpoint waits for the previous write to finish.
+
+    Training examples are not part of the checkpoint. Only the examples
+    added since the last checkpoint are appended to a separate examples
+    file, so every example is written once, and the checkpoint records how
+    many examples of the file belong to it.
+
+    Attributes:
+        file_path: A string path of the checkpoint file.
+        examples_path: A string path of the examples file.
+        num_examples: An integer number of examples in the examples file.
+        thread: The threading.Thread of the write in flight, or None.
+    """
+
+    def __init__(self, file_path=None):
+        """Initializes RunState with the checkpoint file path."""
+        if file_path is None:
+            file_path = CFG.model_directory + "run_state.pkl"
+
+        self.file_path = file_path
+        self.examples_path = file_path + ".examples"
+        self.num_examples = 0
+        self.thread = None
+
+    def save(self, state, training_data=None):
+        """Starts writing a checkpoint.
+
+        Args:
+            state: A dictionary with the run state. It must not be changed
+                afterwards, since it is pickled in the background.
+            training_data: A list of training examples which only grows
+                between checkpoints, or None if the checkpoint has none. Only
+                its examples since the last checkpoint are written.
+        """
+        self.wait()
+
+        examples = None
+        if training_data is not None:
+            examples = training_data[self.num_examples:]
+            self.num_examples = len(training_data)
+        else:
+            self.num_examples = 0
+
+        state = dict(state, num_examples=self.num_examples)
+
+        self.thread = threading.Thread(target=self.write,
+                                       args=(state, examples))
+        self.thread.start()
+
+    def write(self, state, examples=None):
+        """Appends new examples and writes a checkpoint atomically.
+
+        Args:
+            state: A dictionary with the run state.
+            examples: A list of examples to append before the checkpoint is
+                written, or None if the checkpoint has no examples.
+        """
+        directory = os.path.dirname(self.file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # The examples go first, so a checkpoint never counts missing ones.
+        if examples:
+            with open(self.examples_path, 'ab') as examples_file:
+                pickle.dump(examples, examples_file,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+                examples_file.flush()
+                os.fsync(examples_file.fileno())
+
+        temp_path = self.file_path + ".tmp"
+        with open(temp_path, 'wb') as state_file:
+            pickle.dump(state, state_file, protocol=pickle.HIGHEST_PROTOCOL)
+            state_file.flush()
+            os.fsync(state_file.fileno())
+
+        os.replace(temp_path, self.file_path)
+
+        # The old examples are only dropped once no checkpoint needs them.
+        if examples is None and os.path.exists(self.examples_path):
+            os.remove(self.examples_path)
+
+    def wait(self):
+        """Waits for the write in flight to finish."""
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def load(self):
+        """Reads the last checkpoint with its training examples.
+
+        Examples appended after the checkpoint by a write which didn't
+        finish are removed from the examples file.
+
+        Returns:
+            A dictionary with the run state and its "training_data", or None
+            if there is none.
+        """
+        self.wait()
+
+        if not os.path.exists(self.file_path):
+            return None
+
+        with open(self.file_path, 'rb') as state_file:
+            state = pickle.load(state_file)
+
+        training_data = []
+
+        if state["num_examples"] > 0:
+            with open(self.examples_path, 'rb+') as examples_file:
+                while len(training_data) < state["num_examples"]:
+                    training_data.extend(pickle.load(examples_file))
+                examples_file.truncate(examples_file.tell())
+        elif os.path.exists(self.examples_path):
+            os.remove(self.examples_path)
+
+        self.num_examples = len(training_data)
+        state["training_data"] = training_data
+        return state
@@ -0,0 +1,209 @@
+# MIT License
+#
+# Copyright (c) 2018 Blanyal D'Souza
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+"""Base Solver Class."""
+import numpy as np
+
+from config import CFG
+from mcts import TreeNode
+
+
+class SearchAborted(Exception):
+    """Raised when a solve runs past its node limit."""
+
+
+class Solver(object):
+    """Solves positions near the end of a game exactly.
+
+    Subclasses implement solve_position for their game and call count_node
+    for every position they search.
+
+    Attributes:
+        max_empty: An integer number of empty squares at or below which
+            positions are solved.
+        node_limit: An integer maximum number of nodes searched per solve.
+            A solve which runs past it is abandoned.
+        calls: An integer number of solves started.
+        solved: An integer number of solves which finished.
+        aborted: An integer number of solves abandoned at the node limit.
+        nodes: An integer number of nodes searched by all solves.
+        search_nodes: An integer number of nodes searched by the current solve.
+        unsolved: A set with the Zobrist keys of the positions abandoned at
+            the node limit, which are not searched again.
+    """
+
+    def __init__(self, max_empty=None, node_limit=None, config=None):
+        """Initializes Solver with its limits and empty stats.
+
+        Limits which aren't given are read from the config, which defaults
+        to CFG.
+        """
+        config = CFG if config is None else config
+        if max_empty is None:
+            max_empty = config.solver_empty_squares
+        if node_limit is None:
+            node_limit = config.solver_node_limit
+
+        self.max_empty = max_empty
+        self.node_limit = node_limit
+        self.calls = 0
+        self.solved = 0
+        self.aborted = 0
+        self.nodes = 0
+        self.search_nodes = 0
+        self.unsolved = set()
+
+    def solve(self, game):
+        """Solves a position if it has few enough empty squares.
+
+        Args:
+            game: An object containing a game state which is not over.
+
+        Returns:
+            A tuple of the value of the position for the player to move
+            (win: 1, loss: -1, draw: 0) and the action id of a best move, or
+            None if the position is not solved.
+        """
+        num_empty = int(np.count_nonzero(np.asarray(game.state) == 0))
+
+        if num_empty == 0 or num_empty > self.max_empty:
+            return None
+
+        # A position which ran past the node limit would do so again.
+        key = game.get_key()
+        if key in self.unsolved:
+            return None
+
+        self.calls += 1
+        self.search_nodes = 0
+
+        try:
+            result = self.solve_position(game)
+        except SearchAborted:
+            self.aborted += 1
+            self.unsolved.add(key)
+            return None
+        finally:
+            self.nodes += self.search_nodes
+
+        self.solved += 1
+        return result
+
+    def solve_position(self, game):
+        """Searches a position to the end of the game.
+
+        Args:
+            game: An object containing a game state which is not over.
+
+        Returns:
+            A tuple of the value of the position for the player to move and
+            the action id of a best move.
+        """
+        pass
+
+    def count_node(self):
+        """Counts a searched node and stops the solve at the node limit."""
+        self.search_nodes += 1
+        if self.search_nodes > self.node_limit:
+            raise SearchAborted()
+
+    def get_action_id(self, game, x, y):
+        """Returns the action id of the valid move on a square.
+
+        Args:
+            game: An object containing the game state.
+            x: An integer for the row of the square.
+            y: An integer for the column of the square.
+
+        Returns:
+            An integer index into the valid moves of the player to move.
+        """
+        valid_moves = game.get_valid_moves(game.current_player)
+        for idx, move in enumerate(valid_moves):
+            if move[0] == 1 and move[1] == x and move[2] == y:
+                return idx
+        return None
+
+
+class PerfectPlayer(object):
+    """Plays the moves of a solver with the interface of a search.
+
+    It can take the place of a MonteCarloTreeSearch, for example as the
+    opponent in Evaluate.
+
+    Attributes:
+        solver: A Solver which can solve every position of the game.
+        value: The value of the last searched position for the player to move.
+    """
+
+    def __init__(self, solver):
+        """Initializes PerfectPlayer with its solver."""
+        self.solver = solver
+        self.value = 0
+
+    def search(self, game, node, temperature, num_sims=None):
+        """Returns the move of the solver at a given state.
+
+        Args:
+            game: An object containing the game state.
+            node: A TreeNode representing the board state. Not used.
+            temperature: A float to control the level of exploration. Not used.
+            num_sims: An integer number of simulations. Not used.
+
+        Returns:
+            A child node representing the best move to play at this state.
+
+        Raises:
+            ValueError: If the solver can't solve the position, because it
+                has more than max_empty empty squares, no empty square or
+                needs more than node_limit nodes.
+        """
+        result = self.solver.solve(game)
+        if result is None:
+            raise ValueError("%s can't solve this position. A PerfectPlayer "
+                             "needs a solver without limits, see max_empty "
+                             "and node_limit." % type(self.solver).__name__)
+
+        self.value, action_id = result
+
+        valid_moves = game.get_valid_moves(game.current_player)
+        return TreeNode(action=tuple(valid_moves[action_id].tolist()))
+
+    def root_value(self):
+        """Returns the value of the last searched position.
+
+        Returns:
+            The exact value for the player to move.
+        """
+        return self.value
+
+    def reset_budget(self):
+        """Does nothing, the solver has no simulation budget."""
+        pass
+
+    def set_root(self, node):
+        """Does nothing, the solver keeps no tree.
+
+        Args:
+            node: A TreeNode which becomes the new root.
+        """
+        pass
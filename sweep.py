@@ -0,0 +1,145 @@
+# MIT License
+#
+# Copyright (c) 2018 Blanyal D'Souza
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+"""Runs training with many configurations concurrently on a process pool.
+
+The configurations are the base options combined with every combination
+of the grid values, read from a JSON file like:
+
+    {"base": {"game": 0, "num_iterations": 5},
+     "grid": {"c_puct": [1, 2, 4], "num_mcts_sims": [25, 50]}}
+
+Run from the repository root with:
+
+    python sweep.py --sweep sweep.json --workers 4 --output sweep.jsonl
+
+Every run trains in its own model directory below the base one, and
+builds its own game and endgame solver, because solvers keep statistics
+and tables between solves. Profiling and metrics are process wide and stay
+off in the workers.
+"""
+import argparse
+import itertools
+import json
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import registry
+from config import Config
+
+
+def expand_grid(base, grid):
+    """Combines the base options with every combination of the grid values.
+
+    Args:
+        base: A dictionary with the options shared by every configuration.
+        grid: A dictionary which maps options to a list of values.
+
+    Returns:
+        A list with a dictionary of options per configuration.
+    """
+    names = list(grid)
+    configs = []
+
+    for values in itertools.product(*(grid[name] for name in names)):
+        options = dict(base)
+        options.update(zip(names, values))
+        configs.append(options)
+
+    return configs
+
+
+def run_config(index, options):
+    """Trains a network with one configuration.
+
+    Args:
+        index: An integer number of the configuration.
+        options: A dictionary with the options of the configuration.
+
+    Returns:
+        A dictionary with the options, the evaluation history and the
+        seconds the run took.
+    """
+    config = Config(**options)
+    start = time.time()
+
+    game = registry.make_game(config=config)
+    solver = None
+    if config.solver_empty_squares > 0:
+        solver = registry.make_solver(config=config)
+
+    net = registry.make_network(game, "tensorflow", config)
+    train = registry.get_runner("train")(game, net, solver, config=config)
+    history = train.start()
+
+    return {"index": index, "options": options, "history": history,
+            "seconds": time.time() - start}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sweep", help="JSON file with the base options "
+                                        "and the grid.",
+                        required=True)
+    parser.add_argument("--workers", help="Number of runs in parallel.",
+                        type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--output", help="JSON lines file for the results.",
+                        default="sweep.jsonl")
+    arguments = parser.parse_args()
+
+    with open(arguments.sweep) as sweep_file:
+        sweep = json.load(sweep_file)
+
+    base = sweep.get("base", {})
+    grid = sweep.get("grid", {})
+
+    base_config = Config(**base)
+    configs = expand_grid(base, grid)
+
+    # Every run gets its own models, ladder and run state.
+    for i, options in enumerate(configs):
+        if "model_directory" not in grid:
+            options["model_directory"] = "%ssweep_%d/" % (
+                base_config.model_directory, i)
+        Config(**options)  # Fail on unknown options before any run starts.
+
+    print("Running", len(configs), "configurations on", arguments.workers,
+          "workers.")
+
+    # TF sessions don't survive a fork, so the workers are spawned.
+    with ProcessPoolExecutor(arguments.workers,
+                             multiprocessing.get_context("spawn")) as executor:
+        futures = [executor.submit(run_config, i, options)
+                   for i, options in enumerate(configs)]
+
+        with open(arguments.output, "w") as output_file:
+            for future in as_completed(futures):
+                result = future.result()
+                output_file.write(json.dumps(result) + "\n")
+                output_file.flush()
+
+                accepted = sum(entry["accepted"]
+                               for entry in result["history"])
+                print("Configuration", result["index"], "finished in",
+                      round(result["seconds"]), "seconds with", accepted,
+                      "accepted networks.")
@@ -0,0 +1,80 @@
+# MIT License
+#
+# Copyright (c) 2018 Blanyal D'Souza
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+"""Class to run unit tests for the EloLadder class."""
+import os
+import tempfile
+from unittest import TestCase
+
+from ladder import EloLadder
+
+
+class TestEloLadder(TestCase):
+    """Class to run unit tests for the EloLadder class."""
+
+    def setUp(self):
+        """Creates a ladder file in a temporary directory."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.directory.name, "ladder.json")
+
+    def tearDown(self):
+        """Removes the temporary directory."""
+        self.directory.cleanup()
+
+    def test_fit(self):
+        """Test case for the fit function.
+
+        Test for ratings ordered by strength and stored results.
+        """
+        ladder = EloLadder(self.file_path)
+        for name in ["a", "b", "c"]:
+            ladder.add_player(name)
+
+        ladder.record("b", "a", 8, 2, 0)
+        ladder.record("c", "b", 6, 2, 2)
+        ladder.fit()
+        ladder.save()
+
+        self.assertGreater(ladder.ratings["b"], ladder.ratings["a"])
+        self.assertGreater(ladder.ratings["c"], ladder.ratings["b"])
+        self.assertAlmostEqual(sum(ladder.ratings.values()), 0, places=6)
+
+        ladder = EloLadder(self.file_path)
+
+        self.assertEqual(list(ladder.ratings), ["a", "b", "c"])
+        self.assertEqual(ladder.results[("c", "b")], (6, 2, 2))
+
+    def test_schedule(self):
+        """Test case for the schedule function.
+
+        Test for the closest opponents which weren't played yet.
+        """
+        ladder = EloLadder(self.file_path)
+        ladder.add_player("a", 0)
+        ladder.add_player("b", 100)
+        ladder.add_player("c", 300)
+        ladder.add_player("d")
+        ladder.record("d", "c", 5, 5, 0)
+
+        self.assertEqual(ladder.ratings["d"], 300)
+        self.assertEqual(ladder.schedule("d", 1), ["b"])
+        self.assertEqual(ladder.schedule("d", 5), ["b", "a"])
@@ -0,0 +1,147 @@
+# MIT License
+#
+# Copyright (c) 2018 Blanyal D'Souza
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+"""Class to run unit tests for the Evaluate class."""
+from unittest import TestCase
+
+import numpy as np
+
+from config import CFG, Config
+from evaluate import Evaluate, SPRT, play_game
+from mcts import MonteCarloTreeSearch, TreeNode
+from tic_tac_toe.tic_tac_toe_game import TicTacToeGame
+
+
+class FirstMovePlayer(object):
+    """Stand-in for a search which always plays the first valid move.
+
+    In Tic Tac Toe this wins every game for the player who moves first.
+    """
+
+    def search(self, game, node, temperature, num_sims=None):
+        """Returns a child node with the first valid move."""
+        for move in game.get_valid_moves(game.current_player):
+            if move[0] == 1:
+                return TreeNode(action=tuple(move.tolist()))
+
+    def root_value(self):
+        """Returns a neutral root value."""
+        return 0
+
+    def reset_budget(self):
+        """Does nothing."""
+        pass
+
+    def set_root(self, node):
+        """Does nothing."""
+        pass
+
+
+class UniformNet(object):
+    """Network stand-in which returns uniform priors and a zero value."""
+
+    def __init__(self, game):
+        """Initializes UniformNet with the action size of the game."""
+        self.action_size = game.action_size
+
+    def predict(self, state):
+        """Returns a uniform probability vector and a zero value."""
+        return np.ones(self.action_size) / self.action_size, 0.0
+
+
+class RecordingSearch(MonteCarloTreeSearch):
+    """Search which records if its roots come from its own trees.
+
+    Attributes:
+        nodes: A list of every node the search's trees contained.
+        own_roots: A list with a boolean value per search indicating if the
+            root was new or a node of the search's own earlier trees.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Initializes RecordingSearch with an empty record."""
+        super().__init__(*args, **kwargs)
+        self.nodes = []
+        self.own_roots = []
+
+    def search(self, game, node, temperature, num_sims=None):
+        """Records where the root comes from and searches it."""
+        self.own_roots.append(node.Nsa == 0 or
+                              any(node is other for other in self.nodes))
+        best_child = super().search(game, node, temperature, num_sims)
+        self.nodes.extend(self.root.walk())
+        return best_child
+
+
+class TestEvaluate(TestCase):
+    """Class to run unit tests for the Evaluate class."""
+
+    def setUp(self):
+        """Saves the number of evaluation games."""
+        self.num_eval_games = CFG.num_eval_games
+
+    def tearDown(self):
+        """Restores the number of evaluation games."""
+        CFG.num_eval_games = self.num_eval_games
+
+    def test_evaluate(self):
+        """Test case for the evaluate function.
+
+        Test for colors alternating between games.
+        """
+        CFG.num_eval_games = 6
+        evaluator = Evaluate(current_mcts=FirstMovePlayer(),
+                             eval_mcts=FirstMovePlayer(),
+                             game=TicTacToeGame(), stop_early=False)
+
+        self.assertEqual(evaluator.evaluate(), (3, 3))
+        self.assertIsNone(evaluator.decision)
+
+    def test_play_game(self):
+        """Test case for the play_game function.
+
+        Test that each search keeps its own tree with its own config.
+        """
+        game = TicTacToeGame()
+        searches = [RecordingSearch(UniformNet(game), config=Config(
+            num_mcts_sims=num_sims)) for num_sims in (40, 5)]
+
+        play_game(searches[0], searches[1], game, game.current_player)
+
+        self.assertTrue(all(searches[0].own_roots + searches[1].own_roots))
+        self.assertEqual([max(mcts.sims_per_move) for mcts in searches],
+                         [40, 5])
+
+    def test_update(self):
+        """Test case for the SPRT update function.
+
+        Test for accepting after wins and rejecting after losses.
+        """
+        sprt = SPRT(win_rate=0.55, margin=0.15, alpha=0.05, beta=0.05)
+        decisions = [sprt.update(1) for i in range(6)]
+
+        self.assertEqual(decisions, [None] * 5 + [True])
+
+        sprt = SPRT(win_rate=0.55, margin=0.15, alpha=0.05, beta=0.05)
+        decisions = [sprt.update(value) for value in [0, -1, -1, -1, -1, -1]]
+
+        self.assertEqual(decisions, [None] * 5 + [False])
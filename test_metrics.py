@@ -0,0 +1,84 @@
+# MIT License
+#
+# Copyright (c) 2018 Blanyal D'Souza
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+"""Class to run unit tests for the Metrics and BufferedLog classes."""
+import os
+import tempfile
+from unittest import TestCase
+
+from metrics import Metrics, BufferedLog
+
+
+class TestMetrics(TestCase):
+    """Class to run unit tests for the Metrics and BufferedLog classes."""
+
+    def test_render(self):
+        """Test case for the render function.
+
+        Test for counters with labels and cumulative histogram buckets.
+        """
+        metrics = Metrics()
+        metrics.declare("games_total", "counter", "Games.")
+        metrics.declare("latency_seconds", "histogram", "Latency.", (0.1, 1.0))
+
+        metrics.inc("games_total", result="win")
+        self.assertNotIn("games_total{", metrics.render())
+
+        metrics.enabled = True
+        metrics.inc("games_total", result="win")
+        metrics.inc("games_total", 2, result="win")
+        metrics.observe("latency_seconds", 0.05)
+        metrics.observe("latency_seconds", 0.5)
+
+        lines = metrics.render().splitlines()
+
+        self.assertIn("# TYPE games_total counter", lines)
+        self.assertIn('games_total{result="win"} 3.0', lines)
+        self.assertIn('latency_seconds_bucket{le="0.1"} 1', lines)
+        self.assertIn('latency_seconds_bucket{le="1.0"} 2', lines)
+        self.assertIn('latency_seconds_bucket{le="+Inf"} 2', lines)
+        self.assertIn("latency_seconds_sum 0.55", lines)
+        self.assertIn("latency_seconds_count 2", lines)
+
+    def test_buffered_log(self):
+        """Test case for the write and flush functions of BufferedLog.
+
+        Test for lines written in batches and files rotated by size.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, "loss.txt")
+            log = BufferedLog(file_path, max_bytes=20, backups=2, capacity=2)
+
+            log.write("0.1|0.2")
+            self.assertFalse(os.path.exists(file_path))
+
+            # Each flush writes 16 bytes, so every flush after the first
+            # rotates the file.
+            for i in range(7):
+                log.write("0.1|0.2")
+            log.flush()
+
+            with open(file_path) as log_file:
+                self.assertEqual(log_file.read(), "0.1|0.2\n0.1|0.2\n")
+
+            self.assertTrue(os.path.exists(file_path + ".2"))
+            self.assertFalse(os.path.exists(file_path + ".3"))
@@ -0,0 +1,455 @@
+# MIT License
+#
+# Copyright (c) 2018 Blanyal D'Souza
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+"""Class to run unit tests for the MonteCarloTreeSearch class."""
+from unittest import TestCase
+
+import numpy as np
+
+from config import CFG, Config
+from mcts import MonteCarloTreeSearch, OpeningCache, TreeNode
+from connect_four.connect_four_game import ConnectFourGame
+from tic_tac_toe.tic_tac_toe_game import TicTacToeGame
+
+
+class UniformNet(object):
+    """Network stand-in which returns uniform priors and a zero value."""
+
+    def __init__(self, game):
+        """Initializes UniformNet with the action size of the game."""
+        self.action_size = game.action_size
+        self.calls = 0
+
+    def predict(self, state):
+        """Returns a uniform probability vector and a zero value."""
+        self.calls += 1
+        return np.ones(self.action_size) / self.action_size, 0.0
+
+
+class RandomNet(object):
+    """Network stand-in which returns random priors and values."""
+
+    def __init__(self, game, seed=0):
+        """Initializes RandomNet with the action size of the game."""
+        self.action_size = game.action_size
+        self.random = np.random.RandomState(seed)
+
+    def predict(self, state):
+        """Returns a random probability vector and a random value."""
+        psa_vector = self.random.rand(self.action_size)
+        return psa_vector / psa_vector.sum(), self.random.uniform(-1, 1)
+
+
+class PositionNet(object):
+    """Network stand-in whose output depends on the position only."""
+
+    def __init__(self, game):
+        """Initializes PositionNet with the action size of the game."""
+        self.action_size = game.action_size
+        self.calls = 0
+
+    def predict(self, state):
+        """Returns a probability vector and a value computed from the state."""
+        self.calls += 1
+        psa_vector = np.arange(1.0, self.action_size + 1) + \
+            np.abs(np.asarray(state)).flatten()[:self.action_size] * 5
+        return psa_vector / psa_vector.sum(), float(np.sum(state)) / 10
+
+
+class PhaseRecordingSearch(MonteCarloTreeSearch):
+    """Search which records the candidates of every Gumbel scoring."""
+
+    def __init__(self, *args, **kwargs):
+        """Initializes PhaseRecordingSearch with an empty record."""
+        super().__init__(*args, **kwargs)
+        self.num_candidates = []
+
+    def gumbel_scores(self, gumbel, logits, candidates):
+        """Records the number of candidates and scores them."""
+        self.num_candidates.append(len(candidates))
+        return super().gumbel_scores(gumbel, logits, candidates)
+
+
+class TestMonteCarloTreeSearch(TestCase):
+    """Class to run unit tests for the MonteCarloTreeSearch class."""
+
+    def setUp(self):
+        """Saves the configuration values changed by the tests."""
+        self.num_mcts_sims = CFG.num_mcts_sims
+
+    def tearDown(self):
+        """Restores the configuration values changed by the tests."""
+        CFG.num_mcts_sims = self.num_mcts_sims
+
+    def test_search1(self):
+        """Test case for the search function.
+
+        Test that a win in one move is proven and played.
+        """
+        CFG.num_mcts_sims = 50
+        game = TicTacToeGame()
+        game.state = np.array([[1, 1, 0],
+                               [-1, -1, 0],
+                               [0, 0, 0]])
+        net = UniformNet(game)
+        mcts = MonteCarloTreeSearch(net)
+
+        best_child = mcts.search(game, TreeNode(), CFG.temp_final)
+
+        self.assertEqual(tuple(best_child.action[1:]), (0, 2))
+        self.assertEqual(best_child.proven, 1)
+        self.assertEqual(mcts.root.proven, -1)
+
+    def test_search2(self):
+        """Test case for the search function.
+
+        Test that the network is not called again for solved positions.
+        """
+        CFG.num_mcts_sims = 400
+        game = TicTacToeGame()
+        game.state = np.array([[1, -1, 1],
+                               [1, -1, -1],
+                               [0, 0, 0]])
+        net = UniformNet(game)
+        mcts = MonteCarloTreeSearch(net)
+
+        mcts.search(game, TreeNode(), CFG.temp_final)
+
+        self.assertIsNotNone(mcts.root.proven)
+        self.assertLess(net.calls, 10)
+
+    def test_search3(self):
+        """Test case for the search function.
+
+        Test for searches with their own configs in one process.
+        """
+        game = TicTacToeGame()
+        searches = [MonteCarloTreeSearch(UniformNet(game), config=Config(
+            num_mcts_sims=num_sims, c_puct=c_puct))
+            for num_sims, c_puct in ((10, 0.5), (40, 4))]
+
+        for mcts in searches:
+            mcts.search(game, TreeNode(), mcts.config.temp_final)
+
+        self.assertEqual([mcts.sims_per_move for mcts in searches],
+                         [[10], [40]])
+        self.assertEqual(CFG.num_mcts_sims, self.num_mcts_sims)
+
+    def test_make_room(self):
+        """Test case for the make_room function.
+
+        Test that the node budget holds after every search of a game and that
+        the pruned trees still return valid moves.
+        """
+        np.random.seed(0)
+        game = TicTacToeGame()
+        mcts = MonteCarloTreeSearch(UniformNet(game), config=Config(
+            max_tree_nodes=12, num_mcts_sims=60))
+        node = TreeNode()
+        game_over = False
+
+        while not game_over:
+            best_child = mcts.search(game, node, mcts.config.temp_init)
+
+            self.assertLessEqual(mcts.node_count, 12)
+            self.assertEqual(mcts.node_count, mcts.root.count_nodes())
+            self.assertIn(best_child.action,
+                          [tuple(move) for move in
+                           game.get_valid_moves(game.current_player)
+                           if move[0] != 0])
+
+            game.play_action(best_child.action)
+            game_over, _ = game.check_game_over(game.current_player)
+            mcts.set_root(best_child)
+            node = best_child
+
+    def test_set_root(self):
+        """Test case for the set_root function.
+
+        Test that the subtree of the new root is kept and pruned to the
+        node budget.
+        """
+        game = TicTacToeGame()
+        mcts = MonteCarloTreeSearch(UniformNet(game), config=Config(
+            num_mcts_sims=80))
+        best_child = mcts.search(game, TreeNode(), mcts.config.temp_final)
+        num_nodes = best_child.count_nodes()
+        nsa = best_child.Nsa
+
+        mcts.set_root(best_child)
+
+        self.assertIs(mcts.root, best_child)
+        self.assertIsNone(best_child.parent)
+        self.assertEqual(mcts.node_count, num_nodes)
+        self.assertEqual(mcts.memory_usage()[0], num_nodes)
+        self.assertGreater(mcts.memory_usage()[1], 0)
+
+        game.play_action(best_child.action)
+        mcts.search(game, best_child, mcts.config.temp_final, 10)
+        self.assertEqual(best_child.Nsa, nsa + 10)
+
+        mcts.max_nodes = 5
+        mcts.set_root(max(best_child.children.values(),
+                          key=lambda child: child.Nsa))
+
+        self.assertLessEqual(mcts.node_count, 5)
+        self.assertEqual(mcts.node_count, mcts.root.count_nodes())
+
+    def test_load_statistics(self):
+        """Test case for the load_statistics function.
+
+        Test that the tree is recounted after a root takes over the
+        statistics of another game, and that the seeded visits don't grow
+        past one search from game to game.
+        """
+        game = TicTacToeGame()
+        opening_cache = OpeningCache(game, 2, 30)
+
+        for i in range(3):
+            mcts = MonteCarloTreeSearch(UniformNet(game),
+                                        opening_cache=opening_cache,
+                                        config=Config(num_mcts_sims=30))
+            mcts.search(game, TreeNode(), mcts.config.temp_final)
+
+            self.assertEqual(mcts.node_count, mcts.root.count_nodes())
+
+        self.assertEqual(mcts.root.Nsa, 60)
+
+    def test_search4(self):
+        """Test case for the search function.
+
+        Test that a solved root which was pruned to a leaf still returns a
+        move, and that budgeted searches with solved nodes finish games.
+        """
+        game = TicTacToeGame()
+        game.state = np.array([[1, -1, 1],
+                               [0, -1, 0],
+                               [0, 0, 0]])
+        mcts = MonteCarloTreeSearch(UniformNet(game))
+        node = TreeNode()
+        node.proven = -1
+
+        best_child = mcts.search(game, node, CFG.temp_final)
+
+        self.assertIsNotNone(best_child)
+        self.assertEqual(game.state[best_child.action[1:]], 0)
+
+        for seed in range(3):
+            np.random.seed(seed)
+            game = ConnectFourGame()
+            mcts = MonteCarloTreeSearch(RandomNet(game, seed), config=Config(
+                max_tree_nodes=40, num_mcts_sims=100))
+            node = TreeNode()
+            game_over = False
+
+            while not game_over:
+                best_child = mcts.search(game, node, mcts.config.temp_final)
+                game.play_action(best_child.action)
+                game_over, _ = game.check_game_over(game.current_player)
+                mcts.set_root(best_child)
+                node = best_child
+
+                self.assertLessEqual(mcts.node_count, 40)
+
+    def test_select_child(self):
+        """Test case for the select_child function.
+
+        Test that selection with lazily created children matches selection
+        with every child created up front.
+        """
+        game = TicTacToeGame()
+        game.state = np.array([[1, 0, 0],
+                               [0, -1, 0],
+                               [0, 0, 0]])
+        psa_vector = np.random.RandomState(0).rand(game.action_size)
+        lazy, eager = TreeNode(), TreeNode()
+
+        for node in (lazy, eager):
+            node.expand_node(game.clone(), psa_vector / psa_vector.sum())
+
+        for idx in range(len(eager.legal_actions)):
+            eager.get_child(idx)
+
+        for v in np.random.RandomState(1).uniform(-1, 1, 40):
+            children = [node.select_child(1.5) for node in (lazy, eager)]
+
+            self.assertEqual(children[0].action, children[1].action)
+            self.assertEqual(children[0].Psa, children[1].Psa)
+
+            for node, child in zip((lazy, eager), children):
+                child.back_prop(v)
+                node.back_prop(-v)
+
+        self.assertEqual(len(eager.children), 7)
+        self.assertEqual(set(lazy.children),
+                         {action_id for action_id, child in
+                          eager.children.items() if child.Nsa > 0})
+
+    def test_opening_cache(self):
+        """Test case for the OpeningCache class.
+
+        Test that hits return the network's policy, also for a symmetric
+        position with its moves mapped, and that root statistics are shared
+        between symmetric positions.
+        """
+        game = TicTacToeGame()
+        game.play_action((1, 0, 1))
+        rotated = TicTacToeGame()
+        rotated.state = np.rot90(game.state).copy()
+        rotated.current_player = game.current_player
+
+        net = PositionNet(game)
+        opening_cache = OpeningCache(TicTacToeGame(), 3, 40)
+        psa_vector, v = net.predict(game.state)
+
+        for i in range(2):
+            cached_psa_vector, cached_v = opening_cache.predict(net, game)
+
+            np.testing.assert_allclose(cached_psa_vector, psa_vector)
+            self.assertEqual(cached_v, v)
+
+        cached_psa_vector, cached_v = opening_cache.predict(net, rotated)
+
+        np.testing.assert_allclose(
+            cached_psa_vector.reshape(3, 3),
+            np.rot90(psa_vector.reshape(3, 3)))
+        self.assertEqual((opening_cache.hits, opening_cache.misses), (2, 1))
+        self.assertEqual(net.calls, 2)
+
+        mcts = MonteCarloTreeSearch(net, opening_cache=opening_cache,
+                                    config=Config(num_mcts_sims=40))
+        mcts.search(game, TreeNode(), mcts.config.temp_final)
+        visits = {child.action[1:]: child.Nsa
+                  for child in mcts.root.children.values()}
+
+        node = TreeNode()
+        node.expand_node(rotated.clone(), np.ones(9) / 9)
+        opening_cache.load_statistics(rotated, node)
+
+        self.assertEqual(node.Nsa, 40)
+        self.assertEqual(len(node.children), len(visits))
+        for child in node.children.values():
+            row, column = child.action[1:]
+            # np.rot90 moves the square (r, c) to (2 - c, r).
+            self.assertEqual(child.Nsa, visits[(column, 2 - row)])
+
+    def test_gumbel_search(self):
+        """Test case for the gumbel_search function.
+
+        Test that sequential halving halves the candidates every phase and
+        stays within the simulation budget, and that a move chosen without
+        a visit is counted in the tree.
+        """
+        np.random.seed(0)
+        game = TicTacToeGame()
+        mcts = PhaseRecordingSearch(UniformNet(game), config=Config(
+            gumbel=1, gumbel_max_actions=8, num_mcts_sims=50))
+
+        best_child = mcts.search(game, TreeNode(), 1)
+
+        self.assertEqual(mcts.num_candidates, [8, 4, 2, 1])
+        self.assertIn(best_child, mcts.root.children.values())
+        self.assertEqual(mcts.sims_per_move, [50])
+        self.assertLessEqual(mcts.root.Nsa, 50)
+        self.assertLessEqual(sum(child.Nsa for child in
+                                 mcts.root.children.values()), 50)
+
+        mcts = MonteCarloTreeSearch(UniformNet(game), config=Config(gumbel=1))
+        best_child = mcts.search(game, TreeNode(), 1, num_sims=2)
+
+        self.assertEqual(best_child.Nsa, 0)
+        self.assertEqual(mcts.node_count, mcts.root.count_nodes())
+
+    def test_search_policy(self):
+        """Test case for the search_policy function.
+
+        Test that the completed Q policy is a distribution over the valid
+        moves which favors the move with the higher Q value.
+        """
+        game = TicTacToeGame()
+        game.state = np.array([[1, 0, 0],
+                               [0, -1, 0],
+                               [0, 0, 0]])
+        mcts = MonteCarloTreeSearch(UniformNet(game),
+                                    config=Config(gumbel=1))
+        node = TreeNode()
+        node.expand_node(game.clone(), np.ones(9) / 9)
+
+        for idx, v in ((0, 0.8), (1, -0.5)):
+            child = node.get_child(idx)
+            for i in range(4):
+                child.back_prop(v)
+                node.back_prop(-v)
+
+        pi = mcts.search_policy(game, node)
+        good, bad = node.legal_actions[:2]
+
+        self.assertAlmostEqual(float(pi.sum()), 1, places=5)
+        self.assertTrue(np.all(pi[[0, 4]] == 0))
+        self.assertTrue(np.all(pi[list(node.legal_actions)] > 0))
+        self.assertGreater(pi[good], pi[node.legal_actions[2]])
+        self.assertGreater(pi[node.legal_actions[2]], pi[bad])
+
+    def test_adaptive_sims(self):
+        """Test case for the adaptive simulations of the search function.
+
+        Test that a search stops once the root visit distribution has
+        converged and that the saved simulations are spent on a later move.
+        """
+        game = TicTacToeGame()
+        mcts = MonteCarloTreeSearch(UniformNet(game), config=Config(
+            adaptive_sims=1, kl_check_interval=8, kl_threshold=0.5,
+            num_mcts_sims=100))
+
+        best_child = mcts.search(game, TreeNode(), mcts.config.temp_final)
+
+        self.assertEqual(mcts.sims_per_move, [16])
+        self.assertEqual(mcts.sim_bank, 84)
+
+        mcts.config.kl_threshold = 0
+        game.play_action(best_child.action)
+        mcts.set_root(best_child)
+        mcts.search(game, best_child, mcts.config.temp_final)
+
+        self.assertEqual(mcts.sims_per_move, [16, 184])
+        self.assertEqual(mcts.sim_bank, 0)
+
+    def test_get_forced_move(self):
+        """Test case for the get_forced_move function.
+
+        Test that a single valid move is played without calling the network
+        and that its simulations are banked.
+        """
+        game = TicTacToeGame()
+        game.state = np.array([[1, -1, 1],
+                               [1, -1, -1],
+                               [-1, 1, 0]])
+        net = UniformNet(game)
+        mcts = MonteCarloTreeSearch(net, config=Config(adaptive_sims=1,
+                                                       num_mcts_sims=30))
+
+        best_child = mcts.search(game, TreeNode(), mcts.config.temp_final)
+
+        self.assertEqual(tuple(best_child.action[1:]), (2, 2))
+        self.assertEqual(net.calls, 0)
+        self.assertEqual(mcts.sims_per_move, [0])
+        self.assertEqual(mcts.sim_bank, 30)
@@ -0,0 +1,155 @@
+# MIT License
+#
+# Copyright (c) 2018 Blanyal D'Souza
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+"""Class to run unit tests for the NumpyNetwork class."""
+import os
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+
+from config import CFG, Config
+from connect_four.connect_four_game import ConnectFourGame
+from numpy_net import NumpyNetwork, BATCH_NORM_EPSILON
+
+
+def random_weights(rng, num_blocks, row, column, action_size, filters):
+    """Returns random weights named like the variables of NeuralNetwork."""
+    weights = {}
+
+    def add_conv(index, size, inputs, outputs):
+        suffix = "" if index == 0 else "_%d" % index
+        conv = "conv2d" + suffix
+        norm = "batch_normalization" + suffix
+        weights[conv + "/kernel"] = rng.randn(size, size, inputs, outputs)
+        weights[conv + "/bias"] = rng.randn(outputs)
+        weights[norm + "/gamma"] = rng.rand(outputs) + 0.5
+        weights[norm + "/beta"] = rng.randn(outputs)
+        weights[norm + "/moving_mean"] = rng.randn(outputs)
+        weights[norm + "/moving_variance"] = rng.rand(outputs) + 0.5
+
+    add_conv(0, 3, 1, filters)
+    for i in range(1, 2 * num_blocks + 1):
+        add_conv(i, 3, filters, filters)
+    add_conv(2 * num_blocks + 1, 1, filters, 2)
+    add_conv(2 * num_blocks + 2, 1, filters, 1)
+
+    for name, inputs, units in (("dense", row * column * 2, action_size),
+                                ("dense_1", row * column, filters),
+                                ("dense_2", filters, 1)):
+        weights[name + "/kernel"] = rng.randn(inputs, units) * 0.1
+        weights[name + "/bias"] = rng.randn(units)
+
+    return weights
+
+
+def reference_conv(x, weights, index):
+    """Applies a convolution and batch normalization square by square."""
+    suffix = "" if index == 0 else "_%d" % index
+    kernel = weights["conv2d" + suffix + "/kernel"]
+    bias = weights["conv2d" + suffix + "/bias"]
+    norm = "batch_normalization" + suffix
+    size = kernel.shape[0]
+    offset = size // 2
+    row, column = x.shape[:2]
+    output = np.zeros((row, column, kernel.shape[3]))
+
+    for r in range(row):
+        for c in range(column):
+            for i in range(size):
+                for j in range(size):
+                    y, z = r + i - offset, c + j - offset
+                    if 0 <= y < row and 0 <= z < column:
+                        output[r, c] += x[y, z] @ kernel[i, j]
+    output += bias
+
+    return (output - weights[norm + "/moving_mean"]) / np.sqrt(
+        weights[norm + "/moving_variance"] + BATCH_NORM_EPSILON) * \
+        weights[norm + "/gamma"] + weights[norm + "/beta"]
+
+
+class TestNumpyNetwork(TestCase):
+    """Class to run unit tests for the NumpyNetwork class."""
+
+    def test_predict_batch(self):
+        """Test case for the predict_batch and load_model functions.
+
+        Test for the same outputs as the unfolded network layer by layer.
+        """
+        model_directory = CFG.model_directory
+
+        game = ConnectFourGame()
+        rng = np.random.RandomState(0)
+        weights = random_weights(rng, 1, game.row, game.column,
+                                 game.action_size, 8)
+        states = rng.randint(-1, 2, (3, game.row, game.column))
+
+        with tempfile.TemporaryDirectory() as directory:
+            CFG.model_directory = directory + "/"
+            np.savez(os.path.join(directory, "test_model.npz"), **weights)
+
+            try:
+                net = NumpyNetwork(game)
+                net.load_model("test_model")
+                pi, v = net.predict_batch(states)
+                single_pi, single_v = net.predict(states[1])
+            finally:
+                CFG.model_directory = model_directory
+
+        for k, state in enumerate(states):
+            x = np.maximum(reference_conv(state[..., None], weights, 0), 0)
+            y = np.maximum(reference_conv(x, weights, 1), 0)
+            x = np.maximum(reference_conv(y, weights, 2) + x, 0)
+
+            policy = np.maximum(reference_conv(x, weights, 3), 0).flatten()
+            logits = policy @ weights["dense/kernel"] + weights["dense/bias"]
+            expected_pi = np.exp(logits) / np.exp(logits).sum()
+
+            value = np.maximum(reference_conv(x, weights, 4), 0).flatten()
+            value = np.maximum(value @ weights["dense_1/kernel"] +
+                               weights["dense_1/bias"], 0)
+            expected_v = np.tanh(value @ weights["dense_2/kernel"] +
+                                 weights["dense_2/bias"])[0]
+
+            np.testing.assert_allclose(pi[k], expected_pi, rtol=1e-3,
+                                       atol=1e-6)
+            self.assertAlmostEqual(v[k], expected_v, places=4)
+
+        np.testing.assert_allclose(single_pi, pi[1], rtol=1e-4)
+        self.assertAlmostEqual(single_v, v[1], places=5)
+
+    def test_load_model(self):
+        """Test case for the load_model function.
+
+        Test for a clear error for a model without saved weights.
+        """
+        game = ConnectFourGame()
+
+        with tempfile.TemporaryDirectory() as directory:
+            # A model saved before the weights were saved with it.
+            open(os.path.join(directory, "old_model.index"), "w").close()
+            net = NumpyNetwork(game, Config(model_directory=directory + "/"))
+
+            with self.assertRaises(FileNotFoundError) as context:
+                net.load_model("old_model")
+
+        self.assertIn("old_model.npz", str(context.exception))
@@ -0,0 +1,58 @@
+# MIT License
+#
+# Copyright (c) 2018 Blanyal D'Souza
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+"""Class to run unit tests for the fixed opponents."""
+from unittest import TestCase
+
+import numpy as np
+
+from players import AlphaBetaPlayer
+from tic_tac_toe.tic_tac_toe_game import TicTacToeGame
+
+
+class TestAlphaBetaPlayer(TestCase):
+    """Class to run unit tests for the AlphaBetaPlayer class."""
+
+    def test_search1(self):
+        """Test case for the search function.
+
+        Test for playing a win in one.
+        """
+        game = TicTacToeGame()
+        game.state = np.array([[1, 1, 0], [-1, -1, 0], [0, 0, 0]])
+        best_child = AlphaBetaPlayer(depth=2).search(game, None, 1)
+
+        self.assertEqual(best_child.action, (1, 0, 2))
+
+    def test_search2(self):
+        """Test case for the search function.
+
+        Test for blocking a win in one.
+        """
+        game = TicTacToeGame()
+        game.current_player = -1
+        game.state = np.array([[1, 1, 0], [-1, 0, 0], [0, 0, 0]])
+        player = AlphaBetaPlayer(depth=2)
+        best_child = player.search(game, None, 1)
+
+        self.assertEqual(best_child.action, (1, 0, 2))
+        self.assertEqual(player.root_value(), 0)
@@ -0,0 +1,74 @@
+# MIT License
+#
+# Copyright (c) 2018 Blanyal D'Souza
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+"""Class to run unit tests for the Profiler class."""
+import json
+import os
+import tempfile
+from unittest import TestCase
+
+from config import CFG
+from profiler import Profiler, NULL_TIMER
+
+
+class TestProfiler(TestCase):
+    """Class to run unit tests for the Profiler class."""
+
+    def test_iteration(self):
+        """Test case for the timer, count and end_iteration functions.
+
+        Test for phases ignored while profiling is off and written as one
+        JSON line per iteration while it is on.
+        """
+        profile = CFG.profile
+        model_directory = CFG.model_directory
+
+        with tempfile.TemporaryDirectory() as directory:
+            CFG.model_directory = directory + "/"
+            file_path = os.path.join(directory, "profile.jsonl")
+            profiler = Profiler(file_path)
+
+            try:
+                CFG.profile = 0
+                profiler.start_iteration(1)
+
+                self.assertIs(profiler.timer("select"), NULL_TIMER)
+                profiler.count("simulations")
+                self.assertIsNone(profiler.end_iteration())
+
+                CFG.profile = 1
+                for iteration in range(2, 4):
+                    profiler.start_iteration(iteration)
+                    for i in range(3):
+                        with profiler.timer("select"):
+                            profiler.count("simulations", 2)
+                    profiler.end_iteration()
+            finally:
+                CFG.profile = profile
+                CFG.model_directory = model_directory
+
+            with open(file_path) as profile_file:
+                records = [json.loads(line) for line in profile_file]
+
+        self.assertEqual([record["iteration"] for record in records], [2, 3])
+        self.assertEqual(records[1]["phases"]["select"]["calls"], 3)
+        self.assertEqual(records[1]["counts"], {"simulations": 6})
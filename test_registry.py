@@ -0,0 +1,129 @@
+# MIT License
+#
+# Copyright (c) 2018 Blanyal D'Souza
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+"""Class to run unit tests for the game registry."""
+import os
+import subprocess
+import sys
+import tempfile
+from unittest import TestCase
+
+import registry
+from benchmarks.startup import MODULES
+from config import CFG, Config
+
+
+class TestRegistry(TestCase):
+    """Class to run unit tests for the game registry."""
+
+    def test_make_game(self):
+        """Test case for the make_game and make_solver functions.
+
+        Test for games created with their CFG options.
+        """
+        column_actions = CFG.column_actions
+
+        try:
+            CFG.column_actions = 1
+            game = registry.make_game(2)
+        finally:
+            CFG.column_actions = column_actions
+
+        self.assertEqual(game.action_size, game.column)
+        self.assertEqual(registry.make_game(0).action_size, 9)
+        self.assertEqual(type(registry.make_solver(1)).__name__,
+                         "OthelloSolver")
+
+    def test_make_solver(self):
+        """Test case for the make_solver function.
+
+        Test for solvers which read their limits and files from the given
+        config, also in a nested directory which doesn't exist yet, and for
+        keyword arguments which override it.
+        """
+        config = Config(game=2, solver_empty_squares=12, solver_node_limit=5)
+        solver = registry.make_solver(config=config)
+
+        self.assertEqual(type(solver).__name__, "ConnectFourSolver")
+        self.assertEqual(solver.max_empty, 12)
+        self.assertEqual(solver.node_limit, 5)
+        self.assertEqual(
+            registry.make_solver(config=config, max_empty=3).max_empty, 3)
+
+        with tempfile.TemporaryDirectory() as directory:
+            model_directory = os.path.join(directory, "base", "sweep_0")
+            config = Config(game=0, model_directory=model_directory + os.sep)
+            solver = registry.make_solver(config=config)
+
+            self.assertEqual(os.path.dirname(solver.file_path),
+                             model_directory)
+            self.assertTrue(os.path.exists(solver.file_path))
+
+    def imports_tensorflow(self, code):
+        """Runs code in a fresh interpreter and checks if it imports TF.
+
+        Every import of TensorFlow is recorded and fails, whether or not
+        TensorFlow is installed, so the check works without it.
+
+        Args:
+            code: A string with the code to run.
+
+        Returns:
+            A boolean value indicating if the code tried to import TF.
+        """
+        guard = ("import sys\n"
+                 "class Guard(object):\n"
+                 "    attempts = []\n"
+                 "    def find_spec(self, name, path=None, target=None):\n"
+                 "        if name.split('.')[0] == 'tensorflow':\n"
+                 "            Guard.attempts.append(name)\n"
+                 "            raise ImportError(name)\n"
+                 "sys.meta_path.insert(0, Guard())\n"
+                 "try:\n"
+                 "%s\n"
+                 "except ImportError:\n"
+                 "    pass\n"
+                 "print(bool(Guard.attempts) or 'tensorflow' in sys.modules)"
+                 % "\n".join("    " + line for line in code.splitlines()))
+
+        output = subprocess.run([sys.executable, "-c", guard], check=True,
+                                stdout=subprocess.PIPE,
+                                universal_newlines=True).stdout
+
+        return output.split()[-1] == "True"
+
+    def test_lazy_imports(self):
+        """Test case for the imports of the entry points.
+
+        Test for entry points and games which start without TensorFlow,
+        and for the TensorFlow backend which is caught importing it.
+        """
+        code = ("import %s\n"
+                "import registry\n"
+                "for number, entry in registry.GAMES.items():\n"
+                "    registry.make_game(number)\n"
+                "    registry.load(entry['solver'])" % ", ".join(MODULES))
+
+        self.assertFalse(self.imports_tensorflow(code))
+        self.assertTrue(self.imports_tensorflow(
+            "import registry\n"
+            "registry.load(registry.BACKENDS['tensorflow'])"))
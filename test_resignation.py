@@ -0,0 +1,94 @@
+# MIT License
+#
+# Copyright (c) 2018 Blanyal D'Souza
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+"""Class to run unit tests for the Resignation class."""
+from unittest import TestCase
+
+import numpy as np
+
+from resignation import Resignation
+
+
+class TestResignation(TestCase):
+    """Class to run unit tests for the Resignation class."""
+
+    def test_false_resign_rate(self):
+        """Test case for the false_resign_rate function.
+
+        Test for the fraction of would-be resignations which were wrong.
+        """
+        resignation = Resignation(-0.5, 0.1, 0.05)
+
+        self.assertIsNone(resignation.false_resign_rate())
+
+        resignation.samples = [(-0.9, True), (-0.8, True), (-0.7, False),
+                               (-0.6, True), (-0.2, False)]
+
+        self.assertEqual(resignation.false_resign_rate(), 0.25)
+
+    def test_calibrate(self):
+        """Test case for the calibrate function.
+
+        Test that the threshold moves up to the target false resign rate and
+        stays put with too few samples.
+        """
+        resignation = Resignation(-0.99, 0.1, 0.1)
+        resignation.samples = [(value, True) for value in
+                               np.linspace(-0.95, -0.6, 9)]
+        resignation.calibrate()
+
+        self.assertEqual(resignation.threshold, -0.99)
+
+        # Players below -0.6 always lost, above it half of them did not.
+        resignation.samples += [(value, idx % 2 == 0) for idx, value in
+                                enumerate(np.linspace(-0.5, -0.1, 10))]
+        resignation.calibrate()
+
+        self.assertGreater(resignation.threshold, -0.6)
+        self.assertLess(resignation.threshold, -0.1)
+        self.assertLessEqual(resignation.false_resign_rate(), 0.1)
+
+    def test_disabled_game(self):
+        """Test case for the start_game, check and end_game functions.
+
+        Test that games with resignation disabled never resign and are
+        recorded as samples.
+        """
+        resignation = Resignation(-0.5, 1.0, 0.05)
+
+        self.assertFalse(resignation.start_game())
+        self.assertFalse(resignation.check(1, -0.9))
+        self.assertFalse(resignation.check(-1, 0.9))
+
+        resignation.end_game(1, -1)
+
+        self.assertEqual(sorted(resignation.samples),
+                         [(-0.9, True), (0.9, False)])
+
+        resignation = Resignation(-0.5, 0.0, 0.05)
+
+        self.assertTrue(resignation.start_game())
+        self.assertTrue(resignation.check(1, -0.9))
+
+        resignation.end_game(1, -1)
+
+        self.assertEqual(resignation.samples, [])
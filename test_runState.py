@@ -0,0 +1,94 @@
+# MIT License
+#
+# Copyright (c) 2018 Blanyal D'Souza
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+"""Class to run unit tests for the RunState class."""
+import os
+import pickle
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+
+from run_state import RunState
+
+
+class TestRunState(TestCase):
+    """Class to run unit tests for the RunState class."""
+
+    def test_save(self):
+        """Test case for the save and load functions.
+
+        Test for checkpoints replacing each other without temporary files.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            run_state = RunState(os.path.join(directory, "run", "state.pkl"))
+
+            self.assertIsNone(run_state.load())
+
+            for games_done in range(3):
+                run_state.save({"games_done": games_done})
+
+            state = run_state.load()
+
+            self.assertEqual(state["games_done"], 2)
+            self.assertEqual(state["training_data"], [])
+            self.assertEqual(os.listdir(os.path.join(directory, "run")),
+                             ["state.pkl"])
+
+    def test_save_examples(self):
+        """Test case for the save and load functions with examples.
+
+        Test that every example is written once, that examples appended
+        after the last checkpoint are dropped on load, and that a
+        checkpoint without examples removes them.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            run_state = RunState(os.path.join(directory, "state.pkl"))
+            training_data = []
+            sizes = []
+
+            for games_done in range(1, 5):
+                training_data += [np.full((3, 3), games_done)] * 10
+                run_state.save({"games_done": games_done}, training_data)
+                run_state.wait()
+                sizes.append(os.path.getsize(run_state.examples_path))
+
+            # Every game appends the same number of bytes.
+            self.assertEqual(len(set(np.diff(sizes))), 1)
+
+            # A write which appended examples but died before the checkpoint.
+            with open(run_state.examples_path, 'ab') as examples_file:
+                pickle.dump([np.ones((3, 3))], examples_file)
+
+            state = run_state.load()
+
+            self.assertEqual(state["games_done"], 4)
+            self.assertEqual(len(state["training_data"]), 40)
+            self.assertEqual(state["training_data"][-1][0, 0], 4)
+            self.assertEqual(os.path.getsize(run_state.examples_path),
+                             sizes[-1])
+
+            run_state.save({"games_done": 0})
+            run_state.wait()
+
+            self.assertEqual(os.listdir(directory), ["state.pkl"])
+            self.assertEqual(run_state.load()["training_data"], [])
@@ -0,0 +1,44 @@
+# MIT License
+#
+# Copyright (c) 2018 Blanyal D'Souza
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+"""Class to run unit tests for the sweep runner."""
+from unittest import TestCase
+
+from sweep import expand_grid
+
+
+class TestSweep(TestCase):
+    """Class to run unit tests for the sweep runner."""
+
+    def test_expand_grid(self):
+        """Test case for the expand_grid function.
+
+        Test for one configuration per combination of grid values.
+        """
+        configs = expand_grid({"game": 0, "c_puct": 1},
+                              {"c_puct": [1, 2], "num_mcts_sims": [10, 20, 30]})
+
+        self.assertEqual(len(configs), 6)
+        self.assertEqual(configs[0], {"game": 0, "c_puct": 1,
+                                      "num_mcts_sims": 10})
+        self.assertEqual(configs[-1], {"game": 0, "c_puct": 2,
+                                       "num_mcts_sims": 30})
@@ -0,0 +1,97 @@
+# MIT License
+#
+# Copyright (c) 2018 Blanyal D'Souza
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+"""Class to run unit tests for the Train class."""
+from unittest import TestCase
+
+import numpy as np
+
+from config import Config
+from tic_tac_toe.tic_tac_toe_game import TicTacToeGame
+from train import Train
+
+
+class UniformNet(object):
+    """Network stand-in which returns uniform priors and a zero value."""
+
+    def __init__(self, game):
+        """Initializes UniformNet with the action size of the game."""
+        self.action_size = game.action_size
+
+    def predict(self, state):
+        """Returns a uniform probability vector and a zero value."""
+        return np.ones(self.action_size) / self.action_size, 0.0
+
+
+class TestTrain(TestCase):
+    """Class to run unit tests for the Train class."""
+
+    def play_games(self, playout_cap_fraction, num_games):
+        """Plays self-play games and counts the moves and the examples.
+
+        Args:
+            playout_cap_fraction: A float fraction of moves with a full search.
+            num_games: An integer number of games to play.
+
+        Returns:
+            The number of moves played.
+            A list with the training examples, 8 symmetries per move.
+        """
+        game = TicTacToeGame()
+        train = Train(game, UniformNet(game), config=Config(
+            game=0, num_mcts_sims=16, num_fast_mcts_sims=2, epsilon=0,
+            playout_cap_fraction=playout_cap_fraction, run_state=0))
+        training_data = []
+        num_moves = 0
+
+        for i in range(num_games):
+            num_moves += train.play_game(game.clone(), training_data)
+
+        return num_moves, training_data
+
+    def test_play_game(self):
+        """Test case for the play_game function.
+
+        Test that only the moves with a full search are recorded, in
+        proportion to playout_cap_fraction, with search policy targets
+        whether or not the playout cap is used.
+        """
+        np.random.seed(0)
+
+        num_moves, training_data = self.play_games(1.0, 2)
+        self.assertEqual(len(training_data), 8 * num_moves)
+
+        # Visit counts, unlike the uniform priors, differ between moves.
+        self.assertTrue(any(np.ptp(pi[state.flatten() == 0]) > 0
+                            for state, pi, v in training_data))
+
+        num_moves, training_data = self.play_games(0.0, 2)
+        self.assertEqual(len(training_data), 0)
+
+        num_moves, training_data = self.play_games(0.5, 10)
+        num_examples = len(training_data) // 8
+        self.assertGreater(num_examples, 0.3 * num_moves)
+        self.assertLess(num_examples, 0.7 * num_moves)
+
+        for state, pi, v in training_data:
+            self.assertAlmostEqual(float(np.sum(pi)), 1, places=5)
+            self.assertTrue(np.all(pi[state.flatten() != 0] == 0))
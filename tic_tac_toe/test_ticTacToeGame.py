@@ -23,6 +23,8 @@
 """Class to run unit tests for the TicTacToeGame class."""
 from unittest import TestCase
 
+import numpy as np
+
 from tic_tac_toe.tic_tac_toe_game import TicTacToeGame
 
 
@@ -76,3 +78,53 @@ class TestTicTacToeGame(TestCase):
 
         self.assertEqual(game_over, False)
         self.assertEqual(value, 0)
+
+    def test_check_game_over_5(self):
+        """Test case for the check_game_over function.
+
+        Test for a minor diagonal win on a 4x4 board.
+        """
+        game = TicTacToeGame(size=4)
+        game.state = [[1, 1, 0, -1],
+                      [1, 0, -1, 0],
+                      [0, -1, 0, 1],
+                      [-1, 0, 0, 0]]
+        game_over, value = game.check_game_over(1)
+
+        self.assertEqual(len(game.windows), 10)
+        self.assertEqual(game_over, True)
+        self.assertEqual(value, -1)
+
+        game_over, value = game.check_game_over(1, last_move=(1, 2, 1))
+
+        self.assertEqual(game_over, True)
+        self.assertEqual(value, -1)
+
+        game_over, value = game.check_game_over(1, last_move=(1, 0, 0))
+
+        self.assertEqual(game_over, False)
+
+    def test_get_key(self):
+        """Test case for the get_key and get_canonical_key functions.
+
+        Test for keys kept up to date by moves and shared by symmetries.
+        """
+        game = TicTacToeGame()
+        game.play_action((1, 0, 0))
+        game.play_action((1, 1, 2))
+
+        rotated = TicTacToeGame()
+        rotated.state = np.array([[0, -1, 0], [0, 0, 0], [1, 0, 0]])
+        rotated.current_player = 1
+
+        self.assertNotEqual(game.get_key(), rotated.get_key())
+        self.assertEqual(game.get_canonical_key(),
+                         rotated.get_canonical_key())
+
+        rotated.state = np.rot90(rotated.state, 3)
+
+        self.assertEqual(game.get_key(), rotated.get_key())
+
+        rotated.current_player = -1
+
+        self.assertNotEqual(game.get_key(), rotated.get_key())
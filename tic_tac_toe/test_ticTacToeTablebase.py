@@ -0,0 +1,109 @@
+# MIT License
+#
+# Copyright (c) 2018 Blanyal D'Souza
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+"""Class to run unit tests for the TicTacToeTablebase class."""
+import os
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+
+from solver import PerfectPlayer
+from tic_tac_toe.tic_tac_toe_game import TicTacToeGame
+from tic_tac_toe.tic_tac_toe_tablebase import TicTacToeTablebase
+
+
+class TestTicTacToeTablebase(TestCase):
+    """Class to run unit tests for the TicTacToeTablebase class."""
+
+    def setUp(self):
+        """Generates a tablebase in a temporary directory."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.directory.name, "tablebase.npz")
+        self.tablebase = TicTacToeTablebase(max_empty=9,
+                                            file_path=self.file_path)
+
+    def tearDown(self):
+        """Removes the temporary directory."""
+        self.directory.cleanup()
+
+    def test_generate(self):
+        """Test case for the generate function.
+
+        Test for every reachable position and its saved copy.
+        """
+        self.assertEqual(self.tablebase.num_positions(), 5478)
+
+        tablebase = TicTacToeTablebase(max_empty=9, file_path=self.file_path)
+
+        self.assertTrue(np.array_equal(tablebase.values,
+                                       self.tablebase.values))
+        self.assertTrue(np.array_equal(tablebase.best_moves,
+                                       self.tablebase.best_moves))
+
+    def test_solve1(self):
+        """Test case for the solve function.
+
+        Test for a draw on the empty board.
+        """
+        value, action_id = self.tablebase.solve(TicTacToeGame())
+
+        self.assertEqual(value, 0)
+
+    def test_solve2(self):
+        """Test case for the solve function.
+
+        Test for a win with the only winning move.
+        """
+        game = TicTacToeGame()
+        game.state = np.array([[1, 1, 0],
+                               [-1, -1, 0],
+                               [0, 0, 0]])
+
+        self.assertEqual(self.tablebase.solve(game), (1, 2))
+
+    def test_search(self):
+        """Test case for the PerfectPlayer search function.
+
+        Test for a draw between two perfect players, and for an error if
+        the solver can't solve the position.
+        """
+        player = PerfectPlayer(self.tablebase)
+        game = TicTacToeGame()
+        game_over = False
+
+        while not game_over:
+            best_child = player.search(game, None, 1)
+
+            self.assertEqual(player.root_value(), 0)
+
+            game.play_action(best_child.action)
+            game_over, value = game.check_game_over(game.current_player)
+
+        self.assertEqual(value, 0)
+
+        # A solver with too few empty squares can't play the opening.
+        player = PerfectPlayer(TicTacToeTablebase(max_empty=4,
+                                                  file_path=self.file_path))
+
+        with self.assertRaises(ValueError):
+            player.search(TicTacToeGame(), None, 1)
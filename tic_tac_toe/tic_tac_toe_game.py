@@ -25,7 +25,8 @@ from copy import deepcopy
 
 import numpy as np
 
-from game import Game
+from game import Game, find_winner, get_square_windows, get_symmetries, \
+    get_windows, get_zobrist_keys
 
 
 class TicTacToeGame(Game):
@@ -37,16 +38,25 @@ class TicTacToeGame(Game):
         current_player: An integer to keep track of the current player.
         state: A list which stores the game state in matrix form.
         action_size: An integer indicating the total number of board squares.
+        connect: An integer indicating the number of marks in a line to win.
+        windows: A matrix with the flat square indices of every winning line.
+        square_windows: A tuple with the winning lines through each square.
     """
 
-    def __init__(self):
+    def __init__(self, size=3):
         """Initializes TicTacToeGame with the initial board state."""
         super().__init__()
-        self.row = 3
-        self.column = 3
+        self.row = size
+        self.column = size
         self.current_player = 1
         self.state = []
         self.action_size = self.row * self.column
+        self.connect = size
+        self.windows = get_windows(self.row, self.column, self.connect)
+        self.square_windows = get_square_windows(self.row, self.column,
+                                                 self.connect)
+        self.symmetries = get_symmetries(self.row, self.column, "dihedral")
+        self.zobrist = get_zobrist_keys(self.action_size)
 
         # Create a n x n matrix to represent the board
         for i in range(self.row):
@@ -60,9 +70,10 @@ class TicTacToeGame(Game):
         Returns:
             the cloned game object.
         """
-        game_clone = TicTacToeGame()
+        game_clone = TicTacToeGame(self.row)
         game_clone.state = deepcopy(self.state)
         game_clone.current_player = self.current_player
+        self.copy_key(game_clone)
         return game_clone
 
     def play_action(self, action):
@@ -75,6 +86,7 @@ class TicTacToeGame(Game):
         y = action[2]
 
         self.state[x][y] = self.current_player
+        self.toggle_key(x * self.column + y, self.current_player)
         self.current_player = -self.current_player
 
     def get_valid_moves(self, current_player):
@@ -96,7 +108,8 @@ class TicTacToeGame(Game):
 
         return np.array(valid_moves)
 
-    def check_game_over(self, current_player):
+    def check_game_over(self, current_player, valid_moves=None,
+                        last_move=None):
         """Checks if the game is over and return a possible winner.
 
         There are 3 possible scenarios.
@@ -106,85 +119,41 @@ class TicTacToeGame(Game):
 
         Args:
             current_player: An integer representing the current player.
+            valid_moves: The result of get_valid_moves for the current player
+                if it is already known, which saves generating it again.
+            last_move: The move which led to this state from a state where
+                the game was not over. Only the lines through it are checked.
 
         Returns:
             A bool representing the game over state.
             An integer action value. (win: 1, loss: -1, draw: 0
         """
+        if last_move is None:
+            windows = self.windows
+        else:
+            windows = self.square_windows[
+                last_move[1] * self.column + last_move[2]]
 
-        player_a = current_player
-        player_b = -current_player
+        winner = find_winner(self.state, windows, self.connect)
 
-        # Check for horizontal marks
-        for x in range(self.row):
-            player_a_count = 0
-            player_b_count = 0
-            for y in range(self.column):
-                if self.state[x][y] == player_a:
-                    player_a_count += 1
-                elif self.state[x][y] == player_b:
-                    player_b_count += 1
-            if player_a_count == self.row:
-                return True, 1
-            elif player_b_count == self.row:
-                return True, -1
-
-        # Check for vertical marks
-        for x in range(self.row):
-            player_a_count = 0
-            player_b_count = 0
-            for y in range(self.column):
-                if self.state[y][x] == player_a:
-                    player_a_count += 1
-                elif self.state[y][x] == player_b:
-                    player_b_count += 1
-            if player_a_count == self.row:
-                return True, 1
-            elif player_b_count == self.row:
-                return True, -1
-
-        # Check for major diagonal marks
-        player_a_count = 0
-        player_b_count = 0
-        for x in range(self.row):
-            if self.state[x][x] == player_a:
-                player_a_count += 1
-            elif self.state[x][x] == player_b:
-                player_b_count += 1
-
-        if player_a_count == self.row:
+        if winner == current_player:
             return True, 1
-        elif player_b_count == self.row:
-            return True, -1
-
-        # Check for minor diagonal marks
-        player_a_count = 0
-        player_b_count = 0
-        for y in range(self.row - 1, -1, -1):
-            x = 2 - y
-            if self.state[x][y] == player_a:
-                player_a_count += 1
-            elif self.state[x][y] == player_b:
-                player_b_count += 1
-
-        if player_a_count == self.row:
-            return True, 1
-        elif player_b_count == self.row:
+        elif winner == -current_player:
             return True, -1
 
         # There are still moves left so the game is not over
-        valid_moves = self.get_valid_moves(current_player)
-
-        for move in valid_moves:
-            if move[0] is 1:
+        if valid_moves is None:
+            if (np.asarray(self.state) == 0).any():
                 return False, 0
+        elif any(move[0] == 1 for move in valid_moves):
+            return False, 0
 
         # If there are no moves left the game is over without a winner
         return True, 0
 
     def print_board(self):
         """Prints the board state."""
-        print("   0    1    2")
+        print("   " + "    ".join(str(y) for y in range(self.column)))
         for x in range(self.row):
             print(x, end='')
             for y in range(self.column):
@@ -0,0 +1,176 @@
+# MIT License
+#
+# Copyright (c) 2018 Blanyal D'Souza
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+"""Game theoretic tablebase for Tic Tac Toe."""
+import os
+
+import numpy as np
+
+from config import CFG
+from solver import Solver
+from tic_tac_toe.tic_tac_toe_game import TicTacToeGame
+
+
+class TicTacToeTablebase(Solver):
+    """Stores the exact value and best moves of every Tic Tac Toe position.
+
+    Positions are indexed by a base 3 code of the board with one digit per
+    square (empty: 0, X: 1, O: 2), so the side to move follows from the
+    board. The tables are generated once by searching every reachable
+    position and saved to disk, after which solving a position is a lookup.
+
+    Attributes:
+        file_path: A string path of the saved tables.
+        powers: A vector with the weight of every square in the code.
+        values: A vector of the value of every position for the player to
+            move (win: 1, loss: -1, draw: 0), or UNREACHABLE.
+        best_moves: A vector of bitmasks of the best squares of every
+            position.
+    """
+
+    UNREACHABLE = 2
+
+    def __init__(self, max_empty=None, file_path=None, config=None):
+        """Initializes TicTacToeTablebase by loading or generating tables."""
+        config = CFG if config is None else config
+        super().__init__(max_empty, config=config)
+
+        if file_path is None:
+            file_path = config.model_directory + "tic_tac_toe_tablebase.npz"
+
+        game = TicTacToeGame()
+        self.file_path = file_path
+        self.powers = 3 ** np.arange(game.row * game.column, dtype=np.int64)
+
+        if os.path.exists(file_path):
+            self.load(file_path)
+        else:
+            self.generate(game)
+            self.save(file_path)
+
+    def encode(self, state):
+        """Returns the base 3 code of a board.
+
+        Args:
+            state: A matrix with the game state.
+
+        Returns:
+            An integer index into the tables.
+        """
+        digits = np.asarray(state).flatten()
+        digits = np.where(digits == -1, 2, digits)
+        return int(np.dot(digits, self.powers))
+
+    def generate(self, game):
+        """Searches every position reachable from a game and fills the tables.
+
+        Args:
+            game: A TicTacToeGame with the starting position.
+        """
+        self.values = np.full(3 ** len(self.powers),
+                              self.UNREACHABLE, dtype=np.int8)
+        self.best_moves = np.zeros(len(self.values), dtype=np.uint16)
+        self.search(game)
+
+    def search(self, game):
+        """Solves a position and every position reachable from it.
+
+        Args:
+            game: A TicTacToeGame.
+
+        Returns:
+            The value of the position for the player to move.
+        """
+        code = self.encode(game.state)
+        if self.values[code] != self.UNREACHABLE:
+            return self.values[code]
+
+        valid_moves = game.get_valid_moves(game.current_player)
+        game_over, value = game.check_game_over(game.current_player,
+                                                valid_moves)
+
+        if not game_over:
+            move_values = {}
+            for idx, move in enumerate(valid_moves):
+                if move[0] == 1:
+                    child = game.clone()
+                    child.play_action(move)
+                    move_values[idx] = -self.search(child)
+
+            value = max(move_values.values())
+            self.best_moves[code] = sum(1 << idx for idx, move_value in
+                                        move_values.items()
+                                        if move_value == value)
+
+        self.values[code] = value
+        return value
+
+    def save(self, file_path):
+        """Saves the tables to a file.
+
+        Args:
+            file_path: A string path of the file.
+        """
+        directory = os.path.dirname(file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        np.savez_compressed(file_path, values=self.values,
+                            best_moves=self.best_moves)
+
+    def load(self, file_path):
+        """Loads the tables from a file.
+
+        Args:
+            file_path: A string path of the file.
+        """
+        tables = np.load(file_path)
+        self.values = tables["values"]
+        self.best_moves = tables["best_moves"]
+
+    def num_positions(self):
+        """Counts the positions in the tables.
+
+        Returns:
+            An integer number of reachable positions.
+        """
+        return int(np.count_nonzero(self.values != self.UNREACHABLE))
+
+    def solve_position(self, game):
+        """Looks up a position.
+
+        One of the best moves is picked at random, so games against the
+        tablebase differ from each other.
+
+        Args:
+            game: A TicTacToeGame which is not over.
+
+        Returns:
+            A tuple of the value of the position for the player to move and
+            the action id of a best move.
+        """
+        code = self.encode(game.state)
+        best_moves = int(self.best_moves[code])
+        action_ids = [idx for idx in range(len(self.powers))
+                      if best_moves >> idx & 1]
+
+        return int(self.values[code]), int(np.random.choice(action_ids))
@@ -21,12 +21,19 @@
 # SOFTWARE.
 # ==============================================================================
 """Class to train the Neural Network."""
+import time
+
 import numpy as np
 
 from config import CFG
-from mcts import MonteCarloTreeSearch, TreeNode
-from neural_net import NeuralNetworkWrapper
+from mcts import MonteCarloTreeSearch, TreeNode, OpeningCache
+from numpy_net import NumpyNetwork
 from evaluate import Evaluate
+from resignation import Resignation
+from ladder import EloLadder
+from metrics import METRICS
+from profiler import PROFILER
+from run_state import RunState
 from copy import deepcopy
 
 
@@ -36,42 +43,121 @@ class Train(object):
     Attributes:
         game: An object containing the game state.
         net: An object containing the neural network.
+        eval_net: A NumpyNetwork holding the weights the trained network is
+            evaluated against, so they need no second TF graph and session.
+        resignation: A Resignation object, or None if games are never resigned.
+        solver: An exact endgame solver used by the searches, or None.
+        perfect_player: A PerfectPlayer the best network is evaluated
+            against after every iteration, or None.
+        ladder: An EloLadder rating every accepted network, or None.
+        run_state: A RunState the progress is checkpointed to, or None.
+        resume_model: A string name of the saved network the last run state
+            refers to, or None.
+        history: A list with a dictionary of evaluation results per
+            iteration.
+        config: The Config of the run.
     """
 
-    def __init__(self, game, net):
+    def __init__(self, game, net, solver=None, perfect_player=None,
+                 config=None):
         """Initializes Train with the board state and neural network."""
+        self.config = config = CFG if config is None else config
         self.game = game
         self.net = net
-        self.eval_net = NeuralNetworkWrapper(game)
+        self.eval_net = NumpyNetwork(game, config)
+        self.resignation = None
+        if config.resign:
+            self.resignation = Resignation(
+                config.resign_threshold, config.resign_disable_fraction,
+                config.resign_false_positive_rate)
+        self.solver = solver
+        self.perfect_player = perfect_player
+        self.ladder = None
+        if config.ladder:
+            self.ladder = EloLadder(config.model_directory + "ladder.json")
+        self.run_state = None
+        if config.run_state or config.resume:
+            self.run_state = RunState(config.model_directory + "run_state.pkl")
+        self.resume_model = None
+        self.history = []
 
     def start(self):
-        """Main training loop."""
-        for i in range(CFG.num_iterations):
+        """Main training loop.
+
+        With run_state in the config the progress is checkpointed after every
+        self-play game, after training and at the end of every iteration.
+        With resume the loop continues from the last checkpoint, skipping the
+        self-play games which are already finished, and keeps checkpointing.
+
+        Returns:
+            The history of evaluation results.
+        """
+        METRICS.start(self.config)
+
+        resumed = None
+        if self.config.resume:
+            resumed = self.load_run_state()
+
+        # The starting network is the first rung of the ladder.
+        if self.ladder is not None and not self.ladder.ratings:
+            self.update_ladder()
+
+        first_iteration = 0 if resumed is None else resumed["iteration"]
+
+        for i in range(first_iteration, self.config.num_iterations):
             print("Iteration", i + 1)
+            PROFILER.start_iteration(i + 1, self.config)
+            METRICS.set("alphazero_iteration", i + 1)
+
+            if resumed is not None:
+                phase = resumed["phase"]
+                training_data = resumed["training_data"]
+                games_done = resumed["games_done"]
+                resumed = None
+            else:
+                phase = "self_play"
+                training_data = []  # list to store self play states, pis, vs
+                games_done = 0
+
+                if i == first_iteration:
+                    self.save_run_state(i, phase, save_net=True)
 
-            training_data = []  # list to store self play states, pis and vs
+            if phase == "self_play":
+                self.self_play(i, training_data, games_done)
 
-            for j in range(CFG.num_games):
-                print("Start Training Self-Play Game", j + 1)
-                game = self.game.clone()  # Create a fresh clone for each game.
-                self.play_game(game, training_data)
+                # Save the current neural network model.
+                self.net.save_model()
 
-            # Save the current neural network model.
-            self.net.save_model()
+                # Load the recently saved model into the evaluator network.
+                self.eval_net.load_model()
 
-            # Load the recently saved model into the evaluator network.
-            self.eval_net.load_model()
+                # Train the network using self play values.
+                with PROFILER.timer("training"):
+                    self.net.train(training_data)
 
-            # Train the network using self play values.
-            self.net.train(training_data)
+                self.save_run_state(i, "evaluate", save_net=True)
+            else:
+                # The network before training is still the current model.
+                self.eval_net.load_model()
 
             # Initialize MonteCarloTreeSearch objects for both networks.
-            current_mcts = MonteCarloTreeSearch(self.net)
-            eval_mcts = MonteCarloTreeSearch(self.eval_net)
+            current_mcts = MonteCarloTreeSearch(self.net, solver=self.solver,
+                                                config=self.config)
+            eval_mcts = MonteCarloTreeSearch(self.eval_net, solver=self.solver,
+                                             config=self.config)
+
+            # Worker processes load both networks from saved models.
+            model_names = None
+            if self.config.eval_workers > 0:
+                self.net.save_model("candidate_model")
+                model_names = ("candidate_model", "current_model")
 
             evaluator = Evaluate(current_mcts=current_mcts, eval_mcts=eval_mcts,
-                                 game=self.game)
-            wins, losses = evaluator.evaluate()
+                                 game=self.game, resignation=self.resignation,
+                                 model_names=model_names, solver=self.solver,
+                                 config=self.config)
+            with PROFILER.timer("evaluation"):
+                wins, losses = evaluator.evaluate()
 
             print("wins:", wins)
             print("losses:", losses)
@@ -84,17 +170,199 @@ class Train(object):
                 win_rate = wins / num_games
 
             print("win rate:", win_rate)
+            METRICS.set("alphazero_evaluation_win_rate", win_rate)
 
-            if win_rate > CFG.eval_win_rate:
+            # The SPRT decides when it stopped the games early.
+            if evaluator.decision is not None:
+                accepted = evaluator.decision
+            else:
+                accepted = win_rate > self.config.eval_win_rate
+
+            self.history.append({"iteration": i + 1, "wins": wins,
+                                 "losses": losses, "win_rate": win_rate,
+                                 "accepted": bool(accepted)})
+
+            if accepted:
                 # Save current model as the best model.
                 print("New model saved as best model.")
                 self.net.save_model("best_model")
+                METRICS.inc("alphazero_models_accepted_total")
+
+                if self.ladder is not None:
+                    with PROFILER.timer("ladder"):
+                        self.update_ladder()
             else:
                 print("New model discarded and previous model loaded.")
                 # Discard current model and use previous best model.
                 self.net.load_model()
 
-    def play_game(self, game, training_data):
+            if self.perfect_player is not None:
+                # Perfect play can't be beaten, so every loss is a mistake.
+                evaluator = Evaluate(current_mcts=MonteCarloTreeSearch(
+                    self.net, config=self.config),
+                    eval_mcts=self.perfect_player, game=self.game,
+                    stop_early=False, config=self.config)
+                wins, losses = evaluator.evaluate()
+
+                print("draws vs perfect play:",
+                      self.config.num_eval_games - wins - losses)
+                print("losses vs perfect play:", losses)
+
+            # The next iteration starts from the network chosen here.
+            self.save_run_state(i + 1, "self_play", save_net=True)
+
+            PROFILER.end_iteration()
+            METRICS.write_textfile()
+
+        if self.run_state is not None:
+            self.run_state.wait()
+
+        return self.history
+
+    def self_play(self, iteration, training_data, games_done=0):
+        """Plays the self-play games of an iteration.
+
+        Args:
+            iteration: An integer index of the iteration.
+            training_data: A list to store self play states, pis and vs.
+            games_done: An integer number of games already played.
+        """
+        # The network is fixed during self-play, so its games share the
+        # evaluations and search statistics of the opening.
+        opening_cache = None
+        if self.config.opening_cache_plies > 0:
+            opening_cache = OpeningCache(self.game,
+                                         self.config.opening_cache_plies,
+                                         self.config.num_mcts_sims)
+
+        start = time.time()
+        num_positions = 0
+
+        for j in range(games_done, self.config.num_games):
+            print("Start Training Self-Play Game", j + 1)
+            game = self.game.clone()  # Create a fresh clone for each game.
+
+            with PROFILER.timer("self_play_game"):
+                num_positions += self.play_game(game, training_data,
+                                                opening_cache)
+
+            self.save_run_state(iteration, "self_play", training_data, j + 1)
+            METRICS.write_textfile()
+
+        seconds = max(time.time() - start, 1e-9)
+        METRICS.set("alphazero_self_play_games_per_hour",
+                    (self.config.num_games - games_done) * 3600 / seconds)
+        METRICS.set("alphazero_self_play_positions_per_second",
+                    num_positions / seconds)
+        METRICS.set("alphazero_training_examples", len(training_data))
+
+        if opening_cache is not None:
+            print("Opening cache hits:", opening_cache.hits,
+                  "misses:", opening_cache.misses)
+
+        if self.resignation is not None:
+            print("Resign threshold:", self.resignation.threshold,
+                  "false resign rate:",
+                  self.resignation.false_resign_rate())
+
+        if self.solver is not None:
+            print("Solver calls:", self.solver.calls,
+                  "solved:", self.solver.solved,
+                  "aborted:", self.solver.aborted,
+                  "nodes:", self.solver.nodes)
+
+    def save_run_state(self, iteration, phase, training_data=None,
+                       games_done=0, save_net=False):
+        """Checkpoints the progress of the run, if run_state or resume is set.
+
+        Args:
+            iteration: An integer index of the iteration.
+            phase: A string "self_play" or "evaluate" of the next phase.
+            training_data: A list of the iteration's self play states, pis and
+                vs so far.
+            games_done: An integer number of finished self-play games.
+            save_net: A boolean value indicating if the network changed since
+                the last checkpoint. It is saved with the optimizer momentum.
+        """
+        if self.run_state is None:
+            return
+
+        # The network is saved first, and alternates between two names, so
+        # the last checkpoint on disk always has its weights.
+        if save_net:
+            self.run_state.wait()
+            self.resume_model = "resume_model_%d" % (
+                self.resume_model == "resume_model_0")
+            self.net.save_model(self.resume_model)
+
+        # Snapshots, since the state is pickled while self-play goes on. Only
+        # the examples of the games since the last checkpoint are written.
+        self.run_state.save({"iteration": iteration,
+                             "phase": phase,
+                             "games_done": games_done,
+                             "model_name": self.resume_model,
+                             "random_state": np.random.get_state(),
+                             "resignation": deepcopy(self.resignation)},
+                            training_data)
+
+    def load_run_state(self):
+        """Restores the progress of the run from the last checkpoint.
+
+        Returns:
+            A dictionary with the run state, or None if there is none.
+        """
+        state = self.run_state.load()
+        if state is None:
+            print("No run state found, starting a new run.")
+            return None
+
+        print("Resuming iteration", state["iteration"] + 1, "at",
+              state["phase"], "after", state["games_done"], "games.")
+
+        self.resume_model = state["model_name"]
+        self.net.load_model(self.resume_model)
+        np.random.set_state(state["random_state"])
+        if self.resignation is not None and \
+                state["resignation"] is not None:
+            self.resignation = state["resignation"]
+
+        return state
+
+    def update_ladder(self):
+        """Adds the current network to the Elo ladder and rates it.
+
+        The network is saved as a new checkpoint and plays the closest rated
+        checkpoints it hasn't played yet, loaded into the evaluation network.
+        """
+        name = "checkpoint_%d" % len(self.ladder.ratings)
+        self.net.save_model(name)
+        self.ladder.add_player(name)
+
+        for opponent in self.ladder.schedule(name,
+                                             self.config.ladder_opponents):
+            self.eval_net.load_model(opponent)
+
+            evaluator = Evaluate(
+                current_mcts=MonteCarloTreeSearch(self.net, solver=self.solver,
+                                                  config=self.config),
+                eval_mcts=MonteCarloTreeSearch(self.eval_net,
+                                               solver=self.solver,
+                                               config=self.config),
+                game=self.game, model_names=(name, opponent),
+                solver=self.solver, stop_early=False,
+                num_games=self.config.ladder_games, config=self.config)
+            wins, losses = evaluator.evaluate()
+
+            self.ladder.record(name, opponent, wins, losses,
+                               self.config.ladder_games - wins - losses)
+
+        self.ladder.fit()
+        self.ladder.save()
+
+        for checkpoint, rating in self.ladder.ratings.items():
+            print("Elo", checkpoint, round(rating))
+
+    def play_game(self, game, training_data, opening_cache=None):
         """Loop for each self-play game.
 
         Runs MCTS for each game state and plays a move based on the MCTS output.
@@ -103,44 +371,102 @@ class Train(object):
         Args:
             game: An object containing the game state.
             training_data: A list to store self play states, pis and vs.
+            opening_cache: An OpeningCache shared by the iteration's games.
+
+        Returns:
+            The number of moves played.
         """
-        mcts = MonteCarloTreeSearch(self.net)
+        mcts = MonteCarloTreeSearch(self.net, opening_cache=opening_cache,
+                                    solver=self.solver, config=self.config)
 
         game_over = False
         value = 0
         self_play_data = []
         count = 0
+        peak_usage = (0, 0)
 
         node = TreeNode()
 
+        if self.resignation is not None:
+            self.resignation.start_game()
+
         # Keep playing until the game is in a terminal state.
         while not game_over:
-            # MCTS simulations to get the best child node.
-            if count < CFG.temp_thresh:
-                best_child = mcts.search(game, node, CFG.temp_init)
+            # Playout cap randomization: only a fraction of the moves get a
+            # full search, and only those moves are used for training.
+            playout_cap = self.config.playout_cap_fraction < 1
+            full_search = not playout_cap or \
+                np.random.rand() < self.config.playout_cap_fraction
+
+            if full_search:
+                num_sims = self.config.num_mcts_sims
             else:
-                best_child = mcts.search(game, node, CFG.temp_final)
+                num_sims = self.config.num_fast_mcts_sims
 
-            # Store state, prob and v for training.
-            self_play_data.append([deepcopy(game.state),
-                                   deepcopy(best_child.parent.child_psas),
-                                   0])
+            # MCTS simulations to get the best child node.
+            with PROFILER.timer("self_play_search"):
+                if count < self.config.temp_thresh:
+                    temperature = self.config.temp_init
+                else:
+                    temperature = self.config.temp_final
+                best_child = mcts.search(game, node, temperature, num_sims)
+
+            peak_usage = max(peak_usage, mcts.memory_usage())
+
+            # The player to move gives up a hopeless position.
+            if self.resignation is not None and self.resignation.check(
+                    game.current_player, mcts.root_value()):
+                print("Player", game.current_player, "resigned.")
+                value = -1
+                break
+
+            # Store state, prob, the player to move and the exact value of
+            # solved positions for training.
+            if full_search:
+                # Moves with a full search are trained on the search policy.
+                pi = mcts.search_policy(game, best_child.parent)
+
+                proven = best_child.parent.proven
+                solved_value = None if proven is None else -proven
+
+                self_play_data.append([deepcopy(game.state), pi,
+                                       game.current_player, solved_value])
 
             action = best_child.action
             game.play_action(action)  # Play the child node's action.
             count += 1
+            PROFILER.count("self_play_moves")
 
-            game_over, value = game.check_game_over(game.current_player)
+            game_over, value = game.check_game_over(game.current_player,
+                                                    last_move=action)
 
-            best_child.parent = None
+            mcts.set_root(best_child)
             node = best_child  # Make the child node the root node.
 
-        # Update v as the value of the game result.
+        print("Peak search tree:", peak_usage[0], "nodes,", peak_usage[1],
+              "bytes")
+        print("Simulations per move:", mcts.sims_per_move)
+
+        if self.resignation is not None:
+            self.resignation.end_game(game.current_player, value)
+
+        METRICS.inc("alphazero_self_play_games_total")
+        METRICS.inc("alphazero_self_play_positions_total", count)
+
+        # Update v as the value of the game result for the player to move.
         for game_state in self_play_data:
-            value = -value
-            game_state[2] = value
+            solved_value = game_state.pop()
+
+            if solved_value is not None:
+                game_state[2] = solved_value
+            elif game_state[2] == game.current_player:
+                game_state[2] = value
+            else:
+                game_state[2] = -value
             self.augment_data(game_state, training_data, game.row, game.column)
 
+        return count
+
     def augment_data(self, game_state, training_data, row, column):
         """Loop for each self-play game.
 
@@ -156,7 +482,7 @@ class Train(object):
         state = deepcopy(game_state[0])
         psa_vector = deepcopy(game_state[1])
 
-        if CFG.game == 2 or CFG.game == 1:
+        if self.config.game == 2 or self.config.game == 1:
             training_data.append([state, psa_vector, game_state[2]])
         else:
             psa_vector = np.reshape(psa_vector, (row, column))